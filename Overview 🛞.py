@@ -1,23 +1,21 @@
 import streamlit as st
-import pandas as pd
 import urllib.parse
-from supabase import create_client
 from datetime import datetime
-import os
 
-# Load data
-def load_data():
-    df = pd.read_csv("data/cleaned_data.csv")
-    df.dropna(subset=["Price", "Area"], inplace=True)
+from smartrent.data import OVERVIEW_COLUMNS, listings, show_data_stats
+from smartrent.monitoring import track_rerun
+from smartrent.resources import review_repository
+from smartrent.reviews import PAGE_SIZE as REVIEW_PAGE_SIZE
 
-    return df
+with track_rerun("overview"):
+    # Load data
+    df = listings(OVERVIEW_COLUMNS)
 
-df = load_data()
+    # Page config
+    st.set_page_config(page_title="SmartRent", layout="wide")
+    show_data_stats()
 
-# Page config
-st.set_page_config(page_title="SmartRent", layout="wide")
-
-st.markdown("""
+    st.markdown("""
     <style>
         html, body, .stApp {
             background-color: #0f1117 !important;
@@ -95,100 +93,93 @@ st.markdown("""
     </style>
 """, unsafe_allow_html=True)
 
-# Header
-st.markdown("""
+    # Header
+    st.markdown("""
     <div class='smartrent-header'>
         <h1>🏠 SmartRent</h1>
         <p>Discover the pulse of the rental market — clean data, smart insights, and backend precision.</p>
     </div>
 """, unsafe_allow_html=True)
 
-st.image('./assets/image.png',use_container_width=True)
-# Scorecards
-col1, col2, col3 = st.columns(3)
-with col1:
-    st.markdown(f"<div class='scorecard'><h3>Price Range</h3><p>₹{int(df['Price'].min())} – ₹{int(df['Price'].max())}</p></div>", unsafe_allow_html=True)
-with col2:
-    st.markdown(f"<div class='scorecard'><h3>Locations Covered</h3><p>{len(df['Location'].unique())}</p></div>", unsafe_allow_html=True)
-with col3:
-    st.markdown(f"<div class='scorecard'><h3>Total Listings</h3><p>{len(df)}</p></div>", unsafe_allow_html=True)
-st.divider()
-
-# FAQs Section
-st.subheader("❓ Frequently Asked Questions")
-
-with st.expander("What is SmartRent?"):
-    st.write(
-        "SmartRent aggregates and analyzes rental listings from OLX Delhi using automated scraping and cleaning pipelines. "
-        "It delivers clean, deduplicated, and structured rental data for backend-driven dashboards and analytics."
-    )
-
-with st.expander("Can I filter listings?"):
-    st.write(
-        "Yes. The dashboard supports filtering by price, BHK count, and area. You can also extend it to include location, furnishing status, or amenities."
-    )
-
-with st.expander("Can I integrate this with my own backend?"):
-    st.write(
-        "Absolutely. SmartRent is designed with modular scraping, cleaning, and CI/CD logic. You can plug it into your own database, API, or dashboard stack."
-    )
-
-st.divider()
-
-# Contact Us Section
-st.subheader("📬 Contact Us")
-
-with st.form("contact_form"):
-    user_email = st.text_input("Your Email", placeholder="you@example.com")
-    user_message = st.text_area("Your Message", placeholder="Type your query or feedback here...")
-    submitted = st.form_submit_button("Create Email")
-
-    if submitted and user_email and user_message:
-        subject = "SmartRent Inquiry"
-        body = f"From: {user_email}\n\n{user_message}"
-        mailto_link = f"mailto:smartrent@example.com?subject={urllib.parse.quote(subject)}&body={urllib.parse.quote(body)}"
-        st.info('Your email is created successfully !!!')
-        st.markdown(f"<a href='{mailto_link}' class='contact-button'>📨 Click to Send   </a>", unsafe_allow_html=True)
-    elif submitted:
-        st.warning("Please fill in both your email and message before composing.")
-
-# Supabase credentials
-supabase = create_client(
-    st.secrets["supabase"]["url"],
-    st.secrets["supabase"]["key"]
-)
-
-st.divider()
-st.subheader("🗣️ User Reviews")
-
-# Review submission form
-with st.form("review_form"):
-    reviewer_name = st.text_input("Your Name", placeholder="Anonymous")
-    review_text = st.text_area("Your Review", placeholder="Share your experience with SmartRent...")
-    review_submit = st.form_submit_button("Post Review")
-
-    # Strip whitespace and validate
-    if review_submit:
-        cleaned_review = review_text.strip()
-        if cleaned_review:
-            timestamp = datetime.now().isoformat()
-            supabase.table('SmartRent Reviews').insert({
-                "Name": reviewer_name.strip() if reviewer_name.strip() else "Anonymous",
-                "Review": cleaned_review,
-                "Timestamp": timestamp
-            }).execute()
-            st.success("Thanks for sharing your review!")
-            st.rerun()
-        else:
-            st.warning("Please enter a valid review before submitting.")
-
-# Display reviews
-response = supabase.table('SmartRent Reviews').select("*").order("Timestamp", desc=True).execute()
-reviews = response.data
-
-if reviews:
-    for row in reviews:
-        st.markdown(f"""
+    st.image('./assets/image.png',use_container_width=True)
+    # Scorecards
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.markdown(f"<div class='scorecard'><h3>Price Range</h3><p>₹{int(df['Price'].min())} – ₹{int(df['Price'].max())}</p></div>", unsafe_allow_html=True)
+    with col2:
+        st.markdown(f"<div class='scorecard'><h3>Locations Covered</h3><p>{len(df['Location'].unique())}</p></div>", unsafe_allow_html=True)
+    with col3:
+        st.markdown(f"<div class='scorecard'><h3>Total Listings</h3><p>{len(df)}</p></div>", unsafe_allow_html=True)
+    st.divider()
+
+    # FAQs Section
+    st.subheader("❓ Frequently Asked Questions")
+
+    with st.expander("What is SmartRent?"):
+        st.write(
+            "SmartRent aggregates and analyzes rental listings from OLX Delhi using automated scraping and cleaning pipelines. "
+            "It delivers clean, deduplicated, and structured rental data for backend-driven dashboards and analytics."
+        )
+
+    with st.expander("Can I filter listings?"):
+        st.write(
+            "Yes. The dashboard supports filtering by price, BHK count, and area. You can also extend it to include location, furnishing status, or amenities."
+        )
+
+    with st.expander("Can I integrate this with my own backend?"):
+        st.write(
+            "Absolutely. SmartRent is designed with modular scraping, cleaning, and CI/CD logic. You can plug it into your own database, API, or dashboard stack."
+        )
+
+    st.divider()
+
+    # Contact Us Section
+    st.subheader("📬 Contact Us")
+
+    with st.form("contact_form"):
+        user_email = st.text_input("Your Email", placeholder="you@example.com")
+        user_message = st.text_area("Your Message", placeholder="Type your query or feedback here...")
+        submitted = st.form_submit_button("Create Email")
+
+        if submitted and user_email and user_message:
+            subject = "SmartRent Inquiry"
+            body = f"From: {user_email}\n\n{user_message}"
+            mailto_link = f"mailto:smartrent@example.com?subject={urllib.parse.quote(subject)}&body={urllib.parse.quote(body)}"
+            st.info('Your email is created successfully !!!')
+            st.markdown(f"<a href='{mailto_link}' class='contact-button'>📨 Click to Send   </a>", unsafe_allow_html=True)
+        elif submitted:
+            st.warning("Please fill in both your email and message before composing.")
+
+    # Review feed (Supabase, or data/reviews.csv without credentials), shared by every session
+    reviews_repo = review_repository()
+    transfers_before = (reviews_repo.stats.round_trips, reviews_repo.stats.bytes)
+
+    st.divider()
+    st.subheader("🗣️ User Reviews")
+
+    # Review submission form
+    with st.form("review_form"):
+        reviewer_name = st.text_input("Your Name", placeholder="Anonymous")
+        review_text = st.text_area("Your Review", placeholder="Share your experience with SmartRent...")
+        review_submit = st.form_submit_button("Post Review")
+
+        # Strip whitespace and validate
+        if review_submit:
+            cleaned_review = review_text.strip()
+            if cleaned_review:
+                reviews_repo.add(reviewer_name.strip() if reviewer_name.strip() else "Anonymous", cleaned_review)
+                st.success("Thanks for sharing your review!")
+                st.rerun()
+            else:
+                st.warning("Please enter a valid review before submitting.")
+
+    # Display reviews, newest first; older ones are fetched a page at a time on demand
+    shown = st.session_state.setdefault("reviews_shown", REVIEW_PAGE_SIZE)
+    reviews, more_reviews = reviews_repo.newest(shown)
+
+    if reviews:
+        for row in reviews:
+            st.markdown(f"""
         <div class='scorecard'>
             <div style='display: flex; justify-content: space-between; align-items: center;'>
                 <h3 style='margin: 0;'>{row['Name']}</h3>
@@ -197,10 +188,17 @@ if reviews:
             <p style='margin-top: 8px;'>{row['Review']}</p>
         </div>
         """, unsafe_allow_html=True)
-else:
-    st.info("No reviews yet. Be the first to share your thoughts!")
+        if more_reviews and st.button("Load more reviews"):
+            st.session_state["reviews_shown"] = shown + REVIEW_PAGE_SIZE
+            st.rerun()
+    else:
+        st.info("No reviews yet. Be the first to share your thoughts!")
+
+    if st.query_params.get("debug"):
+        st.caption(f"Review backend this run: {reviews_repo.stats.round_trips - transfers_before[0]} round trips, "
+                   f"{(reviews_repo.stats.bytes - transfers_before[1]) / 1e3:.1f} kB")
 
-st.markdown("""
+    st.markdown("""
     <style>
         .chatbot-button {
             position: fixed;
@@ -223,5 +221,5 @@ st.markdown("""
 
     <a href="/AI_Assistant✨" class="chatbot-button">Chat ✨</a>
 """, unsafe_allow_html=True)
-# Footer
-st.markdown("<div class='footer'>© 2025 SmartRent • Built with precision by HANNI</div>", unsafe_allow_html=True)
\ No newline at end of file
+    # Footer
+    st.markdown("<div class='footer'>© 2025 SmartRent • Built with precision by HANNI</div>", unsafe_allow_html=True)
@@ -0,0 +1,78 @@
+"""Prompt size, time to first token and per-turn latency of the AI Assistant
+over a scripted conversation, using the offline StubLLM: the raw history the
+page used to send every turn vs. grounded, budget-trimmed prompts, with the
+response cache answering repeated questions.
+
+    python -m benchmarks.bench_assistant --turns 20 --llm-delay 0.3 --token-delay 0.01
+"""
+import argparse
+import time
+
+import numpy as np
+from langchain_core.messages import HumanMessage
+
+from smartrent.aggregates import build_aggregates
+from smartrent.assistant import Assistant, ListingRetriever, ResponseCache, StubLLM, count_tokens
+from smartrent.filters import FilterIndex
+from smartrent.store import EXPLORER_COLUMNS, load_listings
+
+QUESTIONS = [
+    "What is the average 2BHK rent in Ramesh Nagar?",
+    "Show me the cheapest 1bhk in rajori garden under 15k",
+    "Compare 3 BHK rents in Dwarka Mor and Uttam Nagar",
+    "Any flats between 10k and 20,000 in Janakpuri?",
+    "Which areas have the most listings?",
+    "How much does a 2 bhk cost in Saket?",
+    "Find 1 BHK options above 25k in dwarka",
+    "Is Nawada cheaper than Uttam Nagar?",
+    "what's the avg rent for a 2 bhk in ramesh nagar",
+    "apartments between 10000 and 20k in janakpuri",
+]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--turns", type=int, default=20)
+    parser.add_argument("--llm-delay", type=float, default=0.0, help="simulated time to first token in seconds")
+    parser.add_argument("--token-delay", type=float, default=0.0, help="simulated time between streamed words")
+    parser.add_argument("--no-cache", action="store_true")
+    parser.add_argument("--session-turns", type=int, default=2,
+                        help="turns per simulated session; replies are only reused under the same history")
+    args = parser.parse_args()
+
+    base = load_listings()
+    df = base.dropna(subset=list(EXPLORER_COLUMNS)).reset_index(drop=True)
+    started = time.perf_counter()
+    retriever = ListingRetriever(FilterIndex(df), build_aggregates(base), df)
+    print(f"retriever setup: {(time.perf_counter() - started) * 1000:.0f} ms over {len(df):,} listings")
+
+    cache = None if args.no_cache else ResponseCache()
+    assistant = Assistant(StubLLM(args.llm_delay, args.token_delay), retriever, cache=cache, version=())
+    history = []
+    raw_tokens = grounded_tokens = 0
+    first_tokens = {"miss": [], "hit": []}
+    print(f"{'turn':>4} {'source':>10} {'raw history':>12} {'grounded':>9} {'retrieval':>10} "
+          f"{'first token':>12} {'total':>8}")
+    for turn in range(args.turns):
+        question = QUESTIONS[turn % len(QUESTIONS)]
+        if turn % args.session_turns == 0:
+            history = []
+        raw = sum(count_tokens(m.content) for m in history) + count_tokens(question)
+        reply, stats = assistant.reply(history, question)
+        history += [HumanMessage(content=question), reply]
+        raw_tokens += raw
+        grounded_tokens += stats.prompt_tokens
+        first_tokens["hit" if stats.source == "cache" else "miss"].append(stats.first_token_seconds)
+        print(f"{turn + 1:4d} {stats.source:>10} {raw:12,d} {stats.prompt_tokens:9,d} "
+              f"{stats.retrieval_seconds * 1000:8.2f}ms {stats.first_token_seconds * 1000:10.1f}ms "
+              f"{stats.seconds * 1000:6.0f}ms")
+    print(f"prompt tokens over {args.turns} turns: raw history {raw_tokens:,}, grounded {grounded_tokens:,}")
+    for kind, times in first_tokens.items():
+        if times:
+            print(f"first token on cache {kind}: p50 {np.median(times) * 1000:.1f} ms over {len(times)} turns")
+    if cache is not None:
+        print(f"cache hit rate: {cache.hit_rate:.0%} ({cache.hits}/{cache.hits + cache.misses})")
+
+
+if __name__ == "__main__":
+    main()
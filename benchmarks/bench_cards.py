@@ -0,0 +1,77 @@
+"""Server-side render time and HTML payload of the listing explorer:
+one markdown block per listing via iterrows vs. one batched page of cards.
+
+    python -m benchmarks.bench_cards --page-size 24
+"""
+import argparse
+import time
+
+from smartrent.cards import CARD_CSS, page_slice, render_cards
+from smartrent.filters import FilterIndex
+from smartrent.store import EXPLORER_COLUMNS, load_listings
+
+
+def render_iterrows(df):
+    # The explorer before pagination: every matching listing, inline-styled.
+    blocks = []
+    for _, row in df.iterrows():
+        blocks.append(f"""
+                <div style="
+                    background: linear-gradient(to right, #1a1f27, #2c3e50);
+                    padding: 20px;
+                    border-radius: 12px;
+                    box-shadow: 0 0 12px rgba(255, 255, 255, 0.05);
+                    margin-bottom: 30px;
+                ">
+                    <div style="display: flex; gap: 20px; align-items: center;">
+                        <div style="flex: 1;">
+                            <img src="{row['Image']}" style="height:200px; width:auto; border-radius:8px;" />
+                        </div>
+                        <div style="flex: 2; color: #f0f4f8;">
+                            <h3 style="margin-bottom: 8px;">{row['Title']}</h3>
+                            <p style="margin: 4px 0;"><strong>📍 Location:</strong> {row['Location']}</p>
+                            <p style="margin: 4px 0;"><strong>💰 Price:</strong> ₹{int(row['Price']):,}</p>
+                            <p style="margin: 4px 0;"><strong>🛏️ BHK:</strong> {row['BHK']}</p>
+                            <a href="{row['Link']}" target="_blank" style="
+                                display: inline-block;
+                                margin-top: 10px;
+                                padding: 8px 16px;
+                                background-color: #07375b;
+                                color: white;
+                                text-decoration: none;
+                                border-radius: 6px;
+                                font-weight: bold;
+                            ">🔗 Visit Listing</a>
+                        </div>
+                    </div>
+                </div>
+            """)
+    return blocks
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--page-size", type=int, default=24)
+    parser.add_argument("--sort", default="Price: low to high")
+    args = parser.parse_args()
+
+    df = load_listings().dropna(subset=list(EXPLORER_COLUMNS)).reset_index(drop=True)
+    print(f"Location=All: {len(df):,} listings")
+
+    started = time.perf_counter()
+    blocks = render_iterrows(df)
+    elapsed = time.perf_counter() - started
+    print(f"  iterrows: {elapsed * 1000:8.1f} ms   {len(blocks):5d} elements   "
+          f"{sum(len(b.encode()) for b in blocks) / 1e3:9.1f} kB")
+
+    started = time.perf_counter()
+    index = FilterIndex(df)
+    rows = index.order(index.query(), args.sort)
+    html = CARD_CSS + render_cards(df.iloc[page_slice(rows, 1, args.page_size)])
+    elapsed = time.perf_counter() - started
+    print(f"     paged: {elapsed * 1000:8.1f} ms   {1:5d} elements   {len(html.encode()) / 1e3:9.1f} kB "
+          f"({args.page_size} cards, sorted by {args.sort!r})")
+
+
+if __name__ == "__main__":
+    main()
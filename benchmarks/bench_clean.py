@@ -0,0 +1,46 @@
+"""Row-wise `apply` cleaning vs the vectorized cleaning stage.
+
+    python -m benchmarks.bench_clean --scale 100
+"""
+import argparse
+import time
+
+import pandas as pd
+
+from benchmarks.fixtures import SAMPLE_CSV
+from smartrent.cleaning import clean_listings, clean_price, get_area, parse_listing
+
+
+def clean_rowwise(df):
+    df = df.copy()
+    df['Price'] = df['Price'].apply(clean_price)
+    df[['BHK', 'Bathroom', 'Area']] = df['Info'].apply(parse_listing)
+    df['Locality'] = df['Location'].apply(get_area)
+    return df
+
+
+def timed(fn, df):
+    started = time.perf_counter()
+    out = fn(df)
+    return out, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scale", type=int, default=100)
+    args = parser.parse_args()
+
+    raw = pd.read_csv(SAMPLE_CSV)
+    df = pd.concat([raw] * args.scale, ignore_index=True)
+    print(f"{len(df):,} rows ({args.scale}x {SAMPLE_CSV})")
+
+    expected, rowwise = timed(clean_rowwise, df)
+    result, vectorized = timed(clean_listings, df)
+    assert expected.to_csv() == result.to_csv(), "vectorized output differs from the row-wise functions"
+
+    print(f"   apply: {len(df) / rowwise:12,.0f} rows/sec ({rowwise:.2f}s)")
+    print(f"  vector: {len(df) / vectorized:12,.0f} rows/sec ({vectorized:.2f}s)  {rowwise / vectorized:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""Sequential vs concurrent page fetching against a local OLX stand-in.
+
+    python -m benchmarks.bench_fetch --pages 79 --latency 0.2
+"""
+import argparse
+import time
+
+import requests
+
+from benchmarks.fixtures import fixture_pages
+from benchmarks.stub_server import StubOLX
+from smartrent.fetch import PageFetcher
+from smartrent.scraper import headers, page_url, scrape_olx
+
+
+def sequential(base_url, page_nums):
+    # The pre-refactor loop: a fresh connection per page, no concurrency.
+    started = time.perf_counter()
+    for n in page_nums:
+        requests.get(page_url(n, base_url), headers=headers, timeout=300)
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", type=int, default=79)
+    parser.add_argument("--latency", type=float, default=0.2)
+    parser.add_argument("--fail-rate", type=float, default=0.05)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--rate", type=float, default=20.0)
+    args = parser.parse_args()
+
+    pages = fixture_pages(args.pages)
+    page_nums = range(2, args.pages + 2)
+    with StubOLX(pages, latency=args.latency) as stub:
+        elapsed = sequential(stub.url, page_nums)
+        print(f"sequential: {args.pages / elapsed:.2f} pages/sec ({elapsed:.2f}s)")
+
+    with StubOLX(pages, latency=args.latency, fail_rate=args.fail_rate) as stub:
+        fetcher = PageFetcher(headers=headers, max_workers=args.workers,
+                              max_per_host=args.workers, rate=args.rate, backoff=0.05)
+        listings = scrape_olx(2, args.pages + 1, fetcher=fetcher, base_url=stub.url)
+        stats = fetcher.stats
+        print(f"concurrent: {stats.pages_per_sec:.2f} pages/sec ({stats.elapsed:.2f}s, "
+              f"{stats.retries} retries, {len(listings)} listings)")
+
+
+if __name__ == "__main__":
+    main()
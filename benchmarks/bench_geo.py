@@ -0,0 +1,61 @@
+"""Locality geocoding, GeoIndex build time and radius-query latency over synthetic listings,
+against a brute-force distance scan over every row.
+
+    python -m benchmarks.bench_geo --rows 100000
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from benchmarks.synthetic import generate_listings
+from smartrent.cleaning import clean_listings
+from smartrent.geo import GeoIndex, Geocoder
+
+RADII = (1, 3, 5, 10)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    df = clean_listings(generate_listings(args.rows))
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = os.path.join(tmp, "geocode_cache.json")
+        for label in ("cold", "cached"):
+            started = time.perf_counter()
+            coords = Geocoder(cache_path=cache).geocode(df["Locality"])
+            print(f"geocode ({label}): {(time.perf_counter() - started) * 1000:6.1f} ms for "
+                  f"{len(coords)} localities, {coords['Lat'].notna().sum()} matched")
+
+    started = time.perf_counter()
+    index = GeoIndex.from_localities(df["Locality"], coords)
+    print(f"build: {(time.perf_counter() - started) * 1000:.0f} ms for {args.rows:,} listings "
+          f"({index.located:,} with coordinates)")
+
+    rng = np.random.default_rng(0)
+    places = sorted(index.places)
+    for km in RADII:
+        targets = [places[i] for i in rng.integers(0, len(places), args.queries)]
+        timings, brute, found = [], [], 0
+        for place in targets:
+            started = time.perf_counter()
+            rows = index.near(place, km)
+            timings.append(time.perf_counter() - started)
+            found += len(rows)
+
+            started = time.perf_counter()
+            expected = np.flatnonzero(index.distance_km(np.arange(index.size), *index.places[place]) <= km)
+            brute.append(time.perf_counter() - started)
+            assert np.array_equal(rows, expected)
+        timings, brute = np.array(timings) * 1000, np.array(brute) * 1000
+        print(f"within {km:>2} km: grid p50 {np.median(timings):6.2f} ms  p99 {np.quantile(timings, 0.99):6.2f} ms   "
+              f"full scan p50 {np.median(brute):6.2f} ms   {found / args.queries:9,.0f} rows/query")
+
+
+if __name__ == "__main__":
+    main()
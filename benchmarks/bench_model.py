@@ -0,0 +1,46 @@
+"""Rent model training time, batch scoring throughput and single-estimate
+latency on CPU, over the stored listings resampled to --rows.
+
+    python -m benchmarks.bench_model --rows 100000
+"""
+import argparse
+import time
+
+import numpy as np
+
+from smartrent.model import train
+from smartrent.store import load_listings
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    base = load_listings()
+    rng = np.random.default_rng(0)
+    df = base.iloc[rng.integers(0, len(base), args.rows)].reset_index(drop=True)
+
+    started = time.perf_counter()
+    predictor = train(df)
+    print(f"   train: {(time.perf_counter() - started) * 1000:8.0f} ms for {args.rows:,} listings "
+          f"({len(predictor.table):,} localities)")
+
+    started = time.perf_counter()
+    scores = predictor.score(df)
+    elapsed = time.perf_counter() - started
+    print(f"   score: {elapsed * 1000:8.0f} ms   {len(df) / elapsed:12,.0f} rows/s   "
+          f"flags: {scores['Flag'].value_counts().to_dict()}")
+
+    localities = predictor.table.index.astype(str)
+    timings = []
+    for i in range(args.repeat):
+        started = time.perf_counter()
+        predictor.predict_one(2, 2, 900, localities[i % len(localities)])
+        timings.append(time.perf_counter() - started)
+    print(f"estimate: p50 {np.median(timings) * 1000:6.2f} ms   p95 {np.percentile(timings, 95) * 1000:6.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Startup and rerun cost of each Streamlit page, each in a fresh process:
+time to import the page's top-level imports, the first script run (which
+also loads shared data and clients) and the mean of later reruns.
+
+    python -m benchmarks.bench_pages --reruns 10
+"""
+import argparse
+import ast
+import glob
+import importlib
+import json
+import os
+import subprocess
+import sys
+import time
+
+PAGES = ["Overview 🛞.py"] + sorted(glob.glob("pages/*.py"))
+
+
+def page_imports(path):
+    with open(path, encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+    modules = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            modules += [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom):
+            modules.append(node.module)
+    return modules
+
+
+def measure(path, reruns):
+    # Runs inside the child process.
+    from streamlit.testing.v1 import AppTest
+
+    started = time.perf_counter()
+    for module in page_imports(path):
+        importlib.import_module(module)
+    import_seconds = time.perf_counter() - started
+
+    app = AppTest.from_file(os.path.abspath(path), default_timeout=120)
+    started = time.perf_counter()
+    app.run()
+    first_seconds = time.perf_counter() - started
+
+    timings = []
+    for _ in range(reruns):
+        started = time.perf_counter()
+        app.run()
+        timings.append(time.perf_counter() - started)
+    error = app.exception[0].message if app.exception else ""
+    return {"import": import_seconds, "first": first_seconds, "rerun": sum(timings) / max(len(timings), 1),
+            "error": error}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--reruns", type=int, default=10)
+    parser.add_argument("--page", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.page:
+        print(json.dumps(measure(args.page, args.reruns)))
+        return
+
+    print(f"{'page':>36} {'imports':>9} {'first run':>10} {'rerun':>9}")
+    for page in PAGES:
+        out = subprocess.run([sys.executable, "-m", "benchmarks.bench_pages", "--page", page,
+                              "--reruns", str(args.reruns)], capture_output=True, text=True)
+        lines = out.stdout.strip().splitlines()
+        if out.returncode or not lines:
+            print(f"{os.path.basename(page):>36} failed: {out.stderr.strip().splitlines()[-1:]}")
+            continue
+        result = json.loads(lines[-1])
+        note = f"   (page raised: {result['error'][:60]})" if result["error"] else ""
+        print(f"{os.path.basename(page):>36} {result['import'] * 1000:7.0f}ms {result['first'] * 1000:8.0f}ms "
+              f"{result['rerun'] * 1000:7.1f}ms{note}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""Cards/sec and peak memory of each OLX result-page parser backend.
+
+    python -m benchmarks.bench_parse --pages 40
+"""
+import argparse
+import time
+import tracemalloc
+
+from benchmarks.fixtures import fixture_pages
+from smartrent.parsers import BACKENDS
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", type=int, default=40)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    pages = fixture_pages(args.pages)
+    reference = [BACKENDS["soup"](html) for html in pages]
+
+    for name, parse in BACKENDS.items():
+        results = [parse(html) for html in pages]
+        assert results == reference, f"{name} output differs from the html.parser reference"
+
+        best = float("inf")
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            cards = sum(len(parse(html)) for html in pages)
+            best = min(best, time.perf_counter() - started)
+
+        tracemalloc.start()
+        parse(pages[0])
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        print(f"{name:>9}: {cards / best:9.0f} cards/sec   peak {peak / 1024:8.0f} KiB/page")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Plotly payload size and build time for the Data Insights point charts,
+plotting every listing vs. the downsampled aggregates.
+
+    python -m benchmarks.bench_plots --rows 100000
+
+Times cover figure construction plus JSON serialization on the server; the
+browser's draw time scales with the payload size reported alongside.
+"""
+import argparse
+import time
+
+import numpy as np
+import plotly.express as px
+
+from smartrent.aggregates import build_aggregates
+from smartrent.charts import price_area_density, price_area_scatter, price_box
+from smartrent.store import INSIGHTS_COLUMNS, load_listings
+
+
+def synthetic_listings(rows, seed=0):
+    base = load_listings().dropna(subset=list(INSIGHTS_COLUMNS)).reset_index(drop=True)
+    rng = np.random.default_rng(seed)
+    df = base.iloc[rng.integers(0, len(base), rows)].reset_index(drop=True)
+    df["Price"] = (df["Price"] * rng.lognormal(0, 0.15, rows)).astype("int32")
+    df["Area"] = (df["Area"] * rng.lognormal(0, 0.1, rows)).astype("float32")
+    return df
+
+
+def measure(label, build):
+    started = time.perf_counter()
+    payload = "".join(fig.to_json() for fig in build())
+    elapsed = time.perf_counter() - started
+    print(f"{label:>12}: {len(payload) / 1e6:8.2f} MB payload   {elapsed * 1000:8.0f} ms build+serialize")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=100_000)
+    args = parser.parse_args()
+
+    df = synthetic_listings(args.rows)
+    print(f"{len(df):,} synthetic listings")
+
+    def before():
+        top = df["Location"].value_counts().nlargest(15).index
+        box = px.box(df[df["Location"].isin(top)], x="Location", y="Price", color="Location",
+                     template="plotly_dark", points="all")
+        scatter = px.scatter(df, x="Area", y="Price", color="Location", hover_data=["Title", "BHK"],
+                             template="plotly_dark")
+        return [box, scatter]
+
+    started = time.perf_counter()
+    agg = build_aggregates(df)
+    print(f"{'aggregates':>12}: built in {(time.perf_counter() - started) * 1000:.0f} ms (pipeline side)")
+
+    def after():
+        stats = agg["location"].nlargest(15, "Count")
+        return [price_box(stats, agg["box_points"]), price_area_scatter(agg["scatter_points"])]
+
+    def density():
+        stats = agg["location"].nlargest(15, "Count")
+        return [price_box(stats, agg["box_points"]), price_area_density(agg["price_area_density"])]
+
+    measure("all points", before)
+    measure("sampled", after)
+    measure("density", density)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""Review feed round trips and bytes per Overview page view, on the local CSV
+backend with synthetic reviews (posted three at a time, so timestamps tie): a
+full newest-first select on every rerun vs. the cached, keyset-paginated
+ReviewRepository.
+
+    python -m benchmarks.bench_reviews --reviews 5000 --views 50
+"""
+import argparse
+import csv
+import os
+import tempfile
+from datetime import datetime, timedelta
+
+from smartrent.reviews import FIELDS, PAGE_SIZE, CsvReviews, ReviewRepository
+
+
+def write_reviews(path, count):
+    start = datetime(2025, 1, 1)
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDS)
+        writer.writeheader()
+        for i in range(count):
+            writer.writerow({"Name": f"Reviewer {i}", "Review": f"Review number {i}: " + "good place to look. " * 5,
+                             "Timestamp": (start + timedelta(minutes=17 * (i // 3))).isoformat(timespec="seconds")})
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--reviews", type=int, default=5000)
+    parser.add_argument("--views", type=int, default=50, help="page views (reruns) to simulate")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "reviews.csv")
+        write_reviews(path, args.reviews)
+
+        full = CsvReviews(path)
+        for _ in range(args.views):
+            full.page(limit=args.reviews + args.views)
+
+        repo = ReviewRepository(CsvReviews(path))
+        shown = PAGE_SIZE
+        for view in range(args.views):
+            if view % 10 == 5:
+                shown += PAGE_SIZE  # "Load more reviews"
+            if view % 25 == 20:
+                repo.add("Benchmark", "Posted during the run")
+            repo.newest(shown)
+
+        for label, stats in (("select * per rerun", full.stats), ("repository", repo.stats)):
+            print(f"{label:>20}: {stats.round_trips / args.views:5.2f} round trips/view   "
+                  f"{stats.bytes / args.views / 1e3:9.1f} kB/view")
+
+        # Paging to the end must return every review once, ties included.
+        feed, more = repo.newest(2 * (args.reviews + args.views))
+        assert not more and len(feed) == len(full.page(limit=2 * (args.reviews + args.views)))
+        assert len({(row["Name"], row["Review"], row["Timestamp"]) for row in feed}) == len(feed)
+
+
+if __name__ == "__main__":
+    main()
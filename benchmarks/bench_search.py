@@ -0,0 +1,43 @@
+"""Search index build time and query latency over synthetic listings.
+
+    python -m benchmarks.bench_search --rows 100000
+"""
+import argparse
+import time
+
+import numpy as np
+
+from smartrent.search import SearchIndex
+from smartrent.store import load_listings
+
+QUERIES = ["Rajori Garden", "furnished 2bhk", "dhruv gohri", "tilak nagr metro", "dwarka mor lift parking",
+           "fully furnised", "3bhk", "janakpuri", "uttam ngr builder floor", "girls pg"]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    base = load_listings()
+    rng = np.random.default_rng(0)
+    df = base.iloc[rng.integers(0, len(base), args.rows)].reset_index(drop=True)
+
+    started = time.perf_counter()
+    index = SearchIndex.build(df)
+    print(f"build: {(time.perf_counter() - started) * 1000:.0f} ms for {args.rows:,} listings, "
+          f"{len(index.vocab):,} terms, {len(index.docs):,} postings")
+
+    for query in QUERIES:
+        timings = []
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            hits = index.search(query)
+            timings.append(time.perf_counter() - started)
+        print(f"{query!r:>28}: p50 {np.median(timings) * 1000:6.2f} ms   "
+              f"p95 {np.percentile(timings, 95) * 1000:6.2f} ms   {len(hits):6,} hits")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Multi-city sharded crawl (fetch -> parse -> clean -> merge per city, then one publish)
+against a local OLX stand-in serving fixture pages for several cities, at 1, 2 and 4
+worker processes. Parse and clean dominate once fetching is local, so the shard
+phase should speed up with cores until there are fewer free cores than cities.
+ShardedPipeline and pipeline.py default to one process until a run of this
+benchmark on a multi-core machine shows that it does.
+One extra city whose results pages are empty checks that a shard with nothing
+to store does not break the combined read.
+
+    python -m benchmarks.bench_shards --cities 4 --pages 40
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from benchmarks.stub_server import StubOLX
+from benchmarks.synthetic import synthetic_pages
+from smartrent.cities import CATEGORY, City, CityStores
+from smartrent.runner import ShardedPipeline, frame_hash
+
+
+def run(cities, processes, root):
+    os.chdir(root)
+    pipeline = ShardedPipeline(cities, processes=processes, full=True, thumbnails=False,
+                               fetch_options={"max_workers": 8, "max_per_host": 8, "backoff": 0.05})
+    started = time.perf_counter()
+    reports = pipeline.run()
+    elapsed = time.perf_counter() - started
+    publish = sum(r.seconds for r in reports if r.name == "publish")
+    stores = CityStores().stores()
+    digests = {name: frame_hash(stores[name].load().sort_values("Link").reset_index(drop=True))
+               for name in sorted(stores)}
+    assert len(stores["empty"].load()) == 0 and len(CityStores().load()) == sum(
+        len(store.load()) for store in stores.values())
+    return elapsed - publish, publish, digests
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--cities", type=int, default=4)
+    parser.add_argument("--pages", type=int, default=40)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--processes", type=int, nargs="+", default=[1, 2, 4])
+    args = parser.parse_args()
+
+    print(f"{os.cpu_count()} CPU cores; {args.cities} cities x {args.pages} pages")
+    locations = [f"city{i}_g{1000 + i}" for i in range(args.cities)]
+    pages = {f"{location}/{CATEGORY}": synthetic_pages(args.pages, seed=i) for i, location in enumerate(locations)}
+    cwd = os.getcwd()
+    baseline, expected = None, None
+    try:
+        with StubOLX(pages, latency=args.latency) as stub:
+            cities = [City(f"city{i}", f"City {i}", location, end_page=args.pages + 1, rate=1000, site=stub.url)
+                      for i, location in enumerate(locations)]
+            cities.append(City("empty", "Empty", "empty_g999", end_page=3, rate=1000, site=stub.url))
+            for processes in args.processes:
+                with tempfile.TemporaryDirectory() as tmp:
+                    shards, publish, digests = run(cities, processes, tmp)
+                    os.chdir(cwd)
+                baseline = baseline or shards
+                expected = expected or digests
+                assert digests == expected, f"{processes} processes stored different listings"
+                total_pages = args.cities * args.pages
+                print(f"processes={processes}: shards {shards:6.2f}s ({total_pages / shards:6.1f} pages/sec, "
+                      f"{baseline / shards:4.2f}x)  publish {publish:5.2f}s")
+    finally:
+        os.chdir(cwd)
+
+
+if __name__ == "__main__":
+    main()
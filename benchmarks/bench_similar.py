@@ -0,0 +1,71 @@
+"""Similar-listings index build time and query latency over synthetic listings, one card at
+a time and a page of cards per batch, against scanning the listing frame for each card.
+
+    python -m benchmarks.bench_similar --rows 100000
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import generate_listings
+from smartrent.cleaning import clean_listings
+from smartrent.similar import FEATURE_WEIGHTS, SIMILAR_K, SimilarIndex, listing_features
+
+BATCHES = (1, 12, 48)
+
+
+def distances(index, target, ids):
+    vectors = index.vectors.astype(np.float64)
+    rows = index.row_of(ids)
+    return np.sqrt(((vectors[rows] - vectors[index.row_of([target])]) ** 2).sum(axis=1))
+
+
+def frame_scan(df, features, row, k=SIMILAR_K):
+    # What a per-card lookup without the index costs: weighted distance over every row of the frame.
+    scaled = (features - features.mean()) / features.std()
+    scaled = scaled.fillna(0) * pd.Series(FEATURE_WEIGHTS)
+    dist = ((scaled - scaled.iloc[row]) ** 2).sum(axis=1).drop(index=row)
+    return dist.nsmallest(k).index
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=480)
+    args = parser.parse_args()
+
+    df = clean_listings(generate_listings(args.rows)).dropna(subset=["Link"]).reset_index(drop=True)
+    started = time.perf_counter()
+    index = SimilarIndex.build(df)
+    print(f"build: {(time.perf_counter() - started) * 1000:.0f} ms for {len(index):,} listings, "
+          f"{index.vectors.shape[1]} features")
+
+    rng = np.random.default_rng(0)
+    targets = index.ids[rng.integers(0, len(index), args.queries)]
+    expected = index.similar(targets)
+    for batch in BATCHES:
+        timings = []
+        for i in range(0, args.queries, batch):
+            started = time.perf_counter()
+            found = index.similar(targets[i:i + batch])
+            timings.append((time.perf_counter() - started) / len(found))
+            # Duplicate listings tie, so compare how far the neighbours are rather than which ones.
+            for target, got, want in zip(targets[i:i + batch], found, expected[i:i + batch]):
+                assert np.allclose(distances(index, target, got), distances(index, target, want), atol=1e-5)
+        timings = np.array(timings) * 1000
+        print(f"batch of {batch:>2}: p50 {np.median(timings):6.3f} ms/listing   "
+              f"p99 {np.quantile(timings, 0.99):6.3f} ms/listing")
+
+    features = pd.DataFrame(listing_features(df), columns=list(FEATURE_WEIGHTS))
+    timings = []
+    for row in rng.integers(0, len(df), 10):
+        started = time.perf_counter()
+        frame_scan(df, features, row)
+        timings.append(time.perf_counter() - started)
+    print(f"frame scan per card: p50 {np.median(timings) * 1000:6.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
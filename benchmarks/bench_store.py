@@ -0,0 +1,45 @@
+"""Cold load time and resident size: cleaned_data.csv vs the typed Parquet store.
+
+    python -m benchmarks.bench_store --scale 10
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import pandas as pd
+
+from smartrent.store import CSV_PATH, export_csv, read_csv
+
+
+def measure(label, load, path):
+    started = time.perf_counter()
+    df = load()
+    elapsed = time.perf_counter() - started
+    size = df.memory_usage(deep=True).sum()
+    print(f"{label:>8}: load {elapsed * 1000:8.1f} ms   in memory {size / 1e6:7.2f} MB   "
+          f"on disk {os.path.getsize(path) / 1e6:7.2f} MB")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scale", type=int, default=1)
+    args = parser.parse_args()
+
+    df = read_csv(CSV_PATH)
+    df = pd.concat([df] * args.scale, ignore_index=True)
+    print(f"{len(df):,} listings")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, "cleaned_data.csv")
+        parquet_path = os.path.join(tmp, "listings.parquet")
+        export_csv(df, csv_path)
+        df.to_parquet(parquet_path, index=False)
+
+        # What the pages did before: untyped read_csv with dtype inference.
+        measure("csv", lambda: pd.read_csv(csv_path), csv_path)
+        measure("parquet", lambda: pd.read_parquet(parquet_path), parquet_path)
+
+
+if __name__ == "__main__":
+    main()
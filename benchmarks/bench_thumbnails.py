@@ -0,0 +1,65 @@
+"""Thumbnail warm-up throughput and cache behaviour against a local image server.
+
+    python -m benchmarks.bench_thumbnails --images 400 --latency 0.05
+"""
+import argparse
+import io
+import tempfile
+import time
+
+import numpy as np
+from PIL import Image
+
+from benchmarks.stub_server import StubOLX
+from smartrent.fetch import PageFetcher
+from smartrent.thumbnails import PLACEHOLDER, ThumbnailCache
+
+
+def fixture_image(seed, size=(640, 480)):
+    rng = np.random.default_rng(seed)
+    pixels = rng.integers(0, 255, (size[1] // 16, size[0] // 16, 3), dtype=np.uint8)
+    img = Image.fromarray(pixels).resize(size)
+    out = io.BytesIO()
+    img.save(out, format="JPEG", quality=80)
+    return out.getvalue()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--images", type=int, default=400)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--max-kb", type=int, default=1024)
+    args = parser.parse_args()
+
+    # Every 10th URL 404s, every 25th is not an image, and pairs of URLs share a photo to exercise
+    # content addressing.
+    files = {f"/img/{i}.jpg": fixture_image(i // 2) if i % 25 else b"<html>gone</html>"
+             for i in range(args.images) if i % 10}
+    with StubOLX([], latency=args.latency, files=files) as stub, tempfile.TemporaryDirectory() as tmp:
+        urls = [f"{stub.url}/img/{i}.jpg" for i in range(args.images)]
+        cache = ThumbnailCache(tmp, max_bytes=args.max_kb * 1024)
+        fetcher = PageFetcher(max_workers=16, max_per_host=16, rate=200, retries=0)
+
+        started = time.perf_counter()
+        report = cache.warm(urls, fetcher)
+        elapsed = time.perf_counter() - started
+        print(f"warm: {report} in {elapsed:.2f}s ({report['requested'] / elapsed:.0f} images/sec)")
+
+        requests_before = stub.requests
+        report = cache.warm(urls, fetcher)
+        print(f"re-warm: {report}, {stub.requests - requests_before} new requests")
+
+        # Once the retry delay has passed only the failed downloads are requested again, not the bad images.
+        cache.retry_after = 0
+        requests_before = stub.requests
+        report = cache.warm(urls, fetcher)
+        print(f"retry: {report}, {stub.requests - requests_before} new requests")
+
+        srcs = [cache.src(u) for u in urls]
+        misses = sum(s == PLACEHOLDER for s in srcs)
+        print(f"page payload: {sum(map(len, srcs)) / len(srcs) / 1024:.1f} KiB/card, "
+              f"{misses} placeholders out of {len(srcs)}")
+
+
+if __name__ == "__main__":
+    main()
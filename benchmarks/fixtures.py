@@ -0,0 +1,46 @@
+import html
+
+import pandas as pd
+
+SAMPLE_CSV = "data/olx_delhi_apartments_1.csv"
+ADS_PER_PAGE = 40
+
+
+def _card(row):
+    link = row["Link"].replace("https://www.olx.in", "") if isinstance(row["Link"], str) else ""
+    esc = lambda v: html.escape(str(v)) if isinstance(v, str) else ""
+    return (
+        '<li class="_1DNjI" data-aut-id="itemBox">'
+        f'<a href="{esc(link)}"><figure class="_3UrC5">'
+        f'<img class="_3vnjf" src="{esc(row["Image"])}" alt="{esc(row["Title"])}"></figure>'
+        '<div class="_2Y8GM">'
+        f'<span class="_2Ks63" data-aut-id="itemPrice">{esc(row["Price"])}</span>'
+        f'<span class="YBbhy" data-aut-id="itemDetails">{esc(row["Info"])}</span>'
+        f'<span class="_2poNJ" data-aut-id="itemTitle">{esc(row["Title"])}</span>'
+        f'<div class="_3rmDx"><span class="_2VQu4" data-aut-id="item-location">{esc(row["Location"])}</span>'
+        '<span class="_2jcGx"><span>Today</span></span></div>'
+        '</div></a></li>'
+    )
+
+
+def render_results_page(rows):
+    """OLX-style result page HTML containing one `li._1DNjI` card per row."""
+    cards = "".join(_card(row) for row in rows.to_dict("records"))
+    return (
+        "<!DOCTYPE html><html><head><meta charset=\"utf-8\"><title>Apartments for rent in Delhi | OLX</title>"
+        "<script>window.__APP = {};</script></head><body>"
+        '<header><nav><ul><li class="_3Pqjp">Home</li><li class="_3Pqjp">Delhi</li></ul></nav></header>'
+        f'<main><div class="_1BsIb"><ul class="_266Ly _10aCo" data-aut-id="itemsList1">{cards}</ul></div></main>'
+        '<footer><ul><li>About</li><li>Careers</li><li>Help</li></ul></footer>'
+        "</body></html>"
+    )
+
+
+def fixture_pages(n_pages, ads_per_page=ADS_PER_PAGE, csv_path=SAMPLE_CSV):
+    """Result pages built from the saved raw OLX export, cycling rows as needed."""
+    df = pd.read_csv(csv_path)
+    pages = []
+    for page in range(n_pages):
+        idx = [(page * ads_per_page + i) % len(df) for i in range(ads_per_page)]
+        pages.append(render_results_page(df.iloc[idx]).encode("utf-8"))
+    return pages
@@ -0,0 +1,82 @@
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+
+class StubOLX:
+    """Local HTTP stand-in for OLX serving fixture pages at `/<path>?page=N`.
+
+    `latency` simulates network/server time per request and `fail_rate` makes a
+    fraction of requests return 503 so retry handling can be exercised. `files`
+    maps other paths (e.g. listing images) to raw bytes; unknown ones 404.
+    """
+
+    def __init__(self, pages, latency=0.0, fail_rate=0.0, first_page=2, files=None):
+        self.pages = pages
+        self.files = files or {}
+        self.latency = latency
+        self.fail_rate = fail_rate
+        self.first_page = first_page
+        self.requests = 0
+        self._rng = random.Random(0)
+        self._lock = threading.Lock()
+
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                with stub._lock:
+                    stub.requests += 1
+                    fail = stub._rng.random() < stub.fail_rate
+                if stub.latency:
+                    time.sleep(stub.latency)
+                body, status = stub.respond(self.path, fail)
+                self.send_response(status)
+                self.send_header("Content-Type", stub.content_type(self.path))
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def content_type(self, path):
+        return "application/octet-stream" if urlsplit(path).path in self.files else "text/html; charset=utf-8"
+
+    def respond(self, path, fail):
+        if fail:
+            return b"Service Unavailable", 503
+        if urlsplit(path).path in self.files:
+            return self.files[urlsplit(path).path], 200
+        if urlsplit(path).path.startswith("/img/"):
+            return b"Not Found", 404
+        query = parse_qs(urlsplit(path).query)
+        page = int(query.get("page", [self.first_page])[0]) - self.first_page
+        if isinstance(self.pages, dict):
+            pages = self.pages.get(urlsplit(path).path.strip("/"), [])
+        else:
+            pages = self.pages
+        if 0 <= page < len(pages):
+            return pages[page], 200
+        return b"<html><body></body></html>", 200
+
+    @property
+    def url(self):
+        host, port = self.server.server_address
+        return f"http://{host}:{port}"
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
@@ -0,0 +1,170 @@
+"""Repeatable pipeline and dashboard benchmarks over synthetic listings, saved as JSON.
+
+Each scale multiplies the ~5.8k rows of the saved OLX export. Cases cover
+results-page parsing (per backend), row-wise vs vectorized cleaning, the
+keyed merge into the listing store and its compaction, each page's data load
+and the Data Insights aggregations. Results go to benchmarks/results/<commit>.json;
+compare two runs with --compare.
+
+    python -m benchmarks.suite --scales 1 10 100 --repeat 3
+    python -m benchmarks.suite --compare benchmarks/results/abc1234.json benchmarks/results/def5678.json
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import tempfile
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import generate_listings, synthetic_pages
+from smartrent.aggregates import build_aggregates
+from smartrent.cities import CityStores
+from smartrent.cleaning import clean_listings, clean_price, get_area, parse_listing
+from smartrent.data import required_view
+from smartrent.parsers import BACKENDS
+from smartrent.scraper import parse_listings
+from smartrent.store import EXPLORER_COLUMNS, INSIGHTS_COLUMNS, OVERVIEW_COLUMNS, ListingStore
+
+RESULTS_DIR = "benchmarks/results"
+BASE_ROWS = 5840
+# Parsing is timed on at most this many pages; its cost is per page, not per dataset.
+MAX_PARSE_PAGES = 200
+# Cases slower than this ratio against the baseline are flagged by --compare.
+REGRESSION = 1.2
+
+PAGE_COLUMNS = {"overview": OVERVIEW_COLUMNS, "insights": INSIGHTS_COLUMNS, "explorer": EXPLORER_COLUMNS}
+
+
+def clean_rowwise(df):
+    df = df.copy()
+    df["Price"] = df["Price"].apply(clean_price)
+    df[["BHK", "Bathroom", "Area"]] = df["Info"].apply(parse_listing)
+    df["Locality"] = df["Location"].apply(get_area)
+    return df
+
+
+def cases(scale, tmp):
+    """(name, rows, callable) for one scale; inputs are generated before any timing starts."""
+    rows = BASE_ROWS * scale
+    raw = generate_listings(rows, seed=scale)
+    cleaned = clean_listings(raw)
+
+    n_pages = min(rows // 40, MAX_PARSE_PAGES)
+    pages = synthetic_pages(n_pages, seed=scale)
+    for backend in BACKENDS:
+        yield f"parse.{backend}", n_pages * 40, lambda b=backend: [parse_listings(p, b) for p in pages]
+
+    if scale <= 10:  # the row-wise path takes minutes beyond this
+        yield "clean.rowwise", rows, lambda: clean_rowwise(raw)
+    yield "clean.vectorized", rows, lambda: clean_listings(raw)
+
+    # Merge: a run bringing 10% new listings and 10% price changes into the store.
+    base, fresh = cleaned.iloc[:int(rows * 0.9)], cleaned.iloc[int(rows * 0.9):]
+    changed = base.sample(frac=0.1, random_state=0).assign(Price=lambda d: d["Price"] + 500)
+    batch = pd.concat([fresh, changed], ignore_index=True)
+
+    def merged_store(*batches):
+        store = ListingStore(root=tempfile.mkdtemp(dir=tmp), csv_path=os.path.join(tmp, "none.csv"))
+        for df in batches:
+            store.upsert(df)
+        return store
+
+    def merge():
+        store = merged_store(base)
+        started = time.perf_counter()
+        store.upsert(batch)
+        return time.perf_counter() - started
+
+    def compact():
+        # Every repeat compacts a freshly partitioned store; a second compact has nothing to do.
+        store = merged_store(base, batch)
+        started = time.perf_counter()
+        store.compact()
+        return time.perf_counter() - started
+
+    yield "merge.upsert", len(batch), merge
+    yield "merge.compact", rows, compact
+
+    # A cold page load goes through the same CityStores read and required-column view as data.listings.
+    store = merged_store(base, batch)
+    store.compact()
+    stores = CityStores(default=store, cities_dir=os.path.join(tmp, "no-cities"))
+    for page, columns in PAGE_COLUMNS.items():
+        yield f"load.{page}", rows, lambda c=tuple(columns): required_view(stores.load(), c)
+    merged = stores.load()
+    yield "aggregates.build", rows, lambda: build_aggregates(merged)
+
+
+def run_suite(scales, repeat):
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for scale in scales:
+            for name, rows, fn in cases(scale, tmp):
+                timings = []
+                for _ in range(repeat):
+                    started = time.perf_counter()
+                    inner = fn()
+                    # Cases that need per-repeat setup return their own measured time.
+                    timings.append(inner if isinstance(inner, float) else time.perf_counter() - started)
+                median = float(np.median(timings))
+                results.append({"case": name, "scale": scale, "rows": rows, "median": median,
+                                "min": float(min(timings)), "repeat": repeat})
+                print(f"{name:>18} x{scale:<4} {rows:>9,} rows   median {median * 1000:9.1f} ms   "
+                      f"{rows / median:12,.0f} rows/s")
+    return results
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare(baseline_path, current_path):
+    with open(baseline_path) as f:
+        baseline = {(r["case"], r["scale"]): r for r in json.load(f)["results"]}
+    with open(current_path) as f:
+        current = json.load(f)["results"]
+    print(f"{'case':>18} {'scale':>6} {'baseline':>11} {'current':>11} {'ratio':>7}")
+    for r in current:
+        old = baseline.get((r["case"], r["scale"]))
+        if old is None:
+            continue
+        ratio = r["median"] / old["median"]
+        flag = "  ⚠️ slower" if ratio > REGRESSION else ""
+        print(f"{r['case']:>18} x{r['scale']:<5} {old['median'] * 1000:9.1f}ms {r['median'] * 1000:9.1f}ms "
+              f"{ratio:6.2f}x{flag}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--out", help="results file (default: benchmarks/results/<commit>.json)")
+    parser.add_argument("--compare", nargs=2, metavar=("BASELINE", "CURRENT"))
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    results = run_suite(args.scales, args.repeat)
+    commit = git_commit()
+    out = args.out or os.path.join(RESULTS_DIR, f"{commit}.json")
+    os.makedirs(os.path.dirname(out) or ".", exist_ok=True)
+    with open(out, "w") as f:
+        json.dump({"commit": commit, "timestamp": datetime.now().isoformat(timespec="seconds"),
+                   "python": platform.python_version(), "pandas": pd.__version__, "machine": platform.machine(),
+                   "results": results}, f, indent=1)
+    print(f"💾 Results saved to {out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""Synthetic raw OLX listings at any scale, modelled on the saved export.
+
+Rows are bootstrapped from data/olx_delhi_apartments_1.csv, so Title,
+Location and Info keep their real joint distribution, then made distinct:
+prices get log-normal noise (rounded to ₹500), areas ±10%, and every row a
+unique listing id and image URL.
+"""
+import numpy as np
+import pandas as pd
+
+from benchmarks.fixtures import ADS_PER_PAGE, SAMPLE_CSV, render_results_page
+
+FIRST_ID = 2_000_000_000
+PRICE_NOISE = 0.15
+AREA_NOISE = 0.10
+
+
+def generate_listings(n, seed=0, source=SAMPLE_CSV):
+    """`n` raw listings (Title, Location, Price, Link, Image, Info) as scraped from OLX."""
+    rng = np.random.default_rng(seed)
+    sample = pd.read_csv(source)
+    df = sample.iloc[rng.integers(0, len(sample), n)].reset_index(drop=True)
+
+    price = pd.to_numeric(df["Price"].str.replace(r"[₹,\s]", "", regex=True), errors="coerce")
+    price = (price * rng.lognormal(0.0, PRICE_NOISE, n) / 500).round().clip(lower=1) * 500
+    df["Price"] = ("₹ " + price.map("{:,.0f}".format, na_action="ignore")).fillna(df["Price"])
+
+    parts = df["Info"].str.extract(r"^(.*?)(\d+)(\s*(?:sqft|ft²).*)$")
+    area = (parts[1].astype(float) * rng.uniform(1 - AREA_NOISE, 1 + AREA_NOISE, n) / 10).round() * 10
+    df["Info"] = (parts[0] + area.map("{:.0f}".format, na_action="ignore") + parts[2]).fillna(df["Info"])
+
+    ids = (FIRST_ID + np.arange(n) * 7 + seed).astype(str)
+    df["Link"] = df["Link"].str.replace(r"iid-\d+", "", regex=True) + "iid-" + ids
+    tokens = pd.Series(rng.integers(0, 2 ** 48, n)).map("{:012x}".format)
+    df["Image"] = "https://apollo.olx.in:443/v1/files/" + tokens + "-IN/image;s=150x0;q=50;f=webp;"
+    return df
+
+
+def synthetic_pages(n_pages, ads_per_page=ADS_PER_PAGE, seed=0):
+    """OLX results pages (bytes) over freshly generated listings."""
+    df = generate_listings(n_pages * ads_per_page, seed)
+    return [render_results_page(df.iloc[i * ads_per_page:(i + 1) * ads_per_page]).encode("utf-8")
+            for i in range(n_pages)]
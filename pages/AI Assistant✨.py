@@ -1,51 +1,75 @@
 import streamlit as st
-import os
-from dotenv import load_dotenv
-from langchain_groq import ChatGroq
-from langchain_core.messages import HumanMessage, AIMessage
+from langchain_core.messages import AIMessage, HumanMessage
 from streamlit_mic_recorder import speech_to_text
 
-# Load API key
-load_dotenv()
-GROQ_API_KEY = os.getenv("GROQ_API_KEY")
-
-llm = ChatGroq(
-    api_key=GROQ_API_KEY,
-    model="meta-llama/llama-4-scout-17b-16e-instruct",
-    temperature=0.7
-)
-
-st.set_page_config(page_title="SmartRent", layout="wide")
-st.title("💬 SmartBot Assistant")
-col1,col2 = st.columns(spec = [0.8,0.2],vertical_alignment='center')
-with col1:
-    st.write("Ask anything about rental listings, pricing trends, or platform features.")
-with col2:
-    mic_text = speech_to_text(
-        language='en',
-        start_prompt="🎤 Start Recording",
-        stop_prompt="⏹️ Stop Recording",
-        just_once=True,
-        key="mic_button"
-    )
-
-if "chat_history" not in st.session_state:
-    st.session_state.chat_history = []
-
-for msg in st.session_state.chat_history:
-    with st.chat_message("user" if isinstance(msg, HumanMessage) else "assistant"):
-        st.markdown(msg.content)
-
-user_input = st.chat_input("Type your message and press Enter")
-
-if user_input:
-    st.session_state.chat_history.append(HumanMessage(content=user_input))
-    bot_reply = llm.invoke(st.session_state.chat_history)
-    st.session_state.chat_history.append(bot_reply)
-    st.rerun()
-
-if mic_text:
-    st.session_state.chat_history.append(HumanMessage(content=mic_text))
-    bot_reply = llm.invoke(st.session_state.chat_history)
-    st.session_state.chat_history.append(bot_reply)
-    st.rerun()
\ No newline at end of file
+from smartrent.assistant import Assistant
+from smartrent.data import data_version, listing_retriever, response_cache, show_data_stats
+from smartrent.monitoring import track_rerun
+from smartrent.resources import llm_client
+
+
+def show_turn_stats(stats, cache):
+    if stats.source == "cache":
+        text = f"Answered from the response cache in {stats.seconds * 1000:.1f} ms"
+    else:
+        text = (f"Grounded on: {stats.source} · prompt ≈ {stats.prompt_tokens} tokens "
+                f"({stats.context_tokens} data, {stats.history_messages} history messages) · "
+                f"retrieval {stats.retrieval_seconds * 1000:.1f} ms · "
+                f"first token {stats.first_token_seconds:.2f} s · total {stats.seconds:.2f} s")
+    st.caption(f"{text} · cache hit rate {cache.hit_rate:.0%} ({cache.hits}/{cache.hits + cache.misses})")
+
+
+def answer(question, llm, cache, debug):
+    # Facts go into this turn's prompt only; the stored history stays plain chat.
+    assistant = Assistant(llm, listing_retriever(), cache=cache, version=data_version())
+    with st.chat_message("user"):
+        st.markdown(question)
+    with st.chat_message("assistant"):
+        bot_reply = st.write_stream(assistant.stream(st.session_state.chat_history, question))
+        if debug:
+            show_turn_stats(assistant.stats, cache)
+    st.session_state.chat_history += [HumanMessage(content=question), AIMessage(content=bot_reply)]
+    st.session_state.chat_stats.append(assistant.stats)
+
+
+with track_rerun("assistant"):
+    # ChatGroq (or the offline StubLLM without a GROQ_API_KEY), built once per process
+    llm = llm_client()
+
+    st.set_page_config(page_title="SmartRent", layout="wide")
+    show_data_stats()
+    st.title("💬 SmartBot Assistant")
+    col1,col2 = st.columns(spec = [0.8,0.2],vertical_alignment='center')
+    with col1:
+        st.write("Ask anything about rental listings, pricing trends, or platform features.")
+    with col2:
+        mic_text = speech_to_text(
+            language='en',
+            start_prompt="🎤 Start Recording",
+            stop_prompt="⏹️ Stop Recording",
+            just_once=True,
+            key="mic_button"
+        )
+
+    if "chat_history" not in st.session_state:
+        st.session_state.chat_history = []
+    st.session_state.setdefault("chat_stats", [])
+
+    debug = st.query_params.get("debug")
+    cache = response_cache()
+
+    replies = iter(st.session_state.chat_stats)
+    for msg in st.session_state.chat_history:
+        with st.chat_message("user" if isinstance(msg, HumanMessage) else "assistant"):
+            st.markdown(msg.content)
+            stats = None if isinstance(msg, HumanMessage) else next(replies, None)
+            if debug and stats:
+                show_turn_stats(stats, cache)
+
+    user_input = st.chat_input("Type your message and press Enter")
+
+    if user_input:
+        answer(user_input, llm, cache, debug)
+
+    if mic_text:
+        answer(mic_text, llm, cache, debug)
@@ -0,0 +1,84 @@
+import hmac
+
+import pandas as pd
+import streamlit as st
+
+from smartrent.metrics import metrics
+from smartrent.monitoring import admin_password, last_run, track_rerun
+
+
+def series(row):
+    labels = ", ".join(f"{k}={v}" for k, v in row["labels"].items())
+    return f"{row['name']} ({labels})" if labels else row["name"]
+
+
+def timing_table(rows):
+    return pd.DataFrame([{
+        "Series": series(row),
+        "Count": row["count"],
+        "p50 (ms)": row["p50"] * 1000,
+        "p90 (ms)": row["p90"] * 1000,
+        "p99 (ms)": row["p99"] * 1000,
+        "Total (s)": row["sum"],
+    } for row in rows])
+
+
+def counter_table(rows):
+    return pd.DataFrame([{"Counter": series(row), "Value": row["value"]} for row in rows])
+
+
+with track_rerun("admin"):
+    st.set_page_config(page_title="SmartRent Admin", layout="wide")
+    st.title("🛠️ Admin")
+
+    # Only for whoever knows the password in .streamlit/secrets.toml
+    password = admin_password()
+    if password is None:
+        st.info("The admin panel is off. Set `password` under `[admin]` in .streamlit/secrets.toml to turn it on.")
+        st.stop()
+    if not st.session_state.get("admin"):
+        entered = st.text_input("Admin password", type="password")
+        if not entered:
+            st.stop()
+        if not hmac.compare_digest(entered.encode(), password.encode()):
+            st.error("Wrong password.")
+            st.stop()
+        st.session_state["admin"] = True
+
+    # 🚚 Latest pipeline run
+    st.subheader("🚚 Latest pipeline run")
+    run = last_run()
+    if run is None:
+        st.info("No pipeline run has saved its metrics yet; `python pipeline.py` writes them to data/metrics.")
+    else:
+        st.caption(f"Finished {run['written']}")
+        st.dataframe(pd.DataFrame(run.get("report", [])), hide_index=True, use_container_width=True)
+        col1, col2 = st.columns([0.65, 0.35])
+        with col1:
+            if run["timers"]:
+                st.dataframe(timing_table(run["timers"]), hide_index=True, use_container_width=True)
+        with col2:
+            if run["counters"]:
+                st.dataframe(counter_table(run["counters"]), hide_index=True, use_container_width=True)
+
+    # ⏱️ This app process: rerun latency per page, then everything else it timed
+    timers = metrics.timers()
+    reruns = [row for row in timers if row["name"] == "page.rerun"]
+    st.subheader("⏱️ Page reruns (this server process)")
+    if reruns:
+        table = timing_table(reruns)
+        table["Series"] = [row["labels"]["page"] for row in reruns]
+        st.dataframe(table.rename(columns={"Series": "Page", "Count": "Reruns"}), hide_index=True,
+                     use_container_width=True)
+    else:
+        st.info("No completed page reruns yet.")
+
+    st.subheader("🔬 Data, chart and assistant timings")
+    others = [row for row in timers if row["name"] != "page.rerun"]
+    if others:
+        st.dataframe(timing_table(others), hide_index=True, use_container_width=True)
+    counters = metrics.counters()
+    if counters:
+        st.dataframe(counter_table(counters), hide_index=True, use_container_width=True)
+
+    st.download_button("⬇️ Prometheus metrics", metrics.prometheus(), file_name="smartrent.prom", mime="text/plain")
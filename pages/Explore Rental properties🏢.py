@@ -1,49 +1,124 @@
+import numpy as np
 import streamlit as st
-import pandas as pd
 
-# Load cleaned rental data
-@st.cache_data
-def load_data():
-    df = pd.read_csv("data/cleaned_data.csv")
-    df.dropna(subset=["Title", "Location", "Price", "Link", "Image", "BHK"], inplace=True)
-    return df
+from smartrent.cards import (CARD_CSS, PAGE_SIZES, SORT_OPTIONS, estimate_notes, page_count, page_slice,
+                             render_cards, similar_notes)
+from smartrent.cities import CITIES, DEFAULT_CITY
+from smartrent.data import (EXPLORER_COLUMNS, filter_index, geo_index, listings, price_estimates, rent_predictor,
+                            search_index, show_data_stats, similar_index, thumbnail_cache)
+from smartrent.monitoring import track_rerun
 
-df = load_data()
+with track_rerun("explorer"):
+    # Load cleaned rental data
+    df = listings(EXPLORER_COLUMNS)
+    index = filter_index(EXPLORER_COLUMNS)
+    geo = geo_index(EXPLORER_COLUMNS)
 
-# Page config
-st.set_page_config(page_title="SmartRent Listings", layout="wide")
+    # Page config
+    st.set_page_config(page_title="SmartRent Listings", layout="wide")
+    show_data_stats()
 
-st.title("🏙️ Delhi Rental Listings")
-st.write("Browse rental properties across Delhi. Filter by location and BHK to explore listings and pricing trends.")
+    # A city filter only once listings from more than one city have been scraped
+    multi_city = len(index.cities) > 1
+    region = "all cities" if multi_city else (index.cities[0] if index.cities else CITIES[DEFAULT_CITY].label)
+    st.title("🏙️ Rental Listings" if multi_city else f"🏙️ {region} Rental Listings")
+    st.write(f"Browse rental properties across {region}. Filter by location, BHK, price and area to explore listings and pricing trends.")
 
-# Filter form
-with st.form("filter_form"):
-    locations = sorted(df["Location"].unique())
-    locations.insert(0, "All")
-    selected_location = st.selectbox("📍 Select a location in Delhi", locations)
+    # Rent estimate widget
+    predictor = rent_predictor()
+    if predictor is not None:
+        with st.expander("💡 Estimate my rent"):
+            col1, col2, col3, col4 = st.columns(4)
+            with col1:
+                est_locality = st.selectbox("Locality", sorted(predictor.table.index.astype(str)), key="est_locality")
+            with col2:
+                est_bhk = st.number_input("BHK", min_value=1, max_value=10, value=2, key="est_bhk")
+            with col3:
+                est_bath = st.number_input("Bathrooms", min_value=1, max_value=10, value=2, key="est_bath")
+            with col4:
+                est_area = st.number_input("Area (sqft)", min_value=100, max_value=10000, value=900, step=50,
+                                           key="est_area")
+            estimate = predictor.predict_one(est_bhk, est_bath, est_area, est_locality)
+            st.markdown(f"**Estimated monthly rent:** ₹{round(estimate, -2):,.0f}")
 
-    bhk_options = sorted(df["BHK"].unique())
-    bhk_options.insert(0, "All")
-    selected_bhk = st.selectbox("🛏️ Select BHK type", bhk_options)
+    # The city is picked outside the form, so the location list follows it without a submit.
+    selected_city = st.selectbox("🌆 Select a city", ["All"] + index.cities) if multi_city else "All"
+    if selected_city != "All":
+        locations, locations_region, location_label = index.locations_in(selected_city), selected_city, str
+    else:
+        locations, locations_region = index.locations, region
+        location_label = index.location_label if multi_city else str
+
+    # Filter form
+    with st.form("filter_form"):
+        search_query = st.text_input("🔎 Search titles and localities",
+                                     placeholder="e.g. furnished 2bhk rajouri garden")
+        selected_location = st.selectbox(f"📍 Select a location in {locations_region}", ["All"] + locations,
+                                         format_func=lambda loc: loc if loc == "All" else location_label(loc))
+        selected_bhk = st.selectbox("🛏️ Select BHK type", ["All"] + index.bhk_options)
+
+        col1, col2 = st.columns(2)
+        with col1:
+            near_place = st.selectbox("🧭 Or search around a locality", ["Anywhere"] + sorted(geo.places))
+        with col2:
+            near_km = st.slider("📏 Within (km)", 1, 15, 3)
+
+        price_bounds = index.bounds("Price")
+        area_bounds = index.bounds("Area")
+        # st.slider needs two distinct ends; with no or one distinct value there is nothing to narrow.
+        price_range, area_range = price_bounds, area_bounds
+        col1, col2 = st.columns(2)
+        with col1:
+            if price_bounds[0] < price_bounds[1]:
+                price_range = st.slider("💰 Price range (₹)", *price_bounds, value=price_bounds, step=500)
+        with col2:
+            if area_bounds[0] < area_bounds[1]:
+                area_range = st.slider("📐 Area range (sqft)", *area_bounds, value=area_bounds, step=50)
 
-    submitted = st.form_submit_button("🔍 Show Listings")
+        col1, col2 = st.columns(2)
+        with col1:
+            selected_sort = st.selectbox("↕️ Sort by", list(SORT_OPTIONS))
+        with col2:
+            page_size = st.selectbox("📄 Listings per page", PAGE_SIZES)
 
-# Filter and display
-if submitted:
-    filtered_df = df.copy()
+        submitted = st.form_submit_button("🔍 Show Listings")
 
-    if selected_location != "All":
-        filtered_df = filtered_df[filtered_df["Location"] == selected_location]
+    # Keep the last submitted filters so paging through results survives reruns.
+    if submitted:
+        st.session_state["explore_filters"] = (search_query, selected_city, selected_location, selected_bhk, near_place,
+                                               near_km, price_range, area_range, selected_sort, page_size)
+        st.session_state["explore_page"] = 1
 
-    if selected_bhk != "All":
-        filtered_df = filtered_df[filtered_df["BHK"] == selected_bhk]
+    # Filter and display
+    if "explore_filters" in st.session_state:
+        (search_query, selected_city, selected_location, selected_bhk, near_place, near_km,
+         price_range, area_range, selected_sort, page_size) = st.session_state["explore_filters"]
 
-    location_label = selected_location if selected_location != "All" else "Delhi"
-    bhk_label = f"{selected_bhk} BHK" if selected_bhk != "All" else "All BHKs"
+        # Untouched sliders mean "any": listings without an Area stay in the results.
+        rows = index.query(
+            city=selected_city if selected_city != "All" else None,
+            location=selected_location if selected_location != "All" else None,
+            bhk=selected_bhk if selected_bhk != "All" else None,
+            price=price_range if tuple(price_range) != price_bounds else None,
+            area=area_range if tuple(area_range) != area_bounds else None,
+        )
+        if near_place != "Anywhere":
+            rows = rows[np.isin(rows, geo.near(near_place, near_km), assume_unique=True)]
+        if search_query.strip():
+            # Keep search ranking order, restricted to rows that pass the filters.
+            ranked = index.rows_for_ids(search_index().search(search_query))
+            rows = ranked[np.isin(ranked, rows)]
 
-    if not filtered_df.empty:
-        avg_price = int(filtered_df["Price"].mean())
-        st.markdown(f"""
+        city_name = selected_city if selected_city != "All" else region
+        location_label = "in " + (selected_location if selected_location != "All" else city_name)
+        if near_place != "Anywhere":
+            around = f"within {near_km} km of {near_place}"
+            location_label = around if selected_location == "All" else f"{location_label}, {around}"
+        bhk_label = f"{selected_bhk} BHK" if selected_bhk != "All" else "All BHKs"
+
+        if len(rows):
+            avg_price = int(index.price[rows].mean())
+            st.markdown(f"""
             <div style="
                 background: linear-gradient(to right, #1a1f27, #2c3e50);
                 padding: 20px;
@@ -52,42 +127,25 @@ if submitted:
                 text-align: center;
                 margin-bottom: 30px;
             ">
-                <h3 style="color:#f0f4f8;">📊 Average Price in {location_label} ({bhk_label})</h3>
+                <h3 style="color:#f0f4f8;">📊 Average Price {location_label} ({bhk_label})</h3>
                 <p style="font-size:1.5em; font-weight:bold; color:#ffffff;">₹{avg_price:,}</p>
             </div>
         """, unsafe_allow_html=True)
 
-        for _, row in filtered_df.iterrows():
-            st.markdown(f"""
-                <div style="
-                    background: linear-gradient(to right, #1a1f27, #2c3e50);
-                    padding: 20px;
-                    border-radius: 12px;
-                    box-shadow: 0 0 12px rgba(255, 255, 255, 0.05);
-                    margin-bottom: 30px;
-                ">
-                    <div style="display: flex; gap: 20px; align-items: center;">
-                        <div style="flex: 1;">
-                            <img src="{row['Image']}" style="height:200px; width:auto; border-radius:8px;" />
-                        </div>
-                        <div style="flex: 2; color: #f0f4f8;">
-                            <h3 style="margin-bottom: 8px;">{row['Title']}</h3>
-                            <p style="margin: 4px 0;"><strong>📍 Location:</strong> {row['Location']}</p>
-                            <p style="margin: 4px 0;"><strong>💰 Price:</strong> ₹{int(row['Price']):,}</p>
-                            <p style="margin: 4px 0;"><strong>🛏️ BHK:</strong> {row['BHK']}</p>
-                            <a href="{row['Link']}" target="_blank" style="
-                                display: inline-block;
-                                margin-top: 10px;
-                                padding: 8px 16px;
-                                background-color: #07375b;
-                                color: white;
-                                text-decoration: none;
-                                border-radius: 6px;
-                                font-weight: bold;
-                            ">🔗 Visit Listing</a>
-                        </div>
-                    </div>
-                </div>
-            """, unsafe_allow_html=True)
-    else:
-        st.warning("No listings found for the selected filters.")
\ No newline at end of file
+            n_pages = page_count(len(rows), page_size)
+            page = st.number_input(f"Page (of {n_pages}, {len(rows):,} listings)",
+                                   min_value=1, max_value=n_pages, step=1, key="explore_page")
+            page_rows = page_slice(index.order(rows, selected_sort), page, page_size)
+            page_df = df.iloc[page_rows]
+            # Serve cached thumbnails inline once the pipeline has fetched them.
+            thumbs = thumbnail_cache()
+            images = page_df["Image"].map(thumbs.src) if thumbs else None
+            estimates = price_estimates()
+            notes = estimate_notes(page_df, estimates) if estimates is not None else None
+            # Comparable flats for the whole page in one batched index lookup
+            neighbours = index.row_of(similar_index().similar(index.ids[page_rows]))
+            similar = similar_notes(page_df, neighbours, df)
+            notes = similar if notes is None else notes + similar
+            st.markdown(CARD_CSS + render_cards(page_df, images, notes), unsafe_allow_html=True)
+        else:
+            st.warning("No listings found for the selected filters.")
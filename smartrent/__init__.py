@@ -0,0 +1 @@
+# Shared scraping, cleaning and data-access code for the SmartRent pipeline and dashboard.
@@ -0,0 +1,122 @@
+import glob
+import os
+
+import numpy as np
+import pandas as pd
+
+from smartrent.downsample import POINT_BUDGET, binned_density, stratified_sample
+from smartrent.geo import Geocoder
+from smartrent.store import INSIGHTS_COLUMNS
+
+AGGREGATES_DIR = "data/aggregates"
+HIST_BINS = 30
+
+
+def _price_stats(df, by):
+    grouped = df.groupby(by, observed=True)
+    price = grouped["Price"]
+    stats = pd.DataFrame({
+        "Count": grouped.size(),
+        "MeanPrice": price.mean(),
+        "MedianPrice": price.median(),
+        "Q1Price": price.quantile(0.25),
+        "Q3Price": price.quantile(0.75),
+        "MinPrice": price.min(),
+        "MaxPrice": price.max(),
+        "MeanArea": grouped["Area"].mean(),
+        "MedianArea": grouped["Area"].median(),
+        "PricePerSqft": grouped["PricePerSqft"].median(),
+    })
+
+    # Box-plot whiskers: the furthest prices still inside 1.5 IQR of the quartiles.
+    iqr = stats["Q3Price"] - stats["Q1Price"]
+    low = df[by].map(stats["Q1Price"] - 1.5 * iqr).astype(float)
+    high = df[by].map(stats["Q3Price"] + 1.5 * iqr).astype(float)
+    inside = df["Price"].where((df["Price"] >= low) & (df["Price"] <= high))
+    fences = inside.groupby(df[by], observed=True).agg(["min", "max"])
+    stats["LowerFence"] = fences["min"]
+    stats["UpperFence"] = fences["max"]
+    return stats.reset_index()
+
+
+def _histogram(values, name):
+    values = values.dropna().to_numpy(dtype=np.float64)
+    if len(values) == 0:
+        return pd.DataFrame({"Column": [], "Left": [], "Right": [], "Count": []})
+    # Clip the long tail so a few mistyped prices do not squash every bin.
+    high = np.quantile(values, 0.99)
+    counts, edges = np.histogram(np.minimum(values, high), bins=HIST_BINS)
+    return pd.DataFrame({"Column": name, "Left": edges[:-1], "Right": edges[1:], "Count": counts})
+
+
+def build_aggregates(df, point_budget=POINT_BUDGET, geocoder=None, geocode=True):
+    """Summary tables behind the Data Insights charts, from the full listing table.
+
+    The locality table carries each locality's Lat/Lon from `geocoder` (the
+    bundled gazetteer by default) for the map; NaN where it has no match. Pass
+    `geocode=False` for listings outside the gazetteer's city.
+    """
+    df = df.dropna(subset=list(INSIGHTS_COLUMNS)).copy()
+    df["Price"] = df["Price"].astype("int64")
+    df["Area"] = df["Area"].astype("float64")
+    df["BHK"] = df["BHK"].astype("int64")
+    df["PricePerSqft"] = (df["Price"] / df["Area"].where(df["Area"] > 0)).astype("float64")
+
+    location = _price_stats(df, "Location").sort_values("Location").reset_index(drop=True)
+    location["Location"] = location["Location"].astype(str)
+    locality = _price_stats(df, "Locality").sort_values("Locality").reset_index(drop=True)
+    locality["Locality"] = locality["Locality"].astype(str)
+    if geocode:
+        coords = (geocoder or Geocoder()).geocode(locality["Locality"])
+        locality = locality.merge(coords[["Locality", "Lat", "Lon"]], on="Locality", how="left")
+    bhk = _price_stats(df, "BHK").sort_values("BHK").reset_index(drop=True)
+    location_bhk = (df.groupby(["Location", "BHK"], observed=True)["Price"]
+                      .agg(Count="size", MeanPrice="mean", MedianPrice="median")
+                      .reset_index())
+    location_bhk["Location"] = location_bhk["Location"].astype(str)
+    histograms = pd.concat([_histogram(df["Price"], "Price"),
+                            _histogram(df["Area"], "Area"),
+                            _histogram(df["PricePerSqft"], "PricePerSqft")], ignore_index=True)
+
+    # Downsampled points for the charts that plot individual listings.
+    scatter = stratified_sample(df, "Location", point_budget, columns=("Price", "Area"))
+    scatter = scatter[["Title", "Location", "BHK", "Area", "Price"]].reset_index(drop=True)
+    scatter["Location"] = scatter["Location"].astype(str)
+    top = location.nlargest(15, "Count")["Location"]
+    in_top = df[df["Location"].astype(str).isin(top)]
+    box = stratified_sample(in_top, "Location", point_budget)[["Location", "Price"]].reset_index(drop=True)
+    box["Location"] = box["Location"].astype(str)
+
+    return {
+        "location": location,
+        "locality": locality,
+        "bhk": bhk,
+        "location_bhk": location_bhk,
+        "histograms": histograms,
+        "scatter_points": scatter,
+        "box_points": box,
+        "price_area_density": binned_density(df, "Area", "Price"),
+    }
+
+
+def write_aggregates(tables, directory=AGGREGATES_DIR):
+    os.makedirs(directory, exist_ok=True)
+    for name, table in tables.items():
+        path = os.path.join(directory, f"{name}.parquet")
+        table.to_parquet(path + ".tmp", index=False)
+        os.replace(path + ".tmp", path)
+
+
+def load_aggregates(directory=AGGREGATES_DIR):
+    paths = glob.glob(os.path.join(directory, "*.parquet"))
+    if not paths:
+        return None
+    return {os.path.basename(p)[:-len(".parquet")]: pd.read_parquet(p) for p in paths}
+
+
+def aggregates_version(directory=AGGREGATES_DIR):
+    stamps = []
+    for path in sorted(glob.glob(os.path.join(directory, "*.parquet"))):
+        st = os.stat(path)
+        stamps.append((path, st.st_mtime_ns))
+    return tuple(stamps)
@@ -0,0 +1,483 @@
+import difflib
+import hashlib
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+import numpy as np
+from langchain_core.messages import AIMessage, AIMessageChunk, HumanMessage, SystemMessage
+
+from smartrent.cities import CITIES, DEFAULT_CITY
+from smartrent.metrics import metrics
+
+SYSTEM_PROMPT = (
+    "You are SmartBot, the assistant of SmartRent, a dashboard of rental listings in {region} scraped from OLX. "
+    "Answer questions about rents, localities and the platform. When a 'Listing data' block is given, "
+    "base every number you state on it and say so if it does not cover the question; never invent figures."
+)
+
+# Prompt budget per turn; older turns beyond it are folded into a one-line summary.
+MAX_PROMPT_TOKENS = 1500
+KEEP_TURNS = 3
+SUMMARY_TOKENS = 80
+# Listing examples quoted when the question asks for listings.
+EXAMPLES = 3
+MAX_PLACES = 3
+PLACE_SIMILARITY = 0.85
+
+# A 1 RK (room and kitchen) has no bedroom, so "1rk" does not ask about 1 BHK.
+BHK_QUESTION = re.compile(r"\b(\d)\s*-?\s*(?:bhk|bed(?:room)?s?\b)")
+AMOUNT = r"(\d+(?:[.,]\d+)*)\s*(k|thousand|lakhs?|lacs?|l)?\b"
+BETWEEN = re.compile(r"between\s+(?:rs\.?|₹)?\s*" + AMOUNT + r"\s*(?:and|to|-)\s*(?:rs\.?|₹)?\s*" + AMOUNT)
+CURRENCY = r"\s+(?:rs\.?|₹)?\s*"
+# "within" is only a budget with a currency or a rent unit after it; "within 5 km" is a distance.
+WITHIN = r"within(?=\s+(?:rs\b|₹|[\d.,]+\s*(?:k|thousand|lakhs?|lacs?|l)\b))"
+UNDER = re.compile(r"(?:under|below|less than|upto|up to|" + WITHIN + r"|max(?:imum)?|cheaper than)" + CURRENCY + AMOUNT)
+OVER = re.compile(r"(?:above|over|more than|at least|min(?:imum)?|starting)" + CURRENCY + AMOUNT)
+WANTS_LISTINGS = re.compile(r"\b(?:cheapest|lowest|show|find|list|suggest|recommend|options?|listings?|flats?)\b")
+WORDS = re.compile(r"[a-z0-9]+")
+AMOUNT_WITH_UNIT = re.compile(r"(\d+(?:[.,]\d+)*)\s*(k|thousand|lakhs?|lacs?)\b")
+# Question words, keeping decimals such as "2.5" whole.
+TOKENS = re.compile(r"[a-z0-9]+(?:\.\d+)*")
+
+# Cached replies are reused for this long, and the least recently used go first past the limit.
+CACHE_TTL = 6 * 60 * 60
+CACHE_ENTRIES = 512
+# Words that do not change what a question asks, and spellings of the same thing.
+STOPWORDS = frozenset(
+    "a an the is are was be what whats which of in at on for to from me my i we please tell can could "
+    "you would like know about does do much how typical typically current currently there any around near".split()
+)
+SYNONYMS = {"avg": "average", "mean": "average", "price": "rent", "prices": "rent", "cost": "rent",
+            "rents": "rent", "flats": "flat", "apartment": "flat", "apartments": "flat", "listings": "listing"}
+
+
+def count_tokens(text):
+    # About four characters per token for English; close enough to budget prompts.
+    return len(text) // 4 + 1
+
+
+def normalize_question(text):
+    """Cache key for a question: its content words, spelled one way and sorted.
+
+    "What's the avg rent of a 2 BHK in Ramesh Nagar?" and "average 2bhk rent
+    ramesh nagar" both become "2bhk average nagar ramesh rent".
+    """
+    text = re.sub(r"(\d+)\s*-?\s*(bhk|rk)\b", r"\1\2", text.lower())
+    # Amounts become rupees before anything else, so "15.5k", "15,500" and "15500" agree.
+    text = AMOUNT_WITH_UNIT.sub(lambda m: str(_amount(*m.groups())), text)
+    words = (SYNONYMS.get(word, word) for word in TOKENS.findall(re.sub(r"(?<=\d),(?=\d)|['’]", "", text)))
+    return " ".join(sorted({word for word in words if word not in STOPWORDS}))
+
+
+def _amount(number, unit):
+    value = float(number.replace(",", ""))
+    if unit in ("k", "thousand"):
+        value *= 1_000
+    elif unit:
+        value *= 100_000
+    return int(value)
+
+
+@dataclass
+class Question:
+    """What a chat message asks about, as far as the listing data can answer it."""
+    places: tuple = ()
+    city: str = None  # a City label, only set when listings from several cities are loaded
+    bhk: int = None
+    price: tuple = None
+    wants_listings: bool = False
+
+    @property
+    def grounded(self):
+        return bool(self.places or self.bhk is not None or self.price)
+
+
+@dataclass
+class Retrieval:
+    facts: str
+    source: str  # "overview", "aggregates" or "filter"
+    seconds: float
+
+
+class ListingRetriever:
+    """Answers the quantitative part of a chat message from the listing data.
+
+    Locations, a city, BHK counts and price bounds are read out of the
+    message; location/BHK questions across every city are answered from the
+    precomputed aggregate tables, anything scoped to one city, with a price
+    bound or asking for listings runs a FilterIndex query. Only a few lines
+    of results go into the prompt.
+    """
+
+    def __init__(self, index, aggregates, df):
+        self.index = index
+        self.df = df
+        self.aggregates = aggregates
+        self.cities = [city for city in index.cities if city] or [CITIES[DEFAULT_CITY].label]
+        self._location_stats = aggregates["location"].set_index("Location")
+        self._location_bhk = aggregates["location_bhk"].set_index(["Location", "BHK"])
+        # "ramesh nagar" -> "Ramesh Nagar, Delhi"
+        self._places = {" ".join(WORDS.findall(_short(loc).lower())): loc for loc in index.locations}
+        self._longest = max((len(p.split()) for p in self._places), default=1)
+        self._city_names = [(re.compile(r"\b" + re.escape(city.lower()) + r"\b"), city) for city in self.cities]
+
+    @property
+    def region(self):
+        """The cities covered, as prose: "Delhi", "Delhi and Mumbai"."""
+        return self.cities[0] if len(self.cities) == 1 else ", ".join(self.cities[:-1]) + " and " + self.cities[-1]
+
+    def _scope(self, city):
+        # Label for "every listing" in this answer.
+        if city is not None:
+            return f"All {city}"
+        return f"All {self.cities[0]}" if len(self.cities) == 1 else "All cities"
+
+    def parse(self, text):
+        text = text.lower()
+        question = Question(places=self._find_places(text), wants_listings=bool(WANTS_LISTINGS.search(text)))
+        if len(self.cities) > 1:
+            question.city = next((city for pattern, city in self._city_names if pattern.search(text)), None)
+        if match := BHK_QUESTION.search(text):
+            question.bhk = int(match.group(1))
+        if match := BETWEEN.search(text):
+            question.price = tuple(sorted((_amount(*match.group(1, 2)), _amount(*match.group(3, 4)))))
+        else:
+            under, over = UNDER.search(text), OVER.search(text)
+            if under or over:
+                question.price = (_amount(*over.groups()) if over else 0,
+                                  _amount(*under.groups()) if under else np.inf)
+        return question
+
+    def _find_places(self, text):
+        # Longest phrases first, so "dwarka mor" wins over "dwarka"; close misspellings
+        # are only looked for when nothing matches exactly.
+        words = WORDS.findall(text)
+        for fuzzy in (False, True):
+            found, used = [], set()
+            for n in range(self._longest, 0, -1):
+                for start in range(len(words) - n + 1):
+                    span = set(range(start, start + n))
+                    if span & used:
+                        continue
+                    phrase = " ".join(words[start:start + n])
+                    place = self._places.get(phrase)
+                    if place is None and fuzzy and len(phrase) >= 5:
+                        close = difflib.get_close_matches(phrase, self._places, n=1, cutoff=PLACE_SIMILARITY)
+                        place = self._places[close[0]] if close else None
+                    if place is not None and place not in found:
+                        found.append(place)
+                        used |= span
+            if found:
+                return tuple(found[:MAX_PLACES])
+        return ()
+
+    def retrieve(self, text):
+        started = time.perf_counter()
+        question = self.parse(text)
+        if not question.grounded:
+            facts, source = self._overview(question.city), "overview"
+        elif question.price or question.wants_listings or question.city is not None:
+            facts, source = self._filtered(question), "filter"
+        else:
+            facts, source = self._from_aggregates(question), "aggregates"
+        seconds = time.perf_counter() - started
+        metrics.observe("assistant.retrieval", seconds, source=source)
+        return Retrieval(facts, source, seconds)
+
+    def _overview(self, city=None):
+        if city is None:
+            stats, prices = self._location_stats, self.index.price
+        else:
+            rows = self.index.query(city=city)
+            stats = (self.df.iloc[rows].groupby("Location", observed=True)["Price"]
+                     .agg(Count="count", MedianPrice="median"))
+            prices = self.index.price[rows]
+        if not len(prices):
+            return f"{self._scope(city)}: no listings."
+        busiest = stats.nlargest(5, "Count")
+        cheapest = stats[stats["Count"] >= 10].nsmallest(5, "MedianPrice")
+        lines = [f"{self._scope(city)}: {len(prices):,} listings, median rent ₹{np.median(prices):,.0f}, "
+                 f"mean ₹{prices.mean():,.0f}."]
+        if city is None and len(self.cities) > 1:
+            per_city = []
+            for label in self.cities:
+                city_prices = self.index.price[self.index.query(city=label)]
+                if len(city_prices):
+                    per_city.append(f"{label} ({len(city_prices):,}, median ₹{np.median(city_prices):,.0f})")
+            lines.append("By city: " + ", ".join(per_city) + ".")
+        return "\n".join(lines + [
+            "Most listings: " + ", ".join(f"{_short(loc)} ({int(row.Count):,}, median ₹{row.MedianPrice:,.0f})"
+                                          for loc, row in busiest.iterrows()) + ".",
+            "Lowest median rent (10+ listings): " + ", ".join(f"{_short(loc)} (₹{row.MedianPrice:,.0f})"
+                                                              for loc, row in cheapest.iterrows()) + ".",
+        ])
+
+    def _from_aggregates(self, question):
+        lines = []
+        for place in question.places or (None,):
+            label = _label(self._scope(None), place, question.bhk)
+            if place is None:
+                bhk = self.aggregates["bhk"].set_index("BHK")
+                row = bhk.loc[question.bhk] if question.bhk in bhk.index else None
+            elif question.bhk is None:
+                row = self._location_stats.loc[place] if place in self._location_stats.index else None
+            else:
+                key = (place, question.bhk)
+                row = self._location_bhk.loc[key] if key in self._location_bhk.index else None
+            if row is None or not row["Count"]:
+                lines.append(f"{label}: no listings.")
+                continue
+            line = f"{label}: {int(row['Count']):,} listings, median rent ₹{row['MedianPrice']:,.0f}, " \
+                   f"mean ₹{row['MeanPrice']:,.0f}"
+            if "Q1Price" in row:
+                line += f", middle half ₹{row['Q1Price']:,.0f}–₹{row['Q3Price']:,.0f}, " \
+                        f"median area {row['MedianArea']:,.0f} sqft"
+            lines.append(line + ".")
+        return "\n".join(lines)
+
+    def _filtered(self, question):
+        lines = []
+        for place in question.places or (None,):
+            label = _label(self._scope(question.city), place, question.bhk, question.price, question.city)
+            rows = self.index.query(location=place, bhk=question.bhk, price=question.price, city=question.city)
+            if not len(rows):
+                lines.append(f"{label}: no listings.")
+                continue
+            prices = self.index.price[rows]
+            area = self.index.area[rows]
+            line = f"{label}: {len(rows):,} listings, median rent ₹{np.median(prices):,.0f}, " \
+                   f"range ₹{prices.min():,.0f}–₹{prices.max():,.0f}"
+            if not np.isnan(area).all():
+                line += f", median area {np.nanmedian(area):,.0f} sqft"
+            lines.append(line + ".")
+            if question.wants_listings:
+                cheapest = rows[np.argsort(prices, kind="stable")[:EXAMPLES]]
+                for _, listing in self.df.iloc[cheapest].iterrows():
+                    lines.append(f"- {listing['Title'][:60].strip()} — ₹{int(listing['Price']):,}, "
+                                 f"{_short(listing['Location'])}, {listing['Link']}")
+        return "\n".join(lines)
+
+
+def _short(location):
+    # OLX locations end in their region, e.g. "Ramesh Nagar, Delhi".
+    return str(location).rsplit(", ", 1)[0]
+
+
+def _label(scope, place, bhk, price=None, city=None):
+    label = (_short(place) + (f", {city}" if city else "")) if place else scope
+    if bhk is not None:
+        label += f", {bhk} BHK"
+    if price:
+        low, high = price
+        if np.isinf(high):
+            label += f", ₹{low:,}+"
+        elif not low:
+            label += f", up to ₹{high:,}"
+        else:
+            label += f", ₹{low:,}–₹{high:,}"
+    return label
+
+
+def trim_history(history, budget, keep_turns=KEEP_TURNS):
+    """Split chat history into (summary, recent messages) that fit in `budget` tokens.
+
+    The newest messages are kept verbatim, up to `keep_turns` exchanges;
+    everything older becomes a one-line summary of the user's earlier questions.
+    """
+    recent, used = [], 0
+    for message in reversed(history):
+        tokens = count_tokens(message.content)
+        if len(recent) >= 2 * keep_turns or used + tokens > budget:
+            break
+        recent.append(message)
+        used += tokens
+    recent.reverse()
+    older = history[:len(history) - len(recent)]
+    asked = [m.content.strip().replace("\n", " ") for m in older if isinstance(m, HumanMessage)]
+    if not asked:
+        return None, recent
+    summary = "Earlier the user asked: "
+    for question in reversed(asked):
+        if count_tokens(summary + question) > SUMMARY_TOKENS:
+            break
+        summary += question + " | "
+    return summary.rstrip(" |"), recent
+
+
+def context_digest(messages):
+    """Short digest of the chat context a reply was written for; "" when there is none."""
+    if not messages:
+        return ""
+    digest = hashlib.sha256()
+    for message in messages:
+        digest.update(f"{message.type}:{len(message.content)}:{message.content}".encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+class ResponseCache:
+    """Thread-safe LRU of assistant replies with a TTL, shared across sessions.
+
+    Keys are (dataset version, context digest, normalized question): a
+    follow-up is only reused under the same earlier conversation, and a new
+    scrape retires every cached answer at once.
+    """
+
+    def __init__(self, max_entries=CACHE_ENTRIES, ttl=CACHE_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, version, question, context=()):
+        key = (version, context_digest(context), normalize_question(question))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry[0] > self.ttl:
+                del self._entries[key]
+                self.expired += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                metrics.count("cache.misses", cache="response")
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        metrics.count("cache.hits", cache="response")
+        return entry[1]
+
+    def put(self, version, question, answer, context=()):
+        key = (version, context_digest(context), normalize_question(question))
+        with self._lock:
+            self._entries[key] = (time.monotonic(), answer)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    @property
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+@dataclass
+class TurnStats:
+    source: str  # a Retrieval source, or "cache"
+    prompt_tokens: int
+    context_tokens: int
+    history_messages: int
+    retrieval_seconds: float
+    first_token_seconds: float
+    seconds: float
+
+
+class Assistant:
+    """Grounded chat turn: retrieve listing facts, fit the history to the budget, call the LLM.
+
+    With a `cache`, replies are stored under `version`, the trimmed history
+    that was sent with the question and the normalized question; repeated
+    questions are answered without calling the LLM.
+    """
+
+    def __init__(self, llm, retriever, max_prompt_tokens=MAX_PROMPT_TOKENS, keep_turns=KEEP_TURNS, cache=None,
+                 version=None):
+        self.llm = llm
+        self.retriever = retriever
+        self.max_prompt_tokens = max_prompt_tokens
+        self.keep_turns = keep_turns
+        self.cache = cache
+        self.version = version
+        self.system_prompt = SYSTEM_PROMPT.format(region=retriever.region)
+        self.stats = None
+
+    def prompt(self, history, question):
+        """Messages to send for `question`, plus the retrieval behind them.
+
+        `history` holds the plain chat (no data blocks), so earlier lookups do
+        not pile up in later prompts.
+        """
+        retrieval = self.retriever.retrieve(question)
+        turn = f"Listing data:\n{retrieval.facts}\n\nQuestion: {question}"
+        fixed = count_tokens(self.system_prompt) + count_tokens(turn)
+        summary, recent = trim_history(history, max(self.max_prompt_tokens - fixed - SUMMARY_TOKENS, 0),
+                                       self.keep_turns)
+        messages = [SystemMessage(content=self.system_prompt)]
+        if summary:
+            messages.append(SystemMessage(content=summary))
+        return messages + recent + [HumanMessage(content=turn)], retrieval
+
+    def stream(self, history, question):
+        """Yield the reply text as the LLM produces it; the turn's TurnStats are in `self.stats` after."""
+        started = time.perf_counter()
+        messages, retrieval = self.prompt(history, question)
+        # The summary and recent turns between the system prompt and the question shape the reply.
+        context = messages[1:-1]
+        cached = self.cache.get(self.version, question, context) if self.cache is not None else None
+        if cached is not None:
+            elapsed = time.perf_counter() - started
+            self.stats = TurnStats("cache", 0, 0, len(context), retrieval.seconds, elapsed, elapsed)
+            yield cached
+            return
+
+        parts, first_token = [], None
+        for chunk in self.llm.stream(messages):
+            if not chunk.content:
+                continue
+            if first_token is None:
+                first_token = time.perf_counter() - started
+            parts.append(chunk.content)
+            yield chunk.content
+        answer = "".join(parts)
+        metrics.observe("llm.first_token", first_token if first_token is not None else time.perf_counter() - started)
+        metrics.observe("llm.reply", time.perf_counter() - started)
+        if self.cache is not None and answer:
+            self.cache.put(self.version, question, answer, context)
+        self.stats = TurnStats(
+            source=retrieval.source,
+            prompt_tokens=sum(count_tokens(m.content) for m in messages),
+            context_tokens=count_tokens(retrieval.facts),
+            history_messages=len(messages) - 2,
+            retrieval_seconds=retrieval.seconds,
+            first_token_seconds=first_token if first_token is not None else time.perf_counter() - started,
+            seconds=time.perf_counter() - started,
+        )
+
+    def reply(self, history, question):
+        """The whole reply as one AIMessage, plus its TurnStats."""
+        answer = "".join(self.stream(history, question))
+        return AIMessage(content=answer), self.stats
+
+
+class StubLLM:
+    """Offline stand-in for ChatGroq that replies with the prompt's listing data.
+
+    Used by benchmarks and when no GROQ_API_KEY is configured; `delay` simulates
+    the time to the first token and `token_delay` the time between streamed words.
+    """
+
+    def __init__(self, delay=0.0, token_delay=0.0):
+        self.delay = delay
+        self.token_delay = token_delay
+
+    def _answer(self, messages):
+        turn = messages[-1].content
+        facts = turn.split("\n\nQuestion:")[0].removeprefix("Listing data:\n")
+        return f"Here is what the SmartRent listings show:\n\n{facts}"
+
+    def invoke(self, messages):
+        return AIMessage(content="".join(chunk.content for chunk in self.stream(messages)))
+
+    def stream(self, messages):
+        time.sleep(self.delay)
+        for i, word in enumerate(re.split(r"(?<=\s)", self._answer(messages))):
+            if i:
+                time.sleep(self.token_delay)
+            yield AIMessageChunk(content=word)
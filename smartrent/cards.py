@@ -0,0 +1,119 @@
+import math
+
+import numpy as np
+import pandas as pd
+
+PAGE_SIZES = (12, 24, 48)
+
+# Label -> (column, ascending); None keeps the stored order (newest scrape first),
+# or the search ranking when there is a search query.
+SORT_OPTIONS = {
+    "Newest / best match": None,
+    "Price: low to high": ("Price", True),
+    "Price: high to low": ("Price", False),
+    "Area: largest first": ("Area", False),
+    "Price per sqft: lowest first": ("PricePerSqft", True),
+}
+
+# Card styling lives in one stylesheet instead of inline on every card.
+CARD_CSS = """
+<style>
+    .sr-card {
+        background: linear-gradient(to right, #1a1f27, #2c3e50);
+        padding: 20px;
+        border-radius: 12px;
+        box-shadow: 0 0 12px rgba(255, 255, 255, 0.05);
+        margin-bottom: 30px;
+    }
+    .sr-card-row { display: flex; gap: 20px; align-items: center; }
+    .sr-card-img { flex: 1; }
+    .sr-card-img img { height: 200px; width: auto; border-radius: 8px; }
+    .sr-card-text { flex: 2; color: #f0f4f8; }
+    .sr-card-text h3 { margin-bottom: 8px; }
+    .sr-card-text p { margin: 4px 0; }
+    .sr-card-link {
+        display: inline-block;
+        margin-top: 10px;
+        padding: 8px 16px;
+        background-color: #07375b;
+        color: white !important;
+        text-decoration: none !important;
+        border-radius: 6px;
+        font-weight: bold;
+    }
+</style>
+"""
+
+
+def _escape(col):
+    text = col.astype("string").fillna("")
+    return (text.str.replace("&", "&amp;", regex=False)
+                .str.replace("<", "&lt;", regex=False)
+                .str.replace(">", "&gt;", regex=False)
+                .str.replace('"', "&quot;", regex=False))
+
+
+def page_count(n_rows, page_size):
+    return max(1, math.ceil(n_rows / page_size))
+
+
+def page_slice(rows, page, page_size):
+    start = (page - 1) * page_size
+    return rows[start:start + page_size]
+
+
+def estimate_notes(page, estimates):
+    """Card lines with the model's rent estimate and price flag, from `data.price_estimates()`."""
+    found = estimates.reindex(page["Link"].astype(str))
+    estimate = found["Estimate"].fillna(0).astype("int64").map("{:,}".format)
+    flag = found["Flag"].fillna("")
+    flag = flag.where(flag == "", " · " + flag)
+    notes = "<p><strong>🤖 Estimated rent:</strong> ₹" + estimate + flag + "</p>"
+    notes = notes.where(found["Estimate"].notna(), "")
+    return pd.Series(notes.to_numpy(), index=page.index)
+
+
+def similar_notes(page, neighbours, listings):
+    """Card lines linking to each listing's most similar ones.
+
+    `neighbours` holds, per card, row positions into `listings` (nearest
+    first), -1 where there are fewer.
+    """
+    found = neighbours >= 0
+    rows = listings.iloc[neighbours[found]]
+    links = ('<a href="' + _escape(rows["Link"]) + '" target="_blank">₹' +
+             rows["Price"].astype("int64").map("{:,}".format).astype("string") + " · " +
+             _escape(rows["BHK"]) + " BHK · " + _escape(rows["Location"]) + "</a>")
+    cells = np.full(neighbours.shape, "", dtype=object)
+    cells[found] = links.to_numpy(dtype=object)
+    lines = [" · ".join(cell for cell in row if cell) for row in cells]
+    notes = ["<p><strong>🏘️ Similar:</strong> " + line + "</p>" if line else "" for line in lines]
+    return pd.Series(notes, index=page.index, dtype=object)
+
+
+def render_cards(page, images=None, notes=None):
+    """HTML for one page of listing cards, built column-wise in a single string.
+
+    `images` optionally replaces the Image column as the `<img src>` values
+    (e.g. cached thumbnails) and `notes` adds trusted HTML below the BHK line;
+    both are aligned with `page`.
+    """
+    if page.empty:
+        return ""
+    images = page["Image"] if images is None else images
+    notes = "" if notes is None else notes
+    price = page["Price"].astype("int64").map("{:,}".format)
+    # Inline thumbnails are already in the page, so only remote images are loaded lazily.
+    inline = images.astype("string").fillna("").str.startswith("data:")
+    loading = pd.Series(np.where(inline, "", 'loading="lazy" '), index=page.index)
+    cards = (
+        '<div class="sr-card"><div class="sr-card-row"><div class="sr-card-img">'
+        '<img ' + loading + 'decoding="async" src="' + _escape(images) + '" /></div>'
+        '<div class="sr-card-text"><h3>' + _escape(page["Title"]) + '</h3>'
+        '<p><strong>📍 Location:</strong> ' + _escape(page["Location"]) + '</p>'
+        '<p><strong>💰 Price:</strong> ₹' + price.astype("string") + '</p>'
+        '<p><strong>🛏️ BHK:</strong> ' + _escape(page["BHK"]) + '</p>' + notes +
+        '<a class="sr-card-link" href="' + _escape(page["Link"]) + '" target="_blank">🔗 Visit Listing</a>'
+        '</div></div></div>'
+    )
+    return "".join(cards.tolist())
@@ -0,0 +1,138 @@
+import plotly.express as px
+import plotly.graph_objects as go
+
+from smartrent.downsample import render_mode
+from smartrent.metrics import metrics
+
+# Locations coloured individually in the price/area scatter; the rest are drawn as "Other".
+SCATTER_LOCATIONS = 10
+TOP_LOCATIONS = 15
+
+
+@metrics.timed("chart.build", chart="price_box")
+def price_box(location_stats, points):
+    # Boxes come from precomputed quartiles and whiskers; only the sampled
+    # points (outliers first) are sent as individual markers.
+    fig = go.Figure()
+    for row in location_stats.itertuples():
+        prices = points.loc[points["Location"] == row.Location, "Price"]
+        fig.add_trace(go.Box(
+            name=row.Location,
+            x=[row.Location],
+            q1=[row.Q1Price],
+            median=[row.MedianPrice],
+            q3=[row.Q3Price],
+            lowerfence=[row.LowerFence],
+            upperfence=[row.UpperFence],
+            mean=[row.MeanPrice],
+            legendgroup=row.Location,
+        ))
+        trace = go.Scattergl if render_mode(len(points)) == "webgl" else go.Scatter
+        fig.add_trace(trace(
+            x=[row.Location] * len(prices),
+            y=prices.to_numpy(),
+            mode="markers",
+            marker=dict(size=4, opacity=0.5),
+            legendgroup=row.Location,
+            showlegend=False,
+            hoverinfo="y",
+        ))
+    fig.update_layout(title="Price Distribution by Location", template="plotly_dark",
+                      xaxis_title="Location", yaxis_title="Price", legend_title_text="Location")
+    return fig
+
+
+@metrics.timed("chart.build", chart="price_area_scatter")
+def price_area_scatter(points):
+    # One WebGL trace per colour: the busiest locations get their own, the rest share "Other".
+    top = points["Location"].value_counts().index[:SCATTER_LOCATIONS]
+    location = points["Location"].astype(str).where(points["Location"].isin(top), "Other")
+    return px.scatter(
+        points.assign(Location=location),
+        x="Area",
+        y="Price",
+        color="Location",
+        category_orders={"Location": [str(loc) for loc in top] + ["Other"]},
+        hover_data=["Title", "BHK"],
+        title="Price vs. Area",
+        template="plotly_dark",
+        render_mode=render_mode(len(points)),
+    )
+
+
+@metrics.timed("chart.build", chart="price_area_density")
+def price_area_density(density):
+    fig = px.density_heatmap(
+        density,
+        x="Area",
+        y="Price",
+        z="Count",
+        histfunc="sum",
+        nbinsx=60,
+        nbinsy=60,
+        title="Price vs. Area (listing density)",
+        template="plotly_dark",
+    )
+    return fig
+
+
+@metrics.timed("chart.build", chart="locality_map")
+def locality_density_map(locality, region):
+    # One weighted point per geocoded locality: the heat follows listing counts.
+    points = locality.dropna(subset=["Lat", "Lon"])
+    return px.density_map(
+        points,
+        lat="Lat",
+        lon="Lon",
+        z="Count",
+        radius=30,
+        hover_name="Locality",
+        hover_data={"Count": True, "MedianPrice": ":,.0f", "Lat": False, "Lon": False},
+        center={"lat": float(points["Lat"].mean()), "lon": float(points["Lon"].mean())},
+        zoom=9.5,
+        map_style="carto-darkmatter",
+        title=f"Listing Density Across {region}",
+        template="plotly_dark",
+    )
+
+
+@metrics.timed("chart.build", chart="location_counts")
+def location_counts(location):
+    top = location.nlargest(TOP_LOCATIONS, "Count")[["Location", "Count"]]
+    fig = px.bar(top, x="Location", y="Count", color="Location", title="Number of Listings per Location",
+                 template="plotly_dark", text="Count")
+    fig.update_traces(textposition="outside")
+    return fig
+
+
+@metrics.timed("chart.build", chart="average_price")
+def average_price(location, region):
+    avg_price_df = location[["Location", "MeanPrice"]].rename(columns={"MeanPrice": "Price"})
+    return px.line(avg_price_df, x="Location", y="Price", markers=True,
+                   title=f"Average Price Trend Across {region}", template="plotly_dark")
+
+
+@metrics.timed("chart.build", chart="bhk")
+def bhk_bar(bhk):
+    return px.bar(bhk, x="BHK", y="Count", title="Distribution of BHKs", template="plotly_dark",
+                  color_discrete_sequence=["#0078D4"])
+
+
+# Data Insights charts: name -> (build from the aggregate tables and region label, height).
+INSIGHT_CHARTS = {
+    "location_counts": (lambda agg, region: location_counts(agg["location"]), 500),
+    "price_box": (lambda agg, region: price_box(agg["location"].nlargest(TOP_LOCATIONS, "Count"),
+                                                agg["box_points"]), 500),
+    "average_price": (lambda agg, region: average_price(agg["location"], region), 500),
+    "bhk": (lambda agg, region: bhk_bar(agg["bhk"]), 400),
+    "price_area_scatter": (lambda agg, region: price_area_scatter(agg["scatter_points"]), 500),
+    "price_area_density": (lambda agg, region: price_area_density(agg["price_area_density"]), 500),
+    "locality_map": (lambda agg, region: locality_density_map(agg["locality"], region), 600),
+}
+
+
+def insight_chart(name, agg, region):
+    build, height = INSIGHT_CHARTS[name]
+    fig = build(agg, region)
+    fig.update_layout(margin=dict(t=40, b=40), height=height)
+    return fig
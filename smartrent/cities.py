@@ -0,0 +1,126 @@
+"""Cities the pipeline can crawl, and where each one's listings are kept.
+
+Each city is a shard: its own OLX results URL, page range and request rate,
+its own ListingStore and its own checkpoint directory under data/run. Delhi,
+the original (and default) city, keeps the top-level data/ store; any other
+city is stored under data/cities/<name>/. `CityStores` reads them all back as
+one table with a City column for the dashboards.
+"""
+import glob
+import os
+from dataclasses import dataclass
+
+import pandas as pd
+
+from smartrent.store import DATA_DIR, SCHEMA, ListingStore, default_store
+
+OLX_SITE = "https://www.olx.in/en-in"
+CATEGORY = "apartments-flats_c1723"
+CITIES_DIR = os.path.join(DATA_DIR, "cities")
+DEFAULT_CITY = "delhi"
+
+
+@dataclass(frozen=True)
+class City:
+    name: str  # short key used in paths and on the command line, e.g. "delhi"
+    label: str  # shown in the dashboards and stored in the City column
+    location: str  # OLX location path segment, e.g. "delhi_g4058659"
+    category: str = CATEGORY
+    start_page: int = 2
+    end_page: int = 80
+    rate: float = 4.0  # requests per second for this shard's fetcher
+    site: str = OLX_SITE
+
+    @property
+    def url(self):
+        return f"{self.site}/{self.location}/{self.category}"
+
+    @property
+    def root(self):
+        return DATA_DIR if self.name == DEFAULT_CITY else os.path.join(CITIES_DIR, self.name)
+
+    @property
+    def run_dir(self):
+        return os.path.join(self.root, "run")
+
+    def store(self):
+        return default_store if self.name == DEFAULT_CITY else _city_store(self.root)
+
+
+def _city_store(root):
+    return ListingStore(root=root, csv_path=os.path.join(root, "cleaned_data.csv"))
+
+
+# Other cities are added with `--city name=<location segment>` (from the city's OLX
+# results URL), or listed here once their location id has been checked.
+CITIES = {
+    "delhi": City("delhi", "Delhi", "delhi_g4058659"),
+}
+
+
+def parse_city(spec):
+    """A City from "name" (a configured one) or "name=location" (any OLX location segment)."""
+    name, _, location = spec.partition("=")
+    name = name.strip().lower()
+    if not location:
+        if name not in CITIES:
+            raise ValueError(f"unknown city {name!r}: pass it as {name}=<OLX location segment, "
+                             f"e.g. delhi_g4058659>")
+        return CITIES[name]
+    base = CITIES.get(name)
+    if base is not None:
+        return City(name, base.label, location.strip(), base.category, base.start_page, base.end_page, base.rate)
+    return City(name, name.replace("_", " ").title(), location.strip())
+
+
+def city_label(name):
+    return CITIES[name].label if name in CITIES else name.replace("_", " ").title()
+
+
+class CityStores:
+    """Every city's listing store, read as one table with a City column.
+
+    Delhi's store is always included; other cities are found under `cities_dir`.
+    `version()` changes whenever any of them is written.
+    """
+
+    def __init__(self, default=default_store, cities_dir=CITIES_DIR, default_city=DEFAULT_CITY):
+        self.default = default
+        self.cities_dir = cities_dir
+        self.default_city = default_city
+
+    def stores(self):
+        """City name -> ListingStore."""
+        stores = {self.default_city: self.default}
+        for root in sorted(glob.glob(os.path.join(self.cities_dir, "*"))):
+            if os.path.isdir(root):
+                stores[os.path.basename(root)] = _city_store(root)
+        return stores
+
+    def labels(self):
+        return {name: city_label(name) for name in self.stores()}
+
+    def version(self):
+        return tuple((name, store.version()) for name, store in self.stores().items())
+
+    def load(self, columns=None):
+        frames, empty = [], None
+        for name, store in self.stores().items():
+            df = store.load(columns).assign(City=city_label(name))
+            # A city with no rows yet (e.g. a first crawl that found nothing) adds nothing to the table.
+            if len(df):
+                frames.append(df)
+            elif empty is None:
+                empty = df
+        frames = frames or [empty]
+        if len(frames) == 1:
+            df = frames[0]
+        else:
+            # Category columns only survive concat when every frame has the same categories.
+            df = pd.concat(frames, ignore_index=True)
+            df = df.astype({c: SCHEMA[c] for c in df.columns if SCHEMA.get(c) == "category"})
+        df["City"] = df["City"].astype("category")
+        return df
+
+
+all_cities = CityStores()
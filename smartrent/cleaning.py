@@ -0,0 +1,107 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+from smartrent.metrics import metrics
+
+IID_PATTERN = re.compile(r'iid-(\d+)')
+BHK_PATTERN = re.compile(r'(\d+)\s*bhk')
+BATHROOM_PATTERN = re.compile(r'(\d+)\s*bathroom')
+AREA_PATTERN = re.compile(r'(\d+(?:\.\d+)?)\s*(sqft|ft)')
+
+
+# Row-at-a-time reference implementations, kept for benchmarks and output checks.
+def clean_price(data):
+    data =  data.replace('₹','').replace(',','')
+    return int(data)
+
+
+def parse_listing(info):
+    if pd.isna(info):
+        return pd.Series([None, None, None])
+
+    bhk = None
+    bath = None
+    area = None
+
+    parts = info.split(' - ')
+    for part in parts:
+        part = part.strip().lower()
+
+        # Extract BHK
+        if 'bhk' in part:
+            match = re.search(r'(\d+)\s*bhk', part)
+            if match:
+                bhk = int(match.group(1))
+
+        # Extract Bathroom
+        elif 'bathroom' in part:
+            match = re.search(r'(\d+)\s*bathroom', part)
+            if match:
+                bath = int(match.group(1))
+
+        # Extract Area
+        elif 'sqft' in part or 'ft' in part:
+            match = re.search(r'(\d+(\.\d+)?)\s*(sqft|ft)', part)
+            if match:
+                raw_area = float(match.group(1))
+                unit = match.group(3)
+                area = raw_area if unit == 'sqft' else raw_area * raw_area  # Convert ft² to m² if needed
+                area = round(area, 2)
+
+    return pd.Series([bhk, bath, area])
+
+
+def get_area(data):
+    data = data.split(',')
+    return data[0]
+
+
+def clean_price_column(prices):
+    return (prices.str.replace('₹', '', regex=False)
+                  .str.replace(',', '', regex=False)
+                  .str.strip()
+                  .astype('int64'))
+
+
+def parse_info_column(info):
+    """Vectorized `parse_listing`: BHK, Bathroom and Area columns from the Info text.
+
+    Info is split into its ' - ' parts and each part is classified the same way
+    `parse_listing` does (bhk, else bathroom, else ft); the last match of each
+    kind wins, as in the loop.
+    """
+    parts = info.str.split(' - ').explode().str.strip().str.lower()
+    is_bhk = parts.str.contains('bhk', regex=False, na=False)
+    is_bath = ~is_bhk & parts.str.contains('bathroom', regex=False, na=False)
+    is_area = ~is_bhk & ~is_bath & parts.str.contains('ft', regex=False, na=False)
+
+    bhk = parts.where(is_bhk).str.extract(BHK_PATTERN, expand=False).astype(float)
+    bath = parts.where(is_bath).str.extract(BATHROOM_PATTERN, expand=False).astype(float)
+    area_parts = parts.where(is_area).str.extract(AREA_PATTERN)
+    raw_area = area_parts[0].astype(float)
+    area = raw_area.where(area_parts[1] == 'sqft', raw_area * raw_area)
+
+    # np.round can differ from Python's round() in the last place; only
+    # fractional areas need rounding at all, and there are few of them.
+    fractional = area.notna() & (area % 1 != 0)
+    area[fractional] = area[fractional].map(lambda v: round(v, 2))
+
+    parsed = pd.DataFrame({0: bhk, 1: bath, 2: area}).groupby(level=0).last()
+    return parsed.reindex(info.index)
+
+
+def listing_ids(links):
+    # OLX ad links end in `...-iid-1812421705`; that number identifies the ad.
+    return pd.to_numeric(links.str.extract(IID_PATTERN, expand=False)).astype('Int64')
+
+
+@metrics.timed("clean")
+def clean_listings(df):
+    """Return a copy of raw scraped listings with Price, BHK, Bathroom, Area and Locality cleaned."""
+    df = df.copy()
+    df['Price'] = clean_price_column(df['Price'])
+    df[['BHK', 'Bathroom', 'Area']] = parse_info_column(df['Info']).to_numpy(dtype=np.float64)
+    df['Locality'] = df['Location'].str.split(',', n=1, expand=True)[0]
+    return df
@@ -0,0 +1,259 @@
+import os
+import threading
+import time
+
+import pandas as pd
+import streamlit as st
+
+from smartrent.aggregates import AGGREGATES_DIR, aggregates_version, build_aggregates, load_aggregates
+from smartrent.cities import CITIES, DEFAULT_CITY, all_cities
+from smartrent.filters import FilterIndex
+from smartrent.geo import GAZETTEER_PATH, GeoIndex, Geocoder
+from smartrent.metrics import metrics
+from smartrent.model import ESTIMATES_PATH, MODEL_PATH, RentPredictor
+from smartrent.search import SEARCH_INDEX_PATH, SearchIndex
+from smartrent.similar import SIMILAR_INDEX_PATH, SimilarIndex
+from smartrent.store import EXPLORER_COLUMNS, INSIGHTS_COLUMNS, OVERVIEW_COLUMNS
+from smartrent.thumbnails import MANIFEST_PATH, ThumbnailCache
+
+_stats_lock = threading.Lock()
+_stats = {"loads": 0, "load_seconds": 0.0, "views": {}, "bytes": 0}
+
+
+def _memory(df):
+    return int(df.memory_usage(deep=True).sum())
+
+
+def _mtime(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+@st.cache_resource(max_entries=1, show_spinner=False)
+def _listings(version):
+    started = time.perf_counter()
+    df = all_cities.load()
+    seconds = time.perf_counter() - started
+    metrics.observe("data.load", seconds)
+    with _stats_lock:
+        _stats["loads"] += 1
+        _stats["load_seconds"] = seconds
+        _stats["bytes"] = _memory(df)
+        _stats["views"] = {}
+    return df
+
+
+def required_view(df, required):
+    """Rows of `df` where every `required` column is known; `df` itself when none is missing."""
+    mask = df[list(required)].notna().all(axis=1)
+    return df if mask.all() else df[mask].reset_index(drop=True)
+
+
+@st.cache_resource(max_entries=8, show_spinner=False)
+def _view(version, required):
+    df = _listings(version)
+    view = required_view(df, required)
+    with _stats_lock:
+        _stats["views"][required] = 0 if view is df else _memory(view)
+    return view
+
+
+def listings(required=()):
+    """Process-wide listing table of every city (see smartrent.cities), loaded once per data version.
+
+    `required` names columns that must be non-null; the filtered view is cached
+    too. The returned frame is shared by every session, so treat it as
+    read-only: filter into new frames instead of modifying it in place.
+    """
+    version = all_cities.version()
+    if not required:
+        return _listings(version)
+    return _view(version, tuple(required))
+
+
+@st.cache_resource(max_entries=2, show_spinner=False)
+def _filter_index(version, required):
+    return FilterIndex(_view(version, required))
+
+
+def filter_index(required=EXPLORER_COLUMNS):
+    """FilterIndex over `listings(required)`, built once per data version."""
+    return _filter_index(all_cities.version(), tuple(required))
+
+
+def _gazetteer_localities(df):
+    # The gazetteer only covers Delhi; other cities' rows get no coordinates.
+    return df["Locality"].where(df["City"] == CITIES[DEFAULT_CITY].label)
+
+
+@st.cache_resource(max_entries=1, show_spinner=False)
+def _locality_coords(version, gazetteer_version):
+    return Geocoder().geocode(_gazetteer_localities(_listings(version)))
+
+
+def locality_coords():
+    """Lat/Lon per distinct Delhi Locality from the bundled gazetteer (see smartrent.geo); NaN where unmatched."""
+    return _locality_coords(all_cities.version(), _mtime(GAZETTEER_PATH))
+
+
+@st.cache_resource(max_entries=2, show_spinner=False)
+def _geo_index(version, required, gazetteer_version):
+    return GeoIndex.from_localities(_gazetteer_localities(_view(version, required)),
+                                    _locality_coords(version, gazetteer_version))
+
+
+def geo_index(required=EXPLORER_COLUMNS):
+    """GeoIndex over `listings(required)`, row-aligned with `filter_index(required)`."""
+    return _geo_index(all_cities.version(), tuple(required), _mtime(GAZETTEER_PATH))
+
+
+@st.cache_resource(max_entries=1, show_spinner=False)
+def _search_index(version, listings_version):
+    index = SearchIndex.load()
+    if index is None:
+        index = SearchIndex.build(_listings(listings_version))
+    return index
+
+
+def search_index():
+    """Title/Locality search index written by the pipeline (built here if missing)."""
+    version = _mtime(SEARCH_INDEX_PATH)
+    return _search_index(version, all_cities.version() if version is None else ())
+
+
+@st.cache_resource(max_entries=1, show_spinner=False)
+def _similar_index(version, listings_version):
+    index = SimilarIndex.load()
+    if index is None:
+        index = SimilarIndex.build(_view(listings_version, tuple(EXPLORER_COLUMNS)))
+    return index
+
+
+def similar_index():
+    """Nearest-neighbour index behind the explorer's similar listings (built here if missing)."""
+    version = _mtime(SIMILAR_INDEX_PATH)
+    return _similar_index(version, all_cities.version() if version is None else ())
+
+
+@st.cache_resource(max_entries=1, show_spinner=False)
+def _thumbnails(version):
+    return ThumbnailCache()
+
+
+def thumbnail_cache():
+    """Cached listing thumbnails, or None until the pipeline has warmed the cache."""
+    version = _mtime(MANIFEST_PATH)
+    if version is None:
+        return None
+    cache = _thumbnails(version)
+    return cache if len(cache) else None
+
+
+@st.cache_resource(max_entries=1, show_spinner=False)
+def _rent_predictor(version):
+    return RentPredictor.load()
+
+
+def rent_predictor():
+    """The pipeline's trained rent model, loaded once per process; None before the first training run."""
+    version = _mtime(MODEL_PATH)
+    return _rent_predictor(version) if version else None
+
+
+@st.cache_resource(max_entries=1, show_spinner=False)
+def _price_estimates(version):
+    estimates = pd.read_parquet(ESTIMATES_PATH)
+    # Pre-index data can repeat a link; any copy's estimate will do.
+    return estimates.drop_duplicates("Link").set_index("Link")
+
+
+def price_estimates():
+    """Batch estimates per listing Link (Estimate, Ratio, Flag), or None before the first run."""
+    version = _mtime(ESTIMATES_PATH)
+    return _price_estimates(version) if version else None
+
+
+@st.cache_resource(max_entries=8, show_spinner=False)
+def _aggregates(directory, version, listings_version, city):
+    tables = load_aggregates(directory)
+    if tables is None:
+        # The pipeline has not materialized them yet; build once from the listings.
+        df = _listings(listings_version)
+        if city is not None:
+            df = df[df["City"] == city]
+        tables = build_aggregates(df, geocode=set(df["City"].unique()) <= {CITIES[DEFAULT_CITY].label})
+    return tables
+
+
+@st.cache_resource(max_entries=32, show_spinner=False)
+def _insight_chart(name, directory, version, listings_version, city, region):
+    from smartrent.charts import insight_chart  # plotly is only needed by Data Insights
+    return insight_chart(name, _aggregates(directory, version, listings_version, city), region)
+
+
+def cities():
+    """Labels of the cities with listings, in the City column's order."""
+    return list(listings()["City"].cat.categories)
+
+
+def _aggregates_key(city):
+    names = {label: name for name, label in all_cities.labels().items()}
+    directory = AGGREGATES_DIR if city is None else os.path.join(AGGREGATES_DIR, f"city={names.get(city, city)}")
+    version = aggregates_version(directory)
+    return directory, version, () if version else all_cities.version(), city
+
+
+def aggregates(city=None):
+    """Precomputed summary tables for the Data Insights charts (see smartrent.aggregates).
+
+    `city` (a label from `cities()`) selects that city's tables; None covers every city.
+    """
+    return _aggregates(*_aggregates_key(city))
+
+
+def chart(name, city=None, region=None):
+    """A Data Insights figure (see charts.INSIGHT_CHARTS), built once per aggregates version and shared.
+
+    The figure is shared by every session, so do not modify it.
+    """
+    return _insight_chart(name, *_aggregates_key(city), region)
+
+
+def listing_retriever():
+    """Chat retrieval over the explorer's FilterIndex and the aggregate tables; cheap to build per rerun."""
+    from smartrent.assistant import ListingRetriever  # pulls in langchain; only the assistant page needs it
+    return ListingRetriever(filter_index(EXPLORER_COLUMNS), aggregates(), listings(EXPLORER_COLUMNS))
+
+
+@st.cache_resource(show_spinner=False)
+def response_cache():
+    """Assistant replies shared by every session of this process (see assistant.ResponseCache)."""
+    from smartrent.assistant import ResponseCache
+    return ResponseCache()
+
+
+def data_version():
+    """Fingerprint of the data the assistant answers from; part of every response cache key."""
+    return all_cities.version(), aggregates_version()
+
+
+def data_stats():
+    with _stats_lock:
+        stats = dict(_stats, views=dict(_stats["views"]))
+    stats["view_bytes"] = sum(stats["views"].values())
+    return stats
+
+
+def show_data_stats():
+    # Shown with ?debug=1: how often this process loaded the data, and what it holds.
+    if not st.query_params.get("debug"):
+        return
+    st.session_state["reruns"] = st.session_state.get("reruns", 0) + 1
+    stats = data_stats()
+    st.sidebar.caption(
+        f"Data loads this process: {stats['loads']} ({stats['load_seconds'] * 1000:.0f} ms last)  \n"
+        f"Shared table: {stats['bytes'] / 1e6:.1f} MB, extra views: {stats['view_bytes'] / 1e6:.1f} MB  \n"
+        f"Reruns this session: {st.session_state['reruns']}"
+    )
@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+
+# Most points a chart sends to the browser, and the size above which Plotly
+# should draw them with WebGL instead of SVG.
+POINT_BUDGET = 3000
+WEBGL_THRESHOLD = 1000
+
+
+def outlier_mask(df, by, columns):
+    """Rows outside their group's 1.5 IQR fences on any of `columns`."""
+    mask = pd.Series(False, index=df.index)
+    grouped = df.groupby(by, observed=True)
+    for col in columns:
+        q1 = grouped[col].transform(lambda s: s.quantile(0.25))
+        q3 = grouped[col].transform(lambda s: s.quantile(0.75))
+        iqr = q3 - q1
+        mask |= (df[col] < q1 - 1.5 * iqr) | (df[col] > q3 + 1.5 * iqr)
+    return mask
+
+
+def stratified_sample(df, by, budget=POINT_BUDGET, columns=("Price",), seed=0):
+    """At most `budget` rows, every group represented in proportion to its size.
+
+    Outliers on `columns` are kept first (up to half the budget) so the sample
+    still shows the spread; the rest is a per-group random sample. Every group
+    keeps at least one row, so a budget below the number of groups is exceeded.
+    """
+    if len(df) <= budget:
+        return df
+    rng = np.random.default_rng(seed)
+
+    outliers = outlier_mask(df, by, columns)
+    if outliers.sum() > budget // 2:
+        picked = rng.choice(np.flatnonzero(outliers.to_numpy()), budget // 2, replace=False)
+        outliers = pd.Series(False, index=df.index)
+        outliers.iloc[picked] = True
+
+    rest = df[~outliers]
+    remaining = budget - int(outliers.sum())
+    groups = rest[by]
+    sizes = groups.map(groups.value_counts()).astype(float)
+    quota = np.maximum(1, np.floor(sizes * remaining / len(rest)))
+    rank = pd.Series(rng.random(len(rest)), index=rest.index).groupby(groups, observed=True).rank(method="first")
+    keep = outliers.copy()
+    keep[rest.index[(rank <= quota).to_numpy()]] = True
+    return df[keep]
+
+
+def binned_density(df, x, y, bins=60, clip=0.99):
+    """Counts of (x, y) pairs on a `bins` x `bins` grid, dropping empty cells."""
+    data = df[[x, y]].dropna().astype(float)
+    if data.empty:
+        return pd.DataFrame({x: [], y: [], "Count": []})
+    xs = data[x].clip(upper=data[x].quantile(clip))
+    ys = data[y].clip(upper=data[y].quantile(clip))
+    counts, x_edges, y_edges = np.histogram2d(xs, ys, bins=bins)
+    xi, yi = np.nonzero(counts)
+    return pd.DataFrame({
+        x: (x_edges[xi] + x_edges[xi + 1]) / 2,
+        y: (y_edges[yi] + y_edges[yi + 1]) / 2,
+        "Count": counts[xi, yi].astype(np.int64),
+    })
+
+
+def render_mode(n_points):
+    return "webgl" if n_points > WEBGL_THRESHOLD else "svg"
@@ -0,0 +1,155 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from smartrent.metrics import metrics
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """Thread-safe token bucket: `rate` requests per second with bursts up to `capacity`."""
+
+    def __init__(self, rate, capacity=None):
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(1.0, rate))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+@dataclass
+class FetchStats:
+    pages: int = 0
+    failures: int = 0
+    retries: int = 0
+    bytes: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def pages_per_sec(self):
+        return self.pages / self.elapsed if self.elapsed else 0.0
+
+
+@dataclass
+class _HostLimit:
+    slots: threading.Semaphore
+    bucket: TokenBucket
+
+
+@dataclass
+class PageFetcher:
+    """Fetches many pages concurrently over one pooled session.
+
+    Each host gets at most `max_per_host` requests in flight and `rate` requests
+    per second; timeouts, connection errors and 5xx/429 responses are retried with
+    exponential backoff. `fetch_all` returns bodies in the order the URLs were given.
+    """
+
+    headers: dict = field(default_factory=dict)
+    max_workers: int = 8
+    max_per_host: int = 4
+    rate: float = 4.0
+    burst: int = None
+    retries: int = 3
+    backoff: float = 0.5
+    timeout: float = 30
+    session: requests.Session = None
+
+    def __post_init__(self):
+        if self.session is None:
+            self.session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=self.max_workers)
+            self.session.mount("http://", adapter)
+            self.session.mount("https://", adapter)
+        self.session.headers.update(self.headers)
+        self.stats = FetchStats()
+        self._hosts = {}
+        self._lock = threading.Lock()
+
+    def _limit_for(self, url):
+        host = urlsplit(url).netloc
+        with self._lock:
+            if host not in self._hosts:
+                self._hosts[host] = _HostLimit(
+                    threading.Semaphore(self.max_per_host),
+                    TokenBucket(self.rate, self.burst),
+                )
+            return self._hosts[host]
+
+    def fetch(self, url):
+        limit = self._limit_for(url)
+        timer = metrics.timer("fetch.page")
+        for attempt in range(self.retries + 1):
+            if attempt:
+                with self._lock:
+                    self.stats.retries += 1
+                metrics.count("fetch.retries")
+                time.sleep(self.backoff * 2 ** (attempt - 1))
+            limit.bucket.acquire()
+            try:
+                with limit.slots:
+                    response = self.session.get(url, timeout=self.timeout)
+            except (requests.Timeout, requests.ConnectionError) as e:
+                error = e
+                continue
+            if response.status_code in RETRY_STATUSES:
+                error = f"HTTP {response.status_code}"
+                continue
+            if not response.ok:
+                error = f"HTTP {response.status_code}"
+                break
+            with self._lock:
+                self.stats.pages += 1
+                self.stats.bytes += len(response.content)
+            timer.stop()
+            metrics.count("fetch.pages")
+            metrics.count("fetch.bytes", len(response.content))
+            return response.content
+
+        print(f"❌ Error fetching {url}: {error}")
+        with self._lock:
+            self.stats.failures += 1
+        metrics.count("fetch.failures")
+        return None
+
+    def fetch_all(self, urls, on_page=None, keep=True):
+        """Bodies of `urls` in order (None where a fetch failed).
+
+        `on_page(i, body)` is called from the worker as soon as the i-th URL has
+        been fetched successfully, e.g. to checkpoint it before the rest arrive.
+        With `keep=False` bodies are dropped once `on_page` has seen them and the
+        list holds True for each successful fetch instead.
+        """
+        def fetch(item):
+            i, url = item
+            body = self.fetch(url)
+            if body is not None and on_page is not None:
+                on_page(i, body)
+            return body if keep or body is None else True
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            pages = list(pool.map(fetch, enumerate(urls)))
+        self.stats.elapsed += time.perf_counter() - started
+        return pages
+
+    def close(self):
+        self.session.close()
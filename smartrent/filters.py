@@ -0,0 +1,126 @@
+import numpy as np
+
+from smartrent.cards import SORT_OPTIONS
+from smartrent.cleaning import listing_ids
+
+_EMPTY = np.empty(0, dtype=np.int64)
+
+
+class FilterIndex:
+    """Prebuilt lookup structures for the explorer's City/Location/BHK/price/area filters.
+
+    City, Location and BHK map to sorted row-position lists; Price and Area keep a
+    sorted copy plus the permutation into row order, so a range becomes two
+    binary searches. `query` starts from the most selective of these and checks
+    the remaining conditions on just those rows, returning row positions in
+    stored order; nothing copies the listing frame.
+    """
+
+    def __init__(self, df):
+        self.size = len(df)
+        self.ids = listing_ids(df["Link"]).fillna(-1).to_numpy(dtype=np.int64)
+        self._id_order = np.argsort(self.ids, kind="stable")
+        self._ids_sorted = self.ids[self._id_order]
+        self.city = df["City"].astype(str).to_numpy() if "City" in df else np.full(self.size, "")
+        self.location = df["Location"].astype(str).to_numpy()
+        self.bhk = df["BHK"].to_numpy(dtype=np.float64, na_value=np.nan)
+        self.price = df["Price"].to_numpy(dtype=np.float64)
+        self.area = df["Area"].to_numpy(dtype=np.float64, na_value=np.nan)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            self.price_per_sqft = np.where(self.area > 0, self.price / self.area, np.nan)
+
+        self._by_city = {k: np.sort(v) for k, v in df.groupby(self.city).indices.items()}
+        self._by_location = {k: np.sort(v) for k, v in df.groupby(self.location).indices.items()}
+        bhk_groups = df.groupby(self.bhk).indices
+        self._by_bhk = {int(k): np.sort(v) for k, v in bhk_groups.items() if not np.isnan(k)}
+        self.cities = sorted(self._by_city)
+        self.locations = sorted(self._by_location)
+        self.bhk_options = sorted(self._by_bhk)
+
+        self._price_order = np.argsort(self.price, kind="stable")
+        self._price_sorted = self.price[self._price_order]
+        self._area_order = np.argsort(self.area, kind="stable")  # NaN sorts last
+        self._area_sorted = self.area[self._area_order]
+
+    def bounds(self, column):
+        values = self._price_sorted if column == "Price" else self._area_sorted
+        values = values[~np.isnan(values)]
+        if not len(values):
+            return 0, 0
+        return int(values[0]), int(np.ceil(values[-1]))
+
+    def _range(self, order, sorted_values, low, high):
+        lo = np.searchsorted(sorted_values, low, side="left")
+        hi = np.searchsorted(sorted_values, high, side="right")
+        return np.sort(order[lo:hi])
+
+    def locations_in(self, city):
+        """Locations with listings in `city`."""
+        return sorted(set(self.location[self._by_city.get(city, _EMPTY)]))
+
+    def location_label(self, location):
+        """`location` followed by the cities it has listings in, unless its name already ends with them."""
+        cities = sorted(set(self.city[self._by_location.get(location, _EMPTY)]) - {""})
+        if not cities or (len(cities) == 1 and location.endswith(cities[0])):
+            return location
+        return f"{location} ({', '.join(cities)})"
+
+    def query(self, location=None, bhk=None, price=None, area=None, city=None):
+        """Row positions matching every given condition; ranges are inclusive (low, high)."""
+        candidates = []
+        if city is not None:
+            candidates.append((len(self._by_city.get(city, _EMPTY)), lambda: self._by_city.get(city, _EMPTY)))
+        if location is not None:
+            candidates.append((len(self._by_location.get(location, _EMPTY)),
+                               lambda: self._by_location.get(location, _EMPTY)))
+        if bhk is not None:
+            candidates.append((len(self._by_bhk.get(int(bhk), _EMPTY)),
+                               lambda: self._by_bhk.get(int(bhk), _EMPTY)))
+        if price is not None:
+            size = np.diff(np.searchsorted(self._price_sorted, [price[0], price[1]], side="left"))[0]
+            candidates.append((size, lambda: self._range(self._price_order, self._price_sorted, *price)))
+        if area is not None:
+            size = np.diff(np.searchsorted(self._area_sorted, [area[0], area[1]], side="left"))[0]
+            candidates.append((size, lambda: self._range(self._area_order, self._area_sorted, *area)))
+        if not candidates:
+            return np.arange(self.size)
+
+        rows = min(candidates, key=lambda c: c[0])[1]()
+        if city is not None:
+            rows = rows[self.city[rows] == city]
+        if location is not None:
+            rows = rows[self.location[rows] == location]
+        if bhk is not None:
+            rows = rows[self.bhk[rows] == bhk]
+        if price is not None:
+            rows = rows[(self.price[rows] >= price[0]) & (self.price[rows] <= price[1])]
+        if area is not None:
+            rows = rows[(self.area[rows] >= area[0]) & (self.area[rows] <= area[1])]
+        return rows
+
+    def row_of(self, ids):
+        """Row position of each listing id, or -1 where it is not in this index; keeps the shape of `ids`."""
+        ids = np.asarray(ids, dtype=np.int64)
+        if not len(self._ids_sorted):
+            return np.full(ids.shape, -1, dtype=np.int64)
+        at = np.minimum(np.searchsorted(self._ids_sorted, ids), len(self._ids_sorted) - 1)
+        return np.where((self._ids_sorted[at] == ids) & (ids >= 0), self._id_order[at], -1)
+
+    def rows_for_ids(self, ids):
+        """Row positions of the given listing ids, in the order given; unknown ids are skipped."""
+        ids = np.asarray(ids, dtype=np.int64)
+        at = np.searchsorted(self._ids_sorted, ids)
+        at = np.minimum(at, max(len(self._ids_sorted) - 1, 0))
+        found = self._ids_sorted[at] == ids if len(self._ids_sorted) else np.zeros(len(ids), bool)
+        return self._id_order[at[found]]
+
+    def order(self, rows, sort):
+        """`rows` reordered by one of cards.SORT_OPTIONS."""
+        key = SORT_OPTIONS.get(sort)
+        if key is None:
+            return rows
+        column, ascending = key
+        values = {"Price": self.price, "Area": self.area, "PricePerSqft": self.price_per_sqft}[column][rows]
+        if not ascending:
+            values = -values
+        return rows[np.argsort(values, kind="stable")]  # NaN stays last either way
@@ -0,0 +1,177 @@
+"""Offline locality geocoding and radius search over listings.
+
+data/localities.csv is a bundled gazetteer of locality centroids (Locality,
+Lat, Lon), good to about a kilometre. Scraped Locality values are matched to
+it exactly, then fuzzily, then through their parent locality ("Rohini Sector
+29" -> "Rohini"); each match is remembered in data/geocode_cache.json so a name
+is only matched once per gazetteer version.
+"""
+import difflib
+import hashlib
+import json
+import os
+import re
+import threading
+
+import numpy as np
+import pandas as pd
+
+GAZETTEER_PATH = "data/localities.csv"
+GEOCODE_CACHE_PATH = "data/geocode_cache.json"
+MATCH_CUTOFF = 0.9
+CELL_KM = 1.0
+KM_PER_DEGREE_LAT = 110.57
+KM_PER_DEGREE_LON = 111.32  # at the equator; scaled by cos(latitude)
+
+_NOISE = re.compile(r"\b(?:village|main|extn|extension)\b")
+_SUBDIVISION = re.compile(r"\s+(?:(?:sector|sec|phase|block|pocket|part)\s*)?(?:\d+[a-z]?|[ivx]+)$")
+_DIGITS = re.compile(r"\d+")
+_EMPTY = np.empty(0, dtype=np.int64)
+
+
+def normalize_place(name):
+    name = re.sub(r"[^a-z0-9 ]", " ", str(name).lower())
+    return " ".join(_NOISE.sub(" ", name).split())
+
+
+class Geocoder:
+    """Locality names -> gazetteer coordinates, with every match cached on disk."""
+
+    def __init__(self, gazetteer_path=GAZETTEER_PATH, cache_path=GEOCODE_CACHE_PATH):
+        with open(gazetteer_path, "rb") as f:
+            raw = f.read()
+        self.digest = hashlib.sha256(raw).hexdigest()[:16]
+        table = pd.read_csv(gazetteer_path)
+        self.places = {normalize_place(row.Locality): (row.Locality, float(row.Lat), float(row.Lon))
+                       for row in table.itertuples()}
+        self._keys = list(self.places)
+        self.cache_path = cache_path
+        self.matches = self._load_cache()
+
+    def _load_cache(self):
+        try:
+            with open(self.cache_path) as f:
+                cache = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+        return cache["matches"] if cache.get("gazetteer") == self.digest else {}
+
+    def _save_cache(self):
+        # Shard workers and app sessions geocode at the same time, so each writer gets its own temp file.
+        tmp = f"{self.cache_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump({"gazetteer": self.digest, "matches": self.matches}, f, indent=1, sort_keys=True)
+        os.replace(tmp, self.cache_path)
+
+    def match(self, locality):
+        """(gazetteer name, "exact" | "fuzzy" | "parent"), or None when nothing fits."""
+        key = normalize_place(locality)
+        parent = False
+        while key:
+            if key in self.places:
+                return self.places[key][0], "parent" if parent else "exact"
+            # Fuzzy matches must agree on every number: "Sector 24" is not "Sector 25".
+            digits = _DIGITS.findall(key)
+            for close in difflib.get_close_matches(key, self._keys, n=3, cutoff=MATCH_CUTOFF):
+                if _DIGITS.findall(close) == digits:
+                    return self.places[close][0], "parent" if parent else "fuzzy"
+            shorter = _SUBDIVISION.sub("", key)
+            if shorter == key:
+                break
+            key, parent = shorter, True
+        return None
+
+    def geocode(self, localities):
+        """Locality, Match, Method, Lat and Lon for each distinct name; unmatched ones have NaN coordinates."""
+        names = sorted(pd.Series(localities).dropna().astype(str).unique())
+        missing = [name for name in names if name not in self.matches]
+        for name in missing:
+            self.matches[name] = self.match(name)
+        if missing and self.cache_path:
+            self._save_cache()
+
+        rows = []
+        for name in names:
+            found = self.matches[name]
+            if found is None:
+                rows.append((name, None, None, np.nan, np.nan))
+            else:
+                _, lat, lon = self.places[normalize_place(found[0])]
+                rows.append((name, found[0], found[1], lat, lon))
+        return pd.DataFrame(rows, columns=["Locality", "Match", "Method", "Lat", "Lon"])
+
+
+class GeoIndex:
+    """Grid over listing coordinates for "within X km of a place" queries.
+
+    Points are projected to kilometres around their mean (equirectangular;
+    well under 1% off across Delhi), bucketed into CELL_KM square cells and
+    sorted by cell. A query scans the cells its bounding box covers, one
+    contiguous key range per grid column found by binary search, and keeps the
+    rows inside the exact radius. Rows without coordinates never match.
+    """
+
+    def __init__(self, lat, lon, places=None, cell_km=CELL_KM):
+        lat = np.asarray(lat, dtype=np.float64)
+        lon = np.asarray(lon, dtype=np.float64)
+        self.size = len(lat)
+        self.cell_km = cell_km
+        self.places = places or {}
+        located = np.flatnonzero(~np.isnan(lat) & ~np.isnan(lon))
+        self.located = len(located)
+        self.origin = (float(lat[located].mean()), float(lon[located].mean())) if len(located) else (0.0, 0.0)
+        self.x, self.y = self.project(lat, lon)
+
+        cx = np.floor(self.x[located] / cell_km).astype(np.int64)
+        cy = np.floor(self.y[located] / cell_km).astype(np.int64)
+        self._cx_min = int(cx.min()) if len(cx) else 0
+        self._cx_max = int(cx.max()) if len(cx) else -1
+        self._cy_min = int(cy.min()) if len(cy) else 0
+        self._cy_max = int(cy.max()) if len(cy) else -1
+        self._height = self._cy_max - self._cy_min + 1
+        keys = (cx - self._cx_min) * self._height + (cy - self._cy_min)
+        order = np.argsort(keys, kind="stable")
+        self._keys = keys[order]
+        self._rows = located[order]
+
+    @classmethod
+    def from_localities(cls, localities, coords, cell_km=CELL_KM):
+        """Index rows by their Locality, placed at that locality's coordinates from `Geocoder.geocode`."""
+        coords = coords.dropna(subset=["Lat", "Lon"]).set_index("Locality")
+        localities = pd.Series(localities).astype(str)
+        places = {name: (row.Lat, row.Lon) for name, row in coords.iterrows()}
+        return cls(localities.map(coords["Lat"]).to_numpy(dtype=np.float64, na_value=np.nan),
+                   localities.map(coords["Lon"]).to_numpy(dtype=np.float64, na_value=np.nan),
+                   places, cell_km)
+
+    def project(self, lat, lon):
+        lat0, lon0 = self.origin
+        x = (np.asarray(lon, dtype=np.float64) - lon0) * KM_PER_DEGREE_LON * np.cos(np.radians(lat0))
+        y = (np.asarray(lat, dtype=np.float64) - lat0) * KM_PER_DEGREE_LAT
+        return x, y
+
+    def within(self, lat, lon, km):
+        """Row positions within `km` of (lat, lon), in stored order."""
+        x, y = self.project(lat, lon)
+        cx0 = max(int(np.floor((x - km) / self.cell_km)), self._cx_min)
+        cx1 = min(int(np.floor((x + km) / self.cell_km)), self._cx_max)
+        cy0 = max(int(np.floor((y - km) / self.cell_km)), self._cy_min)
+        cy1 = min(int(np.floor((y + km) / self.cell_km)), self._cy_max)
+        if cx0 > cx1 or cy0 > cy1:
+            return _EMPTY
+        columns = (np.arange(cx0, cx1 + 1) - self._cx_min) * self._height
+        lo = np.searchsorted(self._keys, columns + (cy0 - self._cy_min), side="left")
+        hi = np.searchsorted(self._keys, columns + (cy1 - self._cy_min), side="right")
+        rows = np.concatenate([self._rows[a:b] for a, b in zip(lo, hi)])
+        near = (self.x[rows] - x) ** 2 + (self.y[rows] - y) ** 2 <= km * km
+        return np.sort(rows[near])
+
+    def near(self, place, km):
+        """Row positions within `km` of a geocoded locality; empty for an unknown one."""
+        if place not in self.places:
+            return _EMPTY
+        return self.within(*self.places[place], km)
+
+    def distance_km(self, rows, lat, lon):
+        x, y = self.project(lat, lon)
+        return np.hypot(self.x[rows] - x, self.y[rows] - y)
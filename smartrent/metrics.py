@@ -0,0 +1,290 @@
+"""Timers, counters and profiling for pipeline runs and dashboard reruns.
+
+`metrics` is the process-wide registry. Hot paths record into it with
+`metrics.timer(...)` / `@metrics.timed(...)` and `metrics.count(...)`; it keeps
+the latest WINDOW timings per series for percentiles plus running totals.
+Once `open_log` is called every observation is also appended to a JSON-lines
+event log, and `write` exports a JSON snapshot and/or a Prometheus text file
+(for node_exporter's textfile collector or any scraper that reads one).
+"""
+import cProfile
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+from datetime import datetime
+
+import numpy as np
+
+METRICS_DIR = "data/metrics"
+EVENTS_LOG = os.path.join(METRICS_DIR, "events.jsonl")
+LAST_RUN_PATH = os.path.join(METRICS_DIR, "last_run.json")
+PIPELINE_PROM = os.path.join(METRICS_DIR, "pipeline.prom")
+APP_PROM = os.path.join(METRICS_DIR, "app.prom")
+PROFILE_DIR = os.path.join(METRICS_DIR, "profiles")
+PROFILE_ENV = "SMARTRENT_PROFILE"
+PREFIX = "smartrent"
+WINDOW = 1000
+QUANTILES = (0.5, 0.9, 0.99)
+MAX_LOG_BYTES = 20_000_000  # past this the event log is moved to events.jsonl.1 when next opened
+
+
+def _key(name, labels):
+    return name, tuple(sorted(labels.items()))
+
+
+def _prom_name(name, suffix):
+    return f"{PREFIX}_{name.replace('.', '_')}_{suffix}"
+
+
+def _prom_labels(labels, **extra):
+    pairs = list(labels) + list(extra.items())
+    if not pairs:
+        return ""
+    escaped = (str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, v in pairs)
+    return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(pairs, escaped)) + "}"
+
+
+class Timer:
+    """Measures from creation until `stop()` (or the end of a with block) and records it once."""
+
+    def __init__(self, registry, name, labels):
+        self.registry = registry
+        self.name = name
+        self.labels = labels
+        self.seconds = None
+        self.started = time.perf_counter()
+
+    def stop(self):
+        if self.seconds is None:
+            self.seconds = time.perf_counter() - self.started
+            self.registry.observe(self.name, self.seconds, **self.labels)
+        return self.seconds
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+class Metrics:
+    def __init__(self, window=WINDOW):
+        self.window = window
+        self._lock = threading.Lock()
+        self._timings = {}  # (name, labels) -> deque of the latest durations
+        self._totals = {}  # (name, labels) -> [count, sum] since start
+        self._counters = {}
+        # The event log has its own lock, so recording never waits on a disk write.
+        self._log_lock = threading.Lock()
+        self._log = None
+        self._source = None
+
+    def open_log(self, path=EVENTS_LOG, source="app"):
+        """Append every observation from now on to `path` as one JSON object per line."""
+        with self._log_lock:
+            if self._log is not None:
+                return
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            if os.path.exists(path) and os.path.getsize(path) > MAX_LOG_BYTES:
+                os.replace(path, path + ".1")
+            self._log = open(path, "a", encoding="utf-8", buffering=1)
+            self._source = source
+
+    def close_log(self):
+        with self._log_lock:
+            if self._log is not None:
+                self._log.close()
+                self._log = None
+
+    def _emit(self, kind, name, labels, value):
+        # Called without the registry lock: the line is built first, then written under the log's lock.
+        if self._log is None:
+            return
+        line = json.dumps({"ts": datetime.now().isoformat(timespec="milliseconds"), "source": self._source,
+                           "kind": kind, "name": name, "labels": labels, "value": value}) + "\n"
+        with self._log_lock:
+            if self._log is not None:
+                self._log.write(line)
+
+    def observe(self, name, seconds, **labels):
+        key = _key(name, labels)
+        with self._lock:
+            if key not in self._timings:
+                self._timings[key] = deque(maxlen=self.window)
+                self._totals[key] = [0, 0.0]
+            self._timings[key].append(seconds)
+            totals = self._totals[key]
+            totals[0] += 1
+            totals[1] += seconds
+        self._emit("timer", name, labels, round(seconds, 6))
+
+    def count(self, name, n=1, **labels):
+        if not n:
+            return
+        key = _key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + n
+        self._emit("counter", name, labels, n)
+
+    def timer(self, name, **labels):
+        """`with metrics.timer("parse.page"): ...`, or keep it and call `.stop()`."""
+        return Timer(self, name, labels)
+
+    def timed(self, name, **labels):
+        """Decorator form of `timer`."""
+        def decorate(fn):
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                with self.timer(name, **labels):
+                    return fn(*args, **kwargs)
+            return wrapper
+        return decorate
+
+    def timers(self):
+        """One dict per timer series: name, labels, count and sum since start, and QUANTILES of the latest WINDOW."""
+        with self._lock:
+            series = [(key, np.array(values), list(self._totals[key])) for key, values in self._timings.items()]
+        rows = []
+        for (name, labels), values, (count, total) in sorted(series, key=lambda s: s[0]):
+            row = {"name": name, "labels": dict(labels), "count": count, "sum": total}
+            for q, value in zip(QUANTILES, np.quantile(values, QUANTILES)):
+                row[f"p{q * 100:g}"] = float(value)
+            rows.append(row)
+        return rows
+
+    def counters(self):
+        with self._lock:
+            items = sorted(self._counters.items())
+        return [{"name": name, "labels": dict(labels), "value": value} for (name, labels), value in items]
+
+    def snapshot(self):
+        return {"written": datetime.now().isoformat(timespec="seconds"), "timers": self.timers(),
+                "counters": self.counters()}
+
+    def prometheus(self):
+        """The registry in the Prometheus text exposition format: timers as summaries, counters as counters."""
+        lines, typed = [], set()
+        for row in self.timers():
+            metric = _prom_name(row["name"], "seconds")
+            if metric not in typed:
+                typed.add(metric)
+                lines.append(f"# TYPE {metric} summary")
+            labels = sorted(row["labels"].items())
+            for q in QUANTILES:
+                lines.append(f"{metric}{_prom_labels(labels, quantile=f'{q:g}')} {row[f'p{q * 100:g}']:.6g}")
+            lines.append(f"{metric}_sum{_prom_labels(labels)} {row['sum']:.6g}")
+            lines.append(f"{metric}_count{_prom_labels(labels)} {row['count']}")
+        for row in self.counters():
+            metric = _prom_name(row["name"], "total")
+            if metric not in typed:
+                typed.add(metric)
+                lines.append(f"# TYPE {metric} counter")
+            lines.append(f"{metric}{_prom_labels(sorted(row['labels'].items()))} {row['value']}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, json_path=None, prom_path=None, **extra):
+        """Save a JSON snapshot (with `extra` fields) and/or the Prometheus text, each replaced atomically."""
+        outputs = []
+        if json_path:
+            outputs.append((json_path, json.dumps(dict(self.snapshot(), **extra), indent=1, default=str)))
+        if prom_path:
+            outputs.append((prom_path, self.prometheus()))
+        for path, text in outputs:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            # Sessions export from their own threads, so each writer gets its own temp file.
+            tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                f.write(text)
+            os.replace(tmp, path)
+
+    def state(self):
+        """Everything recorded so far as plain data, for `absorb` in another process."""
+        with self._lock:
+            return {"timings": {key: list(values) for key, values in self._timings.items()},
+                    "totals": {key: list(totals) for key, totals in self._totals.items()},
+                    "counters": dict(self._counters)}
+
+    def absorb(self, state):
+        """Fold in another registry's `state()`, e.g. from a pipeline worker process."""
+        with self._lock:
+            for key, values in state["timings"].items():
+                self._timings.setdefault(key, deque(maxlen=self.window)).extend(values)
+                totals = self._totals.setdefault(key, [0, 0.0])
+                totals[0] += state["totals"][key][0]
+                totals[1] += state["totals"][key][1]
+            for key, n in state["counters"].items():
+                self._counters[key] = self._counters.get(key, 0) + n
+
+    def reset(self):
+        with self._lock:
+            self._timings.clear()
+            self._totals.clear()
+            self._counters.clear()
+
+
+metrics = Metrics()
+
+
+@functools.lru_cache(maxsize=1)
+def _sampling_profiler():
+    try:
+        from pyinstrument import Profiler
+    except ImportError:
+        print(f"⚠️ {PROFILE_ENV}=sample needs pyinstrument (pip install pyinstrument); not profiling.")
+        return None
+    return Profiler
+
+
+class Profile:
+    """Profile of one pipeline run or page rerun, when the SMARTRENT_PROFILE env var asks for one.
+
+    `cprofile` saves deterministic cProfile stats to PROFILE_DIR/<name>-<time>.prof
+    (read them with pstats or snakeviz); `sample` saves a pyinstrument
+    sampling profile as HTML. Unset, it does nothing.
+    """
+
+    def __init__(self, name, mode=None, directory=PROFILE_DIR):
+        self.name = name
+        self.mode = (mode if mode is not None else os.getenv(PROFILE_ENV, "")).lower()
+        self.directory = directory
+        self.path = None
+        self._profiler = None
+        if self.mode == "cprofile":
+            profiler = cProfile.Profile()
+            try:
+                profiler.enable()
+            except ValueError:  # another thread's rerun holds the profiler; skip this one
+                return
+            self._profiler = profiler
+        elif self.mode == "sample":
+            sampler = _sampling_profiler()
+            if sampler is not None:
+                self._profiler = sampler()
+                self._profiler.start()
+
+    def stop(self):
+        """Stop profiling and save the profile; returns its path, or None when nothing was profiled."""
+        profiler, self._profiler = self._profiler, None
+        if profiler is None:
+            return None
+        os.makedirs(self.directory, exist_ok=True)
+        stem = os.path.join(self.directory, f"{self.name}-{datetime.now():%Y%m%dT%H%M%S%f}")
+        if self.mode == "cprofile":
+            profiler.disable()
+            self.path = stem + ".prof"
+            profiler.dump_stats(self.path)
+        else:
+            profiler.stop()
+            self.path = stem + ".html"
+            with open(self.path, "w", encoding="utf-8") as f:
+                f.write(profiler.output_html())
+        return self.path
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
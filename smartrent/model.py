@@ -0,0 +1,158 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+MODEL_DIR = "data/models"
+MODEL_PATH = os.path.join(MODEL_DIR, "rent_model.json")
+ENCODING_PATH = os.path.join(MODEL_DIR, "rent_model_localities.json")
+ESTIMATES_PATH = "data/price_estimates.parquet"
+
+# Locality means are shrunk towards the city-wide mean by this many pseudo-listings.
+SMOOTHING = 10
+FOLDS = 5
+# Listings priced this far below/above their estimate get flagged.
+UNDER_PRICED = 0.8
+OVER_PRICED = 1.25
+
+PARAMS = {
+    "n_estimators": 300,
+    "max_depth": 6,
+    "learning_rate": 0.05,
+    "subsample": 0.8,
+    "colsample_bytree": 0.9,
+    "tree_method": "hist",
+    "n_jobs": 0,
+}
+
+
+def _xgboost():
+    # Imported on first use: it takes over a second and most page runs never touch the model.
+    try:
+        import xgboost
+    except ImportError:  # only training and loading a model need it; pages still run without estimates
+        return None
+    return xgboost
+
+
+def training_rows(df):
+    """Listings usable for training: plausible rents and areas with known BHK and locality."""
+    df = df.dropna(subset=["Price", "BHK", "Area", "Locality"])
+    price = df["Price"].astype("float64")
+    area = df["Area"].astype("float64")
+    low, high = price.quantile([0.01, 0.99])
+    keep = price.between(low, high) & area.between(100, 10000)
+    return df[keep].reset_index(drop=True)
+
+
+def _encode(localities, table, prior):
+    mean = localities.map(table["mean"]).astype("float64").fillna(prior).to_numpy()
+    count = localities.map(table["count"]).astype("float64").fillna(0).to_numpy()
+    return mean, count
+
+
+def _encoding_table(localities, log_price):
+    stats = log_price.groupby(localities, observed=True).agg(["sum", "count"])
+    prior = float(log_price.mean())
+    stats["mean"] = (stats["sum"] + SMOOTHING * prior) / (stats["count"] + SMOOTHING)
+    return stats[["mean", "count"]], prior
+
+
+def feature_matrix(df, table, prior):
+    # Columns: BHK, Bathroom, Area, smoothed locality mean log price, locality listing count.
+    localities = df["Locality"].astype(str)
+    encoded, count = _encode(localities, table, prior)
+    return np.column_stack([
+        df["BHK"].to_numpy(dtype=np.float32, na_value=np.nan),
+        df["Bathroom"].to_numpy(dtype=np.float32, na_value=np.nan),
+        df["Area"].to_numpy(dtype=np.float32, na_value=np.nan),
+        encoded,
+        count,
+    ]).astype(np.float32)
+
+
+def train(df, seed=0):
+    """Fit the rent model on log price with target-encoded Locality.
+
+    Training rows get out-of-fold locality means so a listing's own price
+    never leaks into its feature; the locality counts and the saved table are
+    fit on every row, as they are at prediction time. Raises RuntimeError
+    without xgboost and ValueError when no listing is usable for training.
+    """
+    xgb = _xgboost()
+    if xgb is None:
+        raise RuntimeError("xgboost is not installed; it is needed to train the rent model")
+    df = training_rows(df)
+    if df.empty:
+        raise ValueError("no listings with a price, BHK, area and locality to train the rent model on")
+    log_price = np.log1p(df["Price"].astype("float64"))
+    localities = df["Locality"].astype(str)
+
+    rng = np.random.default_rng(seed)
+    folds = rng.integers(0, FOLDS, len(df))
+    encoded = np.empty(len(df))
+    for fold in range(FOLDS):
+        held_out = folds == fold
+        table, prior = _encoding_table(localities[~held_out], log_price[~held_out])
+        encoded[held_out] = _encode(localities[held_out], table, prior)[0]
+
+    table, prior = _encoding_table(localities, log_price)
+    X = feature_matrix(df, table, prior)
+    X[:, 3] = encoded
+    model = xgb.XGBRegressor(random_state=seed, **PARAMS)
+    model.fit(X, log_price.to_numpy())
+    return RentPredictor(model.get_booster(), table, prior)
+
+
+class RentPredictor:
+    """Trained rent model plus its locality encoding; load once and reuse."""
+
+    def __init__(self, booster, table, prior):
+        self.booster = booster
+        self.table = table
+        self.prior = prior
+        self._lookup = {k: (float(m), float(c)) for k, m, c in zip(table.index.astype(str), table["mean"],
+                                                                   table["count"])}
+
+    def save(self, model_path=MODEL_PATH, encoding_path=ENCODING_PATH):
+        os.makedirs(os.path.dirname(model_path), exist_ok=True)
+        self.booster.save_model(model_path + ".tmp.json")
+        os.replace(model_path + ".tmp.json", model_path)
+        encoding = {"prior": self.prior, "mean": self.table["mean"].to_dict(), "count": self.table["count"].to_dict()}
+        with open(encoding_path + ".tmp", "w") as f:
+            json.dump(encoding, f)
+        os.replace(encoding_path + ".tmp", encoding_path)
+
+    @classmethod
+    def load(cls, model_path=MODEL_PATH, encoding_path=ENCODING_PATH):
+        if not (os.path.exists(model_path) and os.path.exists(encoding_path)):
+            return None
+        xgb = _xgboost()
+        if xgb is None:
+            return None
+        booster = xgb.Booster()
+        booster.load_model(model_path)
+        with open(encoding_path) as f:
+            encoding = json.load(f)
+        table = pd.DataFrame({"mean": encoding["mean"], "count": encoding["count"]})
+        return cls(booster, table, encoding["prior"])
+
+    def predict(self, df):
+        """Estimated monthly rent for every row of `df`, in one batch."""
+        X = feature_matrix(df, self.table, self.prior)
+        return np.expm1(self.booster.inplace_predict(X))
+
+    def predict_one(self, bhk, bathroom, area, locality):
+        mean, count = self._lookup.get(locality, (self.prior, 0.0))
+        X = np.array([[bhk, bathroom, area, mean, count]], dtype=np.float32)
+        return float(np.expm1(self.booster.inplace_predict(X))[0])
+
+    def score(self, df):
+        """Per-listing estimate, actual/estimate ratio and an under/over-priced flag."""
+        estimate = self.predict(df)
+        ratio = df["Price"].to_numpy(dtype=np.float64) / estimate
+        flag = np.where(ratio < UNDER_PRICED, "Under-priced", np.where(ratio > OVER_PRICED, "Over-priced", "Fair"))
+        flag = np.where(df[["BHK", "Area"]].isna().any(axis=1), "", flag)
+        return pd.DataFrame({"Link": df["Link"].to_numpy(), "Estimate": estimate.round(-2), "Ratio": ratio,
+                             "Flag": flag})
@@ -0,0 +1,68 @@
+import json
+import time
+
+import streamlit as st
+
+from smartrent.metrics import APP_PROM, EVENTS_LOG, LAST_RUN_PATH, Profile, metrics
+
+EXPORT_INTERVAL = 15  # seconds between rewrites of the app's Prometheus file
+
+
+@st.cache_resource(show_spinner=False)
+def _exporter():
+    # Once per process: log the app's metrics and remember when they were last exported.
+    metrics.open_log(EVENTS_LOG, source="app")
+    return {"exported": 0.0}
+
+
+class Rerun:
+    """One script run of a page, timed over the `with track_rerun(page):` block wrapping the page body.
+
+    Also profiles the run when SMARTRENT_PROFILE is set (see metrics.Profile).
+    Reruns cut short by st.stop, st.rerun or an error are not timed, but
+    their profile is still stopped and saved.
+    """
+
+    def __init__(self, page):
+        self.exporter = _exporter()
+        self.timer = metrics.timer("page.rerun", page=page)
+        self.profile = Profile(f"page-{page}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.done()
+        else:
+            self.profile.stop()
+        return False
+
+    def done(self):
+        self.timer.stop()
+        self.profile.stop()
+        now = time.monotonic()
+        if now - self.exporter["exported"] >= EXPORT_INTERVAL:
+            self.exporter["exported"] = now
+            metrics.write(prom_path=APP_PROM)
+
+
+def track_rerun(page):
+    return Rerun(page)
+
+
+def last_run():
+    """Metrics snapshot and stage report saved by the latest pipeline run, or None before the first."""
+    try:
+        with open(LAST_RUN_PATH) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def admin_password():
+    """The admin panel password from st.secrets ([admin] password), or None when none is configured."""
+    try:
+        return st.secrets["admin"]["password"]
+    except (KeyError, FileNotFoundError):
+        return None
@@ -0,0 +1,104 @@
+from bs4 import BeautifulSoup
+
+try:
+    import lxml.html
+except ImportError:  # lxml is optional; fall back to BeautifulSoup's html.parser
+    lxml = None
+
+CARD_CLASS = "_1DNjI"
+
+# Card field -> (tag, class) of the first matching descendant, as OLX renders it.
+FIELD_SPANS = {
+    "_2poNJ": "Title",
+    "_2VQu4": "Location",
+    "_2Ks63": "Price",
+    "YBbhy": "Info",
+}
+IMAGE_CLASSES = ("_3vnjf", "_2hBzJ")
+
+
+def _listing(fields, href, images):
+    image = images.get(IMAGE_CLASSES[0]) or images.get(IMAGE_CLASSES[1])
+    return {
+        "Title": fields.get("Title"),
+        "Location": fields.get("Location"),
+        "Price": fields.get("Price"),
+        "Link": "https://www.olx.in" + href if href is not None else None,
+        "Image": image.get("src") if image is not None else None,
+        "Info": fields.get("Info"),
+    }
+
+
+def _strip_join(strings):
+    # Same result as BeautifulSoup's get_text(strip=True).
+    return "".join(s.strip() for s in strings if s.strip())
+
+
+def parse_soup(html):
+    # Reference implementation: full html.parser tree, six find() walks per card.
+    soup = BeautifulSoup(html, "html.parser")
+    ads = soup.find_all("li", class_=CARD_CLASS)
+
+    listings = []
+    for ad in ads:
+        title_tag = ad.find("span", class_="_2poNJ")
+        location_tag = ad.find("span", class_="_2VQu4")
+        price_tag = ad.find("span", class_="_2Ks63")
+        link_tag = ad.find("a", href=True)
+        info_tag = ad.find("span", class_="YBbhy")
+        image_tag = ad.find("img", class_="_3vnjf") or ad.find("img", class_="_2hBzJ")
+
+        listings.append({
+            "Title": title_tag.get_text(strip=True) if title_tag else None,
+            "Location": location_tag.get_text(strip=True) if location_tag else None,
+            "Price": price_tag.get_text(strip=True) if price_tag else None,
+            "Link": "https://www.olx.in" + link_tag["href"] if link_tag else None,
+            "Image": image_tag["src"] if image_tag and image_tag.has_attr("src") else None,
+            "Info": info_tag.get_text(strip=True) if info_tag else None
+        })
+    return listings
+
+
+def parse_lxml(html):
+    # OLX serves UTF-8; without a declared encoding lxml would assume latin-1 for bytes.
+    parser = _UTF8_PARSER if isinstance(html, bytes) else None
+    root = lxml.html.fromstring(html, parser=parser)
+    cards = root.xpath(f"//li[contains(concat(' ', normalize-space(@class), ' '), ' {CARD_CLASS} ')]")
+
+    listings = []
+    for ad in cards:
+        fields, images, href = {}, {}, None
+        for el in ad.iterdescendants():
+            tag = el.tag
+            if tag == "span":
+                for cls in (el.get("class") or "").split():
+                    field = FIELD_SPANS.get(cls)
+                    if field and field not in fields:
+                        fields[field] = _strip_join(el.itertext())
+            elif tag == "a":
+                if href is None and el.get("href") is not None:
+                    href = el.get("href")
+            elif tag == "img":
+                classes = (el.get("class") or "").split()
+                for cls in IMAGE_CLASSES:
+                    if cls in classes and cls not in images:
+                        images[cls] = el.attrib
+        listings.append(_listing(fields, href, images))
+    return listings
+
+
+BACKENDS = {
+    "soup": parse_soup,
+}
+if lxml is not None:
+    _UTF8_PARSER = lxml.html.HTMLParser(encoding="utf-8")
+    BACKENDS["lxml"] = parse_lxml
+
+DEFAULT_BACKEND = "lxml" if lxml is not None else "soup"
+
+
+def get_parser(backend=None):
+    backend = backend or DEFAULT_BACKEND
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown parser backend {backend!r}; choose from {sorted(BACKENDS)}")
+    return BACKENDS[backend]
@@ -0,0 +1,41 @@
+import os
+
+import streamlit as st
+
+LLM_MODEL = "meta-llama/llama-4-scout-17b-16e-instruct"
+
+
+# Clients are built once per process and shared by every session and rerun;
+# their libraries are imported on first use, so pages that never need them
+# do not pay for the import.
+
+@st.cache_resource(show_spinner=False)
+def llm_client():
+    """ChatGroq for the assistant, or the offline StubLLM when no GROQ_API_KEY is configured."""
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    api_key = os.getenv("GROQ_API_KEY")
+    if not api_key:
+        from smartrent.assistant import StubLLM
+        return StubLLM()
+    from langchain_groq import ChatGroq
+    return ChatGroq(api_key=api_key, model=LLM_MODEL, temperature=0.7)
+
+
+@st.cache_resource(show_spinner=False)
+def supabase_client():
+    from supabase import create_client
+    return create_client(st.secrets["supabase"]["url"], st.secrets["supabase"]["key"])
+
+
+@st.cache_resource(show_spinner=False)
+def review_repository():
+    """Review feed on Supabase when credentials are configured, else on the local data/reviews.csv."""
+    from smartrent.reviews import CsvReviews, ReviewRepository, SupabaseReviews
+
+    try:
+        st.secrets["supabase"]["url"]
+    except (KeyError, FileNotFoundError):  # no secrets file, or no supabase section in it
+        return ReviewRepository(CsvReviews())
+    return ReviewRepository(SupabaseReviews(supabase_client()))
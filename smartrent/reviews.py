@@ -0,0 +1,153 @@
+import csv
+import json
+import os
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime
+
+from smartrent.metrics import metrics
+
+REVIEWS_TABLE = "SmartRent Reviews"
+REVIEWS_CSV = "data/reviews.csv"
+FIELDS = ["Name", "Review", "Timestamp"]
+
+PAGE_SIZE = 10
+# Reviews are re-read from the backend at most this often; posts show up at once regardless.
+REVIEWS_TTL = 5 * 60
+
+
+@dataclass
+class TransferStats:
+    round_trips: int = 0
+    bytes: int = 0
+
+    def record(self, rows):
+        self.round_trips += 1
+        self.bytes += len(json.dumps(rows, default=str).encode("utf-8"))
+
+
+def _sort_key(row):
+    # Supabase stores ISO timestamps, the CSV export has "YYYY-MM-DD HH:MM:SS"; compare as datetimes.
+    return datetime.fromisoformat(row["Timestamp"])
+
+
+def _row_key(row):
+    return row["Name"], row["Review"], _sort_key(row)
+
+
+class SupabaseReviews:
+    """Review table in Supabase, read newest first one keyset page at a time."""
+
+    def __init__(self, client, table=REVIEWS_TABLE):
+        self.client = client
+        self.table = table
+        self.stats = TransferStats()
+
+    def page(self, before=None, limit=PAGE_SIZE):
+        """Up to `limit` reviews posted at or before the `before` timestamp, newest first."""
+        query = self.client.table(self.table).select(",".join(FIELDS)).order("Timestamp", desc=True)
+        if before is not None:
+            query = query.lte("Timestamp", before)
+        rows = query.limit(limit).execute().data
+        self.stats.record(rows)
+        return rows
+
+    def insert(self, row):
+        self.client.table(self.table).insert(row).execute()
+        self.stats.record([row])
+        return row
+
+
+class CsvReviews:
+    """Local review backend on a CSV file, for running without Supabase."""
+
+    def __init__(self, path=REVIEWS_CSV):
+        self.path = path
+        self.stats = TransferStats()
+
+    def _read(self):
+        try:
+            with open(self.path, newline="", encoding="utf-8") as f:
+                return sorted(csv.DictReader(f), key=_sort_key, reverse=True)
+        except FileNotFoundError:
+            return []
+
+    def page(self, before=None, limit=PAGE_SIZE):
+        rows = self._read()
+        if before is not None:
+            cutoff = datetime.fromisoformat(before)
+            rows = [row for row in rows if _sort_key(row) <= cutoff]
+        rows = rows[:limit]
+        self.stats.record(rows)
+        return rows
+
+    def insert(self, row):
+        header = not os.path.exists(self.path)
+        with open(self.path, "a", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=FIELDS)
+            if header:
+                writer.writeheader()
+            writer.writerow(row)
+        self.stats.record([row])
+        return row
+
+
+class ReviewRepository:
+    """Newest-first review feed shared by every session of the process.
+
+    Reviews fetched so far are kept for `ttl` seconds and extended one keyset
+    page at a time (Timestamp <= the oldest review held) when a view asks for
+    more. Timestamps are not unique, so each page asks again for the reviews
+    tied with the oldest one and drops those already held. Posted reviews are
+    written to the backend and prepended to the held feed, so they show up
+    without refetching it.
+    """
+
+    def __init__(self, backend, ttl=REVIEWS_TTL, page_size=PAGE_SIZE):
+        self.backend = backend
+        self.ttl = ttl
+        self.page_size = page_size
+        self._lock = threading.Lock()
+        self._rows = []
+        self._complete = False
+        self._fetched_at = None
+
+    @property
+    def stats(self):
+        return self.backend.stats
+
+    def _fetch_page(self):
+        before = self._rows[-1]["Timestamp"] if self._rows else None
+        oldest = _sort_key(self._rows[-1]) if self._rows else None
+        held = Counter(_row_key(row) for row in self._rows if _sort_key(row) == oldest)
+        limit = self.page_size + sum(held.values())
+        rows = self.backend.page(before, limit)
+        for row in rows:
+            key = _row_key(row)
+            if held[key]:
+                held[key] -= 1
+            else:
+                self._rows.append(row)
+        self._complete = len(rows) < limit
+        if self._fetched_at is None:
+            self._fetched_at = time.monotonic()
+
+    def newest(self, count):
+        """The `count` newest reviews, and whether older ones exist."""
+        with self._lock:
+            if self._fetched_at is not None and time.monotonic() - self._fetched_at > self.ttl:
+                self._rows, self._complete, self._fetched_at = [], False, None
+            held = len(self._rows) >= count or self._complete
+            metrics.count("cache.hits" if held else "cache.misses", cache="reviews")
+            while len(self._rows) < count and not self._complete:
+                self._fetch_page()
+            return self._rows[:count], len(self._rows) > count or not self._complete
+
+    def add(self, name, review, timestamp=None):
+        row = {"Name": name, "Review": review, "Timestamp": (timestamp or datetime.now()).isoformat()}
+        with self._lock:
+            self.backend.insert(row)
+            self._rows.insert(0, row)
+        return row
@@ -0,0 +1,438 @@
+import glob
+import gzip
+import hashlib
+import json
+import os
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from datetime import datetime
+
+import pandas as pd
+
+from smartrent.aggregates import AGGREGATES_DIR, build_aggregates, write_aggregates
+from smartrent.cities import CITIES, DEFAULT_CITY, all_cities
+from smartrent.cleaning import clean_listings
+from smartrent.fetch import PageFetcher
+from smartrent.metrics import metrics
+from smartrent.model import ENCODING_PATH, ESTIMATES_PATH, MODEL_PATH, train
+from smartrent.scraper import ScrapeCounts, fetch_pages, fresh_listings, headers, parse_listings, scrape_incremental
+from smartrent.search import SEARCH_INDEX_PATH, SearchIndex
+from smartrent.similar import SIMILAR_INDEX_PATH, SimilarIndex
+from smartrent.store import COMPACT_AFTER, EXPLORER_COLUMNS, export_csv
+from smartrent.thumbnails import ThumbnailCache
+
+RUN_DIR = "data/run"
+STAGES = ("fetch", "parse", "clean", "merge", "publish")
+
+
+def frame_hash(df):
+    digest = hashlib.sha256(",".join(df.columns).encode("utf-8"))
+    digest.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def _write_json(data, path):
+    with open(path + ".tmp", "w") as f:
+        json.dump(data, f, indent=1)
+    os.replace(path + ".tmp", path)
+
+
+class PageCheckpoint:
+    """Gzipped HTML of every results page the current crawl has fetched, saved as each one arrives."""
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    def _path(self, page_num):
+        return os.path.join(self.directory, f"page-{page_num:04d}.html.gz")
+
+    def load(self, page_num):
+        try:
+            with gzip.open(self._path(page_num), "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def save(self, page_num, html):
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(page_num)
+        with gzip.open(path + ".tmp", "wb") as f:
+            f.write(html)
+        os.replace(path + ".tmp", path)
+
+    def pages(self):
+        paths = glob.glob(os.path.join(self.directory, "page-*.html.gz"))
+        return sorted(int(os.path.basename(p)[len("page-"):-len(".html.gz")]) for p in paths)
+
+    def digest(self):
+        digest = hashlib.sha256()
+        for page_num in self.pages():
+            digest.update(f"{page_num}:".encode() + hashlib.sha256(self.load(page_num)).digest())
+        return digest.hexdigest()
+
+    def discard_after(self, page_num):
+        """Remove the pages past `page_num`, e.g. fetched ahead of where a crawl stopped."""
+        for n in self.pages():
+            if n > page_num:
+                os.remove(self._path(n))
+
+    def clear(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+
+@dataclass
+class StageReport:
+    name: str
+    status: str  # "ran", "skipped" (output unchanged since it last ran) or "empty"
+    seconds: float
+    detail: str = ""
+    city: str = ""
+
+
+def _swap_in(staged, final):
+    # Files are renamed over the old ones in one step. A directory cannot be, so the
+    # old one is moved aside first; readers briefly see none and fall back to the listings.
+    if os.path.isdir(staged):
+        old = final + ".old"
+        shutil.rmtree(old, ignore_errors=True)
+        if os.path.exists(final):
+            os.replace(final, old)
+        os.replace(staged, final)
+        shutil.rmtree(old, ignore_errors=True)
+    else:
+        os.makedirs(os.path.dirname(final) or ".", exist_ok=True)
+        os.replace(staged, final)
+
+
+class StagedRun:
+    """Stage bookkeeping behind the pipeline runs: a state file of each stage's last inputs and outputs."""
+
+    def __init__(self, state_path, label):
+        self.state_path = state_path
+        self.label = label
+        self.state = self._load_state()
+        self.reports = []
+
+    def _load_state(self):
+        try:
+            with open(self.state_path) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {"crawl": None, "stages": {}}
+
+    def _save_state(self):
+        os.makedirs(os.path.dirname(self.state_path), exist_ok=True)
+        _write_json(self.state, self.state_path)
+
+    def _stage(self, name, inputs, fn, outputs=()):
+        """Run `fn` unless this stage already ran on the same `inputs` and its `outputs` files still exist.
+
+        `fn` returns (output hash, detail); the hash becomes the next stage's input.
+        """
+        started = time.perf_counter()
+        key = hashlib.sha256(json.dumps(inputs, sort_keys=True, default=str).encode()).hexdigest()
+        last = self.state["stages"].get(name)
+        if last and last["input"] == key and all(os.path.exists(p) for p in outputs):
+            metrics.count("pipeline.stages_skipped", stage=name, city=self.label)
+            self.reports.append(StageReport(name, "skipped", time.perf_counter() - started, last["detail"],
+                                            self.label))
+            return last["output"]
+        output, detail = fn()
+        seconds = time.perf_counter() - started
+        metrics.observe("pipeline.stage", seconds, stage=name, city=self.label)
+        self.state["stages"][name] = {"input": key, "output": output, "detail": detail, "seconds": seconds,
+                                      "finished": datetime.now().isoformat(timespec="seconds")}
+        self._save_state()
+        self.reports.append(StageReport(name, "ran" if output is not None else "empty", seconds, detail,
+                                        self.label))
+        return output
+
+
+class PipelineRunner(StagedRun):
+    """Runs one city's scrape as checkpointed stages: fetch -> parse -> clean -> merge -> publish.
+
+    Under the city's run directory, state.json records each stage's input and
+    output hashes and the crawl in progress; fetched pages, parsed and cleaned
+    rows are kept next to it. A stage whose input hash matches its last run is
+    skipped and its saved output reused. A crawl that did not reach publish
+    resumes on the next run: pages already fetched are read back instead of
+    refetched. Publish rebuilds the dashboards' artifacts over every city's
+    listings in `stores` (see `publish`); with `publish=False` the run stops
+    after merge, which is how `ShardedPipeline` runs each city. `fetch_options`
+    are extra PageFetcher arguments for the city's own fetcher.
+    """
+
+    def __init__(self, store=None, run_dir=None, full=False, stop_after=2, start_page=None, end_page=None,
+                 fetcher=None, base_url=None, backend=None, thumbnails=True, csv=False, compact=False, city=None,
+                 stores=all_cities, publish=True, restart=False, fetch_options=None):
+        self.city = city or CITIES[DEFAULT_CITY]
+        self.store = store or self.city.store()
+        self.stores = stores
+        self.run_dir = run_dir or self.city.run_dir
+        self.full = full
+        self.stop_after = stop_after
+        self.start_page = start_page or self.city.start_page
+        self.end_page = end_page or self.city.end_page
+        self.fetcher = fetcher
+        self.fetch_options = fetch_options or {}
+        self.base_url = base_url or self.city.url
+        self.backend = backend
+        self.thumbnails = thumbnails
+        self.csv = csv
+        self.compact = compact
+        self.publish = publish
+        self.known_path = os.path.join(self.run_dir, "known.json")
+        self.parsed_path = os.path.join(self.run_dir, "parsed.parquet")
+        self.cleaned_path = os.path.join(self.run_dir, "cleaned.parquet")
+        self.raw_csv_path = ("scraped_olx_data.csv" if self.city.name == DEFAULT_CITY
+                             else os.path.join(self.city.root, "scraped_olx_data.csv"))
+        self.pages = PageCheckpoint(os.path.join(self.run_dir, "pages"))
+        super().__init__(os.path.join(self.run_dir, "state.json"), self.city.name)
+        if restart:
+            self.state["crawl"] = None
+
+    def run(self):
+        crawl = self.state.get("crawl")
+        mode = "full" if self.full else "incremental"
+        if crawl is None or crawl["mode"] != mode:
+            # No unfinished crawl to resume: start a new one from an empty page checkpoint.
+            self._clear_crawl()
+            crawl = {"id": datetime.now().strftime("%Y%m%dT%H%M%S"), "mode": mode}
+            self.state["crawl"] = crawl
+            self._save_state()
+        else:
+            print(f"⏯️ Resuming {self.city.label} crawl {crawl['id']} "
+                  f"({len(self.pages.pages())} pages already fetched)")
+        self.scrape_time = datetime.strptime(crawl["id"], "%Y%m%dT%H%M%S")
+
+        fetched = self._stage("fetch", crawl, self._fetch)
+        parsed = self._stage("parse", [fetched, self.backend, self._known_digest()], self._parse,
+                             [self.parsed_path])
+        if parsed is None:
+            for name in STAGES[2:] if self.publish else STAGES[2:-1]:
+                self.reports.append(StageReport(name, "empty", 0.0, "no new or updated listings", self.label))
+            if self.compact:
+                self.store.compact()
+            self._finish()
+            return self.reports
+        cleaned = self._stage("clean", parsed, self._clean, [self.cleaned_path])
+        merged = self._stage("merge", cleaned, self._merge)
+        if self.publish:
+            self._stage("publish", [merged, self.stores.version()],
+                        lambda: publish(self.stores, os.path.join(self.run_dir, "publish"), self.thumbnails))
+        self._finish()
+        return self.reports
+
+    def _finish(self):
+        # The crawl is complete; the next run starts a new one.
+        self.state["crawl"] = None
+        self.state["report"] = [asdict(r) for r in self.reports]
+        self._save_state()
+        self._clear_crawl()
+
+    def _clear_crawl(self):
+        self.pages.clear()
+        if os.path.exists(self.known_path):
+            os.remove(self.known_path)
+
+    def _fetch(self):
+        # Each city's fetcher has its own per-host rate limit (City.rate).
+        fetcher = self.fetcher or PageFetcher(headers=headers, rate=self.city.rate, **self.fetch_options)
+        try:
+            if self.full:
+                page_nums = list(range(self.start_page, self.end_page + 1))
+                print(f"🔎 Fetching {self.city.label} pages {self.start_page} to {self.end_page}...")
+                fetch_pages(page_nums, fetcher, self.base_url, self.pages)
+                known = {}
+            else:
+                # Snapshot what the store knew when this crawl started, so a resumed run
+                # filters the pages the same way even if an earlier attempt already merged.
+                if os.path.exists(self.known_path):
+                    with open(self.known_path) as f:
+                        known = json.load(f)
+                else:
+                    known = self.store.known_prices()
+                    os.makedirs(self.run_dir, exist_ok=True)
+                    _write_json(known, self.known_path)
+                _, counts = scrape_incremental(known, self.start_page, self.end_page, self.stop_after, fetcher,
+                                               self.base_url, self.backend, self.pages)
+                # The last batch runs ahead of the stop point; parse must see only the pages the crawl used.
+                if counts.last_page is not None:
+                    self.pages.discard_after(counts.last_page)
+        finally:
+            if self.fetcher is None:
+                fetcher.close()
+        pages = self.pages.pages()
+        return self.pages.digest(), f"{len(pages)} pages"
+
+    def _known_digest(self):
+        # Parse filters the pages against the known.json snapshot, so a different snapshot re-parses them.
+        if self.full or not os.path.exists(self.known_path):
+            return None
+        with open(self.known_path, "rb") as f:
+            return hashlib.sha256(f.read()).hexdigest()
+
+    def _parse(self):
+        known = {}
+        if not self.full and os.path.exists(self.known_path):
+            with open(self.known_path) as f:
+                known = json.load(f)
+        counts = ScrapeCounts()
+        listings = []
+        for page_num in self.pages.pages():
+            counts.pages += 1
+            listings.extend(fresh_listings(parse_listings(self.pages.load(page_num), self.backend), known, counts))
+        df = pd.DataFrame(listings)
+        metrics.count("pipeline.ads_known", counts.seen, city=self.label)
+        if df.empty:
+            return None, f"{counts.seen} already known across {counts.pages} pages"
+        parsed = len(df)
+        df = df.drop_duplicates().reset_index(drop=True)
+        metrics.count("pipeline.rows_deduplicated", parsed - len(df), city=self.label)
+        df.to_parquet(self.parsed_path, index=False)
+        df.to_csv(self.raw_csv_path, index=False)
+        return frame_hash(df), f"{len(df)} listings ({counts.new} new, {counts.updated} updated)"
+
+    def _clean(self):
+        df = clean_listings(pd.read_parquet(self.parsed_path))
+        df.to_parquet(self.cleaned_path, index=False)
+        return frame_hash(df), f"{len(df)} rows"
+
+    def _merge(self):
+        if self.store.needs_compact():
+            print("🗜️ Indexing listings stored before keyed upserts...")
+            self.store.compact()
+        counts = self.store.upsert(pd.read_parquet(self.cleaned_path), self.scrape_time)
+        for change in ("inserted", "updated", "unchanged", "skipped", "price_changes"):
+            metrics.count("store.rows", getattr(counts, change), change=change, city=self.label)
+        detail = (f"{counts.inserted} inserted, {counts.updated} updated ({counts.price_changes} price changes), "
+                  f"{counts.unchanged} unchanged, {counts.skipped} without a listing id")
+        if self.compact or len(self.store.partition_paths()) > COMPACT_AFTER:
+            index = self.store.compact()
+            detail += f"; compacted into {len(index)} listings"
+        if self.csv:
+            export_csv(self.store.load(), self.store.csv_path)
+        return hashlib.sha256(repr(self.store.version()).encode()).hexdigest(), detail
+
+
+def publish(stores=all_cities, staging_dir=os.path.join(RUN_DIR, "publish"), thumbnails=True):
+    """Rebuild the dashboards' artifacts over every city's listings and swap them in.
+
+    Everything is built under `staging_dir` first and renamed into place. With
+    more than one city, aggregates are also written per city under
+    data/aggregates/city=<name>/ for the Data Insights city filter. Returns
+    (hash of the published listings, detail).
+    """
+    merged_df = stores.load()
+    shutil.rmtree(staging_dir, ignore_errors=True)
+    os.makedirs(staging_dir)
+
+    staged = {AGGREGATES_DIR: os.path.join(staging_dir, "aggregates"),
+              SEARCH_INDEX_PATH: os.path.join(staging_dir, "search_index.npz"),
+              SIMILAR_INDEX_PATH: os.path.join(staging_dir, "similar_index.npz"),
+              MODEL_PATH: os.path.join(staging_dir, "rent_model.json"),
+              ENCODING_PATH: os.path.join(staging_dir, "rent_model_localities.json"),
+              ESTIMATES_PATH: os.path.join(staging_dir, "price_estimates.parquet")}
+    # The gazetteer only covers Delhi: other cities' localities are never placed on its map.
+    names = {label: name for name, label in stores.labels().items()}
+    cities = sorted(merged_df["City"].unique())
+    write_aggregates(build_aggregates(merged_df, geocode=[names[c] for c in cities] == [DEFAULT_CITY]),
+                     staged[AGGREGATES_DIR])
+    if len(cities) > 1:
+        for label, city_df in merged_df.groupby("City", observed=True):
+            write_aggregates(build_aggregates(city_df, geocode=names[label] == DEFAULT_CITY),
+                             os.path.join(staged[AGGREGATES_DIR], f"city={names[label]}"))
+    SearchIndex.build(merged_df).save(staged[SEARCH_INDEX_PATH])
+    # Similar listings are shown on explorer cards, so only explorer rows are candidates.
+    SimilarIndex.build(merged_df.dropna(subset=list(EXPLORER_COLUMNS))).save(staged[SIMILAR_INDEX_PATH])
+    try:
+        predictor = train(merged_df)
+    except (RuntimeError, ValueError) as e:
+        # The rest still publishes; the explorer shows cards without estimates.
+        print(f"⚠️ Skipping the rent model: {e}")
+        for path in (MODEL_PATH, ENCODING_PATH, ESTIMATES_PATH):
+            del staged[path]
+        predictor = None
+    else:
+        predictor.save(staged[MODEL_PATH], staged[ENCODING_PATH])
+        predictor.score(merged_df).to_parquet(staged[ESTIMATES_PATH], index=False)
+    for final, path in staged.items():
+        _swap_in(path, final)
+    shutil.rmtree(staging_dir, ignore_errors=True)
+    built = "aggregates, search and similar-listing indexes" + (" and rent model" if predictor else "")
+    detail = f"{built} over {len(merged_df)} listings"
+    if len(cities) > 1:
+        detail += f" in {len(cities)} cities"
+
+    if thumbnails:
+        image_fetcher = PageFetcher(headers=headers, max_workers=16, max_per_host=8, rate=20, retries=1,
+                                    timeout=20)
+        report = ThumbnailCache().warm(merged_df["Image"].dropna().tolist(), image_fetcher)
+        image_fetcher.close()
+        detail += f"; thumbnails: {report['stored']} stored, {report['failed']} failed, " \
+                  f"{report['evicted']} evicted"
+    return frame_hash(merged_df), detail
+
+
+def _run_shard(options, log_path=None):
+    # Worker-process entry point. A forked worker inherits the parent's registry and
+    # log handle, so it starts clean and hands its own metrics back with the reports.
+    metrics.close_log()
+    metrics.reset()
+    if log_path:
+        metrics.open_log(log_path, source=f"pipeline.{options['city'].name}")
+    try:
+        reports = PipelineRunner(publish=False, **options).run()
+    finally:
+        metrics.close_log()
+    return reports, metrics.state()
+
+
+class ShardedPipeline(StagedRun):
+    """Crawls several cities at once, one worker process per city, then publishes once over all of them.
+
+    Each city is a PipelineRunner shard with its own fetcher and rate limit,
+    page checkpoint and listing store, run up to merge; fetching, parsing and
+    cleaning happen in the workers. `options` are passed to every shard. With
+    `processes=1`, the default until bench_shards has shown the workers scale
+    on a multi-core machine, the shards run one after another in this process.
+    """
+
+    def __init__(self, cities, processes=1, stores=all_cities, run_dir=RUN_DIR, thumbnails=True, log_path=None,
+                 **options):
+        super().__init__(os.path.join(run_dir, "sharded.json"), "all")
+        self.run_dir = run_dir
+        self.cities = list(cities)
+        self.processes = max(1, min(processes, len(self.cities)))
+        self.stores = stores
+        self.thumbnails = thumbnails
+        self.log_path = log_path
+        self.options = options
+
+    def run(self):
+        jobs = [dict(self.options, city=city) for city in self.cities]
+        if self.processes == 1:
+            results = [(PipelineRunner(publish=False, **job).run(), None) for job in jobs]
+        else:
+            print(f"🏙️ Crawling {len(jobs)} cities in {self.processes} worker processes...")
+            with ProcessPoolExecutor(self.processes) as pool:
+                results = list(pool.map(_run_shard, jobs, [self.log_path] * len(jobs)))
+        for reports, state in results:
+            self.reports.extend(reports)
+            if state is not None:
+                metrics.absorb(state)
+        self._stage("publish", self.stores.version(),
+                    lambda: publish(self.stores, os.path.join(self.run_dir, "publish"), self.thumbnails))
+        return self.reports
+
+
+def print_report(reports):
+    print("⏱️ Run report")
+    cities = {r.city for r in reports}
+    for report in reports:
+        city = f"{report.city:<10} " if len(cities) > 1 else ""
+        print(f"  {city}{report.name:<8} {report.status:<8} {report.seconds:7.2f}s  {report.detail}")
+    pad = " " * 11 if len(cities) > 1 else ""
+    print(f"  {pad}{'total':<8} {'':<8} {sum(r.seconds for r in reports):7.2f}s")
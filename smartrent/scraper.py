@@ -0,0 +1,162 @@
+from dataclasses import dataclass
+
+from smartrent.cities import CITIES, DEFAULT_CITY
+from smartrent.cleaning import IID_PATTERN
+from smartrent.fetch import PageFetcher
+from smartrent.metrics import metrics
+from smartrent.parsers import get_parser
+
+headers = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64)"
+}
+
+OLX_URL = CITIES[DEFAULT_CITY].url
+
+
+def listing_id(link):
+    match = IID_PATTERN.search(link) if isinstance(link, str) else None
+    return match.group(1) if match else None
+
+
+def _price_value(price):
+    if isinstance(price, str):
+        price = price.replace("₹", "").replace(",", "").strip()
+    try:
+        return int(price)
+    except (TypeError, ValueError):
+        return None
+
+
+def page_url(page_num, base_url=OLX_URL):
+    return f"{base_url}?page={page_num}"
+
+
+def parse_listings(html, backend=None):
+    with metrics.timer("parse.page"):
+        ads = get_parser(backend)(html)
+    metrics.count("parse.ads", len(ads))
+    return ads
+
+
+def fetch_pages(page_nums, fetcher, base_url=OLX_URL, checkpoint=None):
+    """HTML of each results page, or None where the fetch failed.
+
+    Pages already saved in `checkpoint` are read back instead of fetched, and
+    newly fetched ones are saved to it, so an interrupted crawl can resume.
+    """
+    pages = {n: checkpoint.load(n) for n in page_nums} if checkpoint is not None else {}
+    missing = [n for n in page_nums if pages.get(n) is None]
+    on_page = (lambda i, html: checkpoint.save(missing[i], html)) if checkpoint is not None else None
+    for n, html in zip(missing, fetcher.fetch_all([page_url(n, base_url) for n in missing], on_page)):
+        pages[n] = html
+    return [pages[n] for n in page_nums]
+
+
+def scrape_olx(start_page=2, end_page=80, fetcher=None, base_url=OLX_URL, backend=None, checkpoint=None):
+    """Every listing on results pages `start_page`..`end_page` of `base_url` (a `City.url`)."""
+    own_fetcher = fetcher is None
+    if own_fetcher:
+        fetcher = PageFetcher(headers=headers)
+
+    page_nums = list(range(start_page, end_page + 1))
+    print(f"🔎 Scraping pages {start_page} to {end_page}...")
+    try:
+        pages = fetch_pages(page_nums, fetcher, base_url, checkpoint)
+    finally:
+        if own_fetcher:
+            fetcher.close()
+
+    listings = []
+    for page_num, html in zip(page_nums, pages):
+        if html is None:
+            continue
+
+        ads = parse_listings(html, backend)
+        if not ads:
+            print(f"⚠️ No ads found on page {page_num}. Possibly JS-rendered.")
+            continue
+        listings.extend(ads)
+
+    _print_fetch_stats(fetcher)
+    return listings
+
+
+@dataclass
+class ScrapeCounts:
+    pages: int = 0
+    new: int = 0
+    seen: int = 0
+    updated: int = 0
+    last_page: int = None  # the last page the crawl looked at before stopping
+
+
+def fresh_listings(ads, known, counts):
+    """The ads in `ads` that are new or changed price; updates `known` and `counts` as it goes."""
+    fresh = []
+    for ad in ads:
+        iid = listing_id(ad["Link"])
+        price = _price_value(ad["Price"])
+        if iid is None or iid not in known:
+            counts.new += 1
+            fresh.append(ad)
+        elif price != known[iid]:
+            counts.updated += 1
+            fresh.append(ad)
+        else:
+            counts.seen += 1
+        if iid is not None:
+            known[iid] = price
+    return fresh
+
+
+def scrape_incremental(known, start_page=2, end_page=80, stop_after=2, fetcher=None, base_url=OLX_URL,
+                       backend=None, checkpoint=None):
+    """Crawl until `stop_after` consecutive pages contain only already-known ads.
+
+    Pages are fetched in batches of `fetcher.max_workers` so the crawl keeps its
+    concurrency but never runs more than one batch past the stopping point;
+    `counts.last_page` records where it stopped, so pages fetched past it can
+    be ignored. Returns the new and price-changed listings plus per-run counters.
+    """
+    own_fetcher = fetcher is None
+    if own_fetcher:
+        fetcher = PageFetcher(headers=headers)
+
+    known = dict(known)
+    counts = ScrapeCounts()
+    listings = []
+    quiet_pages = 0
+    page_num = start_page
+    try:
+        while page_num <= end_page and quiet_pages < stop_after:
+            batch = list(range(page_num, min(page_num + fetcher.max_workers, end_page + 1)))
+            print(f"🔎 Scraping pages {batch[0]} to {batch[-1]}...")
+            pages = fetch_pages(batch, fetcher, base_url, checkpoint)
+            page_num = batch[-1] + 1
+
+            for n, html in zip(batch, pages):
+                counts.last_page = n
+                if html is None:
+                    quiet_pages = 0
+                    continue
+                counts.pages += 1
+                fresh = fresh_listings(parse_listings(html, backend), known, counts)
+                listings.extend(fresh)
+                quiet_pages = 0 if fresh else quiet_pages + 1
+                if quiet_pages >= stop_after:
+                    print(f"🛑 Pages {n - stop_after + 1}-{n} had no new listings, stopping.")
+                    break
+    finally:
+        if own_fetcher:
+            fetcher.close()
+
+    _print_fetch_stats(fetcher)
+    print(f"🧮 {counts.new} new, {counts.updated} updated, {counts.seen} already known "
+          f"across {counts.pages} pages")
+    return listings, counts
+
+
+def _print_fetch_stats(fetcher):
+    stats = fetcher.stats
+    print(f"📶 Fetched {stats.pages} pages in {stats.elapsed:.1f}s "
+          f"({stats.pages_per_sec:.2f} pages/sec, {stats.retries} retries, {stats.failures} failed)")
@@ -0,0 +1,138 @@
+import os
+import re
+
+import numpy as np
+import pandas as pd
+
+SEARCH_INDEX_PATH = "data/search_index.npz"
+
+TOKEN_PATTERN = r"[a-z0-9]+"
+# Locality names are what people misspell and search for most.
+FIELD_WEIGHTS = {"Title": 1.0, "Locality": 2.0}
+MIN_SIMILARITY = 0.4
+PREFIX_SIMILARITY = 0.9
+
+
+def tokenize(text):
+    return re.findall(TOKEN_PATTERN, text.lower())
+
+
+def _trigrams(term):
+    padded = f"${term}$"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class SearchIndex:
+    """Inverted index over listing Title and Locality tokens with trigram fuzzy matching.
+
+    Postings are stored CSR-style: the documents containing vocab[t] are
+    docs[offsets[t]:offsets[t + 1]] with tf-idf weights alongside. Query terms
+    missing from the vocabulary are matched to terms sharing enough trigrams
+    (Jaccard similarity), so "rajori" still finds "rajouri".
+    """
+
+    def __init__(self, ids, vocab, offsets, docs, weights):
+        self.ids = ids
+        self.vocab = vocab
+        self.offsets = offsets
+        self.docs = docs
+        self.weights = weights
+        self._terms = {term: i for i, term in enumerate(vocab.tolist())}
+        self._build_trigrams()
+
+    def _build_trigrams(self):
+        grams = {}
+        self._gram_counts = np.empty(len(self.vocab), dtype=np.int32)
+        for i, term in enumerate(self.vocab.tolist()):
+            term_grams = _trigrams(term)
+            self._gram_counts[i] = len(term_grams)
+            for gram in term_grams:
+                grams.setdefault(gram, []).append(i)
+        self._grams = {g: np.asarray(t, dtype=np.int32) for g, t in grams.items()}
+
+    @classmethod
+    def build(cls, df):
+        """Index every row of `df` (needs Link, Title and Locality); rows are keyed by listing id."""
+        from smartrent.cleaning import listing_ids
+
+        ids = listing_ids(df["Link"]).fillna(-1).to_numpy(dtype=np.int64)
+        frames = []
+        for field, weight in FIELD_WEIGHTS.items():
+            tokens = df[field].astype("string").fillna("").str.lower().str.findall(TOKEN_PATTERN)
+            pairs = tokens.reset_index(drop=True).explode().dropna()
+            frames.append(pd.DataFrame({"doc": pairs.index.to_numpy(), "term": pairs.to_numpy(dtype=object),
+                                        "tf": weight}))
+        pairs = pd.concat(frames, ignore_index=True)
+        if pairs.empty:
+            return cls(ids, np.array([], dtype=str), np.zeros(1, np.int64), np.empty(0, np.int32),
+                       np.empty(0, np.float32))
+        tf = pairs.groupby(["term", "doc"], sort=True)["tf"].sum().reset_index()
+
+        vocab, term_codes = np.unique(tf["term"].to_numpy(dtype=str), return_inverse=True)
+        df_counts = np.bincount(term_codes, minlength=len(vocab))
+        offsets = np.concatenate([[0], np.cumsum(df_counts)]).astype(np.int64)
+        idf = np.log1p(len(df) / df_counts)
+        weights = (tf["tf"].to_numpy() * idf[term_codes]).astype(np.float32)
+        return cls(ids, vocab, offsets, tf["doc"].to_numpy(dtype=np.int32), weights)
+
+    def save(self, path=SEARCH_INDEX_PATH):
+        tmp = path + ".tmp.npz"
+        np.savez(tmp, ids=self.ids, vocab=self.vocab, offsets=self.offsets, docs=self.docs, weights=self.weights)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path=SEARCH_INDEX_PATH):
+        if not os.path.exists(path):
+            return None
+        with np.load(path) as data:
+            return cls(data["ids"], data["vocab"], data["offsets"], data["docs"], data["weights"])
+
+    def similar_terms(self, token):
+        """(term index, similarity) pairs for a query token: exact, prefix and trigram matches."""
+        matches = {}
+        exact = self._terms.get(token)
+        if exact is not None:
+            matches[exact] = 1.0
+        lo = np.searchsorted(self.vocab, token, side="left")
+        hi = np.searchsorted(self.vocab, token + "\uffff", side="left")
+        for i in range(lo, min(hi, lo + 50)):
+            matches.setdefault(int(i), PREFIX_SIMILARITY)
+
+        grams = _trigrams(token)
+        hits = [self._grams[g] for g in grams if g in self._grams]
+        if hits:
+            shared = np.bincount(np.concatenate(hits), minlength=len(self.vocab))
+            candidates = np.flatnonzero(shared)
+            jaccard = shared[candidates] / (len(grams) + self._gram_counts[candidates] - shared[candidates])
+            for i, sim in zip(candidates[jaccard >= MIN_SIMILARITY], jaccard[jaccard >= MIN_SIMILARITY]):
+                if sim > matches.get(int(i), 0):
+                    matches[int(i)] = float(sim)
+        return matches
+
+    def search(self, query, limit=None):
+        """Listing ids that match the most query words, ranked by tf-idf score.
+
+        Listings matching every word are returned if there are any; otherwise
+        the best partial matches are.
+        """
+        tokens = tokenize(query)
+        if not tokens:
+            return np.empty(0, dtype=np.int64)
+        n_docs = len(self.ids)
+        scores = np.zeros(n_docs, dtype=np.float32)
+        matched = np.zeros(n_docs, dtype=np.int16)
+        for token in tokens:
+            best = np.zeros(n_docs, dtype=np.float32)
+            for term, sim in self.similar_terms(token).items():
+                start, end = self.offsets[term], self.offsets[term + 1]
+                docs = self.docs[start:end]
+                best[docs] = np.maximum(best[docs], self.weights[start:end] * sim)
+            scores += best
+            matched += best > 0
+        if not matched.any():
+            return np.empty(0, dtype=np.int64)
+        hits = np.flatnonzero(matched == matched.max())
+        ranked = hits[np.argsort(-scores[hits], kind="stable")]
+        if limit is not None:
+            ranked = ranked[:limit]
+        return self.ids[ranked]
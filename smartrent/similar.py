@@ -0,0 +1,144 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from smartrent.metrics import metrics
+from smartrent.model import SMOOTHING
+
+SIMILAR_INDEX_PATH = "data/similar_index.npz"
+SIMILAR_K = 4
+# Candidates per requested neighbour that are re-ranked on exact distances.
+SHORTLIST = 4
+
+# Feature -> weight once standardized: rent and size matter most for "comparable".
+FEATURE_WEIGHTS = {
+    "LogPrice": 2.0,
+    "LogArea": 1.5,
+    "BHK": 1.5,
+    "Bathroom": 0.5,
+    "LogPricePerSqft": 1.0,
+    "Locality": 1.5,  # smoothed mean log price per sqft of the listing's locality
+}
+
+
+def listing_features(df):
+    """Raw feature columns, in FEATURE_WEIGHTS order, for every row of `df`; NaN where unknown."""
+    price = df["Price"].to_numpy(dtype=np.float64)
+    price = np.where(price > 0, price, np.nan)
+    area = df["Area"].to_numpy(dtype=np.float64, na_value=np.nan)
+    area = np.where(area > 0, area, np.nan)
+    log_ppsf = pd.Series(np.log(price / area), index=df.index)
+
+    # Target-encode Locality within its city, shrunk towards the city-wide mean.
+    city = df["City"].astype(str) if "City" in df else pd.Series("", index=df.index)
+    place = city + "|" + df["Locality"].astype(str)
+    stats = log_ppsf.groupby(place).agg(["sum", "count"])
+    prior = city.map(log_ppsf.groupby(city).mean())
+    locality = (place.map(stats["sum"]) + SMOOTHING * prior) / (place.map(stats["count"]) + SMOOTHING)
+    locality = locality.where(df["Locality"].notna())
+
+    return np.column_stack([
+        np.log(price),
+        np.log(area),
+        df["BHK"].to_numpy(dtype=np.float64, na_value=np.nan),
+        df["Bathroom"].to_numpy(dtype=np.float64, na_value=np.nan),
+        log_ppsf.to_numpy(),
+        locality.to_numpy(dtype=np.float64),
+    ])
+
+
+class SimilarIndex:
+    """Nearest-neighbour index for "similar listings", keyed by listing id.
+
+    Every listing is a vector of standardized, weighted features (see
+    FEATURE_WEIGHTS); unknown values sit at the mean. Rows are grouped by
+    city so neighbours always come from the listing's own city. `similar`
+    answers a batch of listings (a page of cards) with one matrix product
+    per city: squared distances are |c|^2 - 2 c.q + |q|^2 over the city's
+    rows, a shortlist of the smallest is picked with argpartition and then
+    ranked on exact differences (the expansion loses float32 precision near
+    zero), ties going to the earlier row.
+    """
+
+    def __init__(self, ids, vectors, blocks):
+        self.ids = ids
+        self.vectors = vectors
+        self.blocks = blocks  # rows blocks[i]:blocks[i + 1] belong to one city
+        self._norms = np.einsum("ij,ij->i", vectors, vectors)
+        self._block_of = np.repeat(np.arange(len(blocks) - 1), np.diff(blocks))
+        self._id_order = np.argsort(ids, kind="stable")
+        self._ids_sorted = ids[self._id_order]
+
+    @classmethod
+    def build(cls, df):
+        """Index every row of `df` with a listing id (needs Link, Price, Area, BHK, Bathroom, Locality)."""
+        from smartrent.cleaning import listing_ids
+
+        ids = listing_ids(df["Link"])
+        keep = ids.notna() & ~ids.duplicated()
+        df, ids = df[keep.to_numpy()].reset_index(drop=True), ids[keep].to_numpy(dtype=np.int64)
+        city = df["City"].astype(str).to_numpy() if "City" in df else np.full(len(df), "")
+        order = np.argsort(city, kind="stable")
+        ids, city = ids[order], city[order]
+
+        features = listing_features(df)[order]
+        with np.errstate(invalid="ignore"):
+            mean = np.nanmean(features, axis=0) if len(features) else np.zeros(features.shape[1])
+            std = np.nanstd(features, axis=0) if len(features) else np.ones(features.shape[1])
+        std = np.where(np.isnan(std) | (std == 0), 1.0, std)
+        scaled = np.nan_to_num((features - mean) / std) * np.array(list(FEATURE_WEIGHTS.values()))
+
+        starts = np.flatnonzero(np.r_[True, city[1:] != city[:-1]]) if len(city) else np.empty(0, np.int64)
+        blocks = np.r_[starts, len(city)].astype(np.int64)
+        return cls(ids, scaled.astype(np.float32), blocks)
+
+    def save(self, path=SIMILAR_INDEX_PATH):
+        tmp = path + ".tmp.npz"
+        np.savez(tmp, ids=self.ids, vectors=self.vectors, blocks=self.blocks)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path=SIMILAR_INDEX_PATH):
+        if not os.path.exists(path):
+            return None
+        with np.load(path) as data:
+            return cls(data["ids"], data["vectors"], data["blocks"])
+
+    def __len__(self):
+        return len(self.ids)
+
+    def row_of(self, ids):
+        """Index row of each listing id, or -1 where it is not indexed."""
+        ids = np.asarray(ids, dtype=np.int64)
+        at = np.minimum(np.searchsorted(self._ids_sorted, ids), max(len(self.ids) - 1, 0))
+        if not len(self.ids):
+            return np.full(len(ids), -1)
+        return np.where(self._ids_sorted[at] == ids, self._id_order[at], -1)
+
+    def similar(self, ids, k=SIMILAR_K):
+        """Listing ids of the `k` nearest listings to each of `ids`, nearest first: shape (len(ids), k).
+
+        Rows are padded with -1 for an unknown id or a city with fewer listings.
+        """
+        ids = np.asarray(ids, dtype=np.int64)
+        out = np.full((len(ids), k), -1, dtype=np.int64)
+        with metrics.timer("similar.query"):
+            rows = self.row_of(ids)
+            known = np.flatnonzero(rows >= 0)
+            for block in np.unique(self._block_of[rows[known]]):
+                lo, hi = self.blocks[block], self.blocks[block + 1]
+                n = min(k, hi - lo - 1)
+                if n <= 0:
+                    continue
+                which = known[self._block_of[rows[known]] == block]
+                queries = self.vectors[rows[which]]
+                dist = self._norms[rows[which]][:, None] - 2 * queries @ self.vectors[lo:hi].T
+                dist += self._norms[lo:hi]
+                dist[np.arange(len(which)), rows[which] - lo] = np.inf  # not the listing itself
+                pool = min(SHORTLIST * n, hi - lo - 1)
+                top = np.argpartition(dist, pool - 1, axis=1)[:, :pool]
+                exact = ((self.vectors[lo + top] - queries[:, None, :]) ** 2).sum(axis=2)
+                top = np.take_along_axis(top, np.lexsort((top, exact))[:, :n], 1)
+                out[which, :n] = self.ids[lo + top]
+        return out
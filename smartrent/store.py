@@ -0,0 +1,329 @@
+import glob
+import os
+import shutil
+from dataclasses import dataclass
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from smartrent.cleaning import listing_ids
+from smartrent.metrics import metrics
+
+DATA_DIR = "data"
+CSV_PATH = "data/cleaned_data.csv"
+
+# Compact automatically once this many run partitions have piled up.
+COMPACT_AFTER = 30
+
+# Column -> dtype of the cleaned listing table. Location/Locality repeat across
+# thousands of rows, so they are stored dictionary-encoded; BHK/Bathroom are
+# small counts that may be missing.
+SCHEMA = {
+    "Title": "string",
+    "Location": "category",
+    "Price": "int32",
+    "Link": "string",
+    "Image": "string",
+    "Info": "string",
+    "BHK": "Int8",
+    "Bathroom": "Int8",
+    "Area": "float32",
+    "Locality": "category",
+}
+COLUMNS = list(SCHEMA)
+
+# Columns each dashboard page needs to be present before it can use a row.
+OVERVIEW_COLUMNS = ("Price", "Area")
+INSIGHTS_COLUMNS = ("Title", "Location", "Price", "Link", "Image", "BHK", "Area")
+EXPLORER_COLUMNS = ("Title", "Location", "Price", "Link", "Image", "BHK")
+
+
+def apply_schema(df):
+    """Keep only the listing columns (dropping stray index columns) and cast them to SCHEMA."""
+    df = df.reindex(columns=COLUMNS)
+    for col, dtype in SCHEMA.items():
+        if dtype in ("Int8",):
+            df[col] = pd.to_numeric(df[col]).round().astype(dtype)
+        else:
+            df[col] = df[col].astype(dtype)
+    return df.reset_index(drop=True)
+
+
+def content_hash(df):
+    # Hashes values, not category codes, so it is stable across files.
+    return pd.util.hash_pandas_object(df[COLUMNS], index=False).to_numpy(np.uint64)
+
+
+def read_csv(path=CSV_PATH, columns=None):
+    df = pd.read_csv(path, index_col=0)
+    df = apply_schema(df)
+    return df[columns] if columns else df
+
+
+def _write_parquet(df, path):
+    tmp = path + ".tmp"
+    df.to_parquet(tmp, index=False)
+    os.replace(tmp, path)
+
+
+@dataclass
+class UpsertCounts:
+    inserted: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    price_changes: int = 0
+    skipped: int = 0
+
+
+class ListingStore:
+    """Append-only listing store keyed by OLX listing id.
+
+    Layout under `root`:
+
+    - listings.parquet: compacted base table
+    - partitions/scrape_date=YYYY-MM-DD/part-HHMMSSffffff.parquet: rows written by one run
+    - listing_index.parquet: id -> content hash, price, and the file/row holding the live version
+    - price_history.csv: one line per observed price change
+
+    Runs only append partitions and rewrite the index, so their cost depends on
+    the number of new rows; readers use the index to pick each id's live row.
+    """
+
+    def __init__(self, root=DATA_DIR, csv_path=CSV_PATH):
+        self.root = root
+        self.csv_path = csv_path
+        self.base_path = os.path.join(root, "listings.parquet")
+        self.partitions_dir = os.path.join(root, "partitions")
+        self.index_path = os.path.join(root, "listing_index.parquet")
+        self.history_path = os.path.join(root, "price_history.csv")
+
+    def version(self):
+        """Cheap fingerprint of the stored data; changes whenever a run writes."""
+        stamp = []
+        for path in (self.index_path, self.base_path, self.csv_path, self.partitions_dir):
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                continue
+            stamp.append((path, st.st_mtime_ns, st.st_size))
+        return tuple(stamp)
+
+    def partition_paths(self):
+        """Run partitions, newest first."""
+        paths = glob.glob(os.path.join(self.partitions_dir, "scrape_date=*", "part-*.parquet"))
+        return sorted(paths, reverse=True)
+
+    def load_index(self):
+        if not os.path.exists(self.index_path):
+            return None
+        return pd.read_parquet(self.index_path).set_index("id")
+
+    def _write_index(self, index):
+        _write_parquet(index.reset_index(), self.index_path)
+
+    def _load_legacy(self):
+        # Pre-index data: the base file or CSV export plus partitions, newest first.
+        frames = [pd.read_parquet(p) for p in self.partition_paths()]
+        if os.path.exists(self.base_path):
+            frames.append(pd.read_parquet(self.base_path))
+        elif os.path.exists(self.csv_path):
+            frames.append(read_csv(self.csv_path))
+        if not frames:
+            return apply_schema(pd.DataFrame())
+        return apply_schema(pd.concat(frames, ignore_index=True))
+
+    def _empty_index(self):
+        return pd.DataFrame({"hash": np.empty(0, np.uint64), "Price": np.empty(0, np.int32),
+                             "file": pd.Categorical([]), "row": np.empty(0, np.int32)},
+                            index=pd.Index(np.empty(0, np.int64), name="id"))
+
+    def _load_legacy_live(self):
+        # Newest row per listing id of pre-index data; rows without an id are dropped.
+        df = self._load_legacy()
+        ids = listing_ids(df["Link"])
+        keep = ids.notna() & ~ids.duplicated()
+        return df[keep].reset_index(drop=True), ids[keep].astype("int64").to_numpy()
+
+    def load(self, columns=None):
+        """Live row of every listing, newest partitions first, then the base.
+
+        A compaction finishing mid-read moves rows and removes partitions, so
+        the read is retried once if a file vanished or the store changed under it.
+        """
+        for attempt in range(2):
+            before = self.version()
+            try:
+                df = self._load(columns)
+            except FileNotFoundError:
+                if attempt:
+                    raise
+                continue
+            if self.version() == before:
+                break
+        return df
+
+    def _load(self, columns):
+        index = self.load_index()
+        if index is None:
+            df = self._load_legacy().drop_duplicates().reset_index(drop=True)
+            return df[columns] if columns else df
+        if index.empty:
+            df = apply_schema(pd.DataFrame())
+            return df[columns] if columns else df
+
+        order = {path: i for i, path in enumerate(self.partition_paths() + [self.base_path])}
+        frames = []
+        for path, rows in sorted(index.groupby("file", observed=True)["row"], key=lambda g: order.get(g[0], -1)):
+            part = pd.read_parquet(path, columns=columns)
+            frames.append(part.iloc[np.sort(rows.to_numpy())])
+        if len(frames) == 1:
+            return frames[0].reset_index(drop=True)
+        df = pd.concat(frames, ignore_index=True)
+        if columns:
+            return df.astype({c: SCHEMA[c] for c in columns})
+        return apply_schema(df)
+
+    def known_prices(self):
+        """Map listing id (as in the ad link) -> last known price; read-only, even for pre-index data."""
+        index = self.load_index()
+        if index is None:
+            df, ids = self._load_legacy_live()
+            return dict(zip(ids.astype(str), df["Price"].tolist()))
+        return dict(zip(index.index.astype(str), index["Price"].tolist()))
+
+    def needs_compact(self):
+        """True for pre-index data, which `upsert` needs indexed by `compact()` first."""
+        if self.load_index() is not None:
+            return False
+        return bool(self.partition_paths()) or os.path.exists(self.base_path) or os.path.exists(self.csv_path)
+
+    @metrics.timed("store.upsert")
+    def upsert(self, df, scrape_time=None):
+        """Insert new listings and replace changed ones, keyed by listing id.
+
+        Rows whose content hash matches the indexed one are dropped; the rest are
+        written as this run's partition and the index is repointed at them.
+        Price changes are appended to the price history. A store holding
+        pre-index data must be compacted first (see `needs_compact`).
+        """
+        index = self.load_index()
+        if index is None:
+            if self.needs_compact():
+                raise ValueError(f"{self.root} holds listings without an index; call compact() before upsert()")
+            index = self._empty_index()
+        scrape_time = scrape_time or datetime.now()
+        counts = UpsertCounts()
+
+        df = apply_schema(df)
+        ids = listing_ids(df["Link"])
+        keep = ids.notna() & ~ids.duplicated()
+        counts.skipped = int((~keep).sum())
+        df, ids = df[keep].reset_index(drop=True), ids[keep].astype("int64").to_numpy()
+        hashes = content_hash(df)
+
+        pos = index.index.get_indexer(ids)
+        is_new = pos < 0
+        if len(index):
+            old_hashes = index["hash"].to_numpy()[pos]
+            old_prices = index["Price"].to_numpy()[pos]
+        else:
+            old_hashes = np.zeros(len(ids), np.uint64)
+            old_prices = np.zeros(len(ids), np.int32)
+        changed = ~is_new & (old_hashes != hashes)
+        counts.inserted = int(is_new.sum())
+        counts.updated = int(changed.sum())
+        counts.unchanged = len(df) - counts.inserted - counts.updated
+
+        write = is_new | changed
+        if not write.any():
+            return counts
+        rows = df[write].reset_index(drop=True)
+        path = self._append_partition(rows, scrape_time)
+
+        prices = rows["Price"].to_numpy()
+        old_prices = old_prices[write]
+        moved = changed[write] & (old_prices != prices)
+        counts.price_changes = int(moved.sum())
+        if counts.price_changes:
+            self._record_price_changes(ids[write][moved], old_prices[moved], prices[moved], scrape_time)
+
+        entries = pd.DataFrame({
+            "hash": hashes[write],
+            "Price": prices,
+            "file": path,
+            "row": np.arange(len(rows), dtype=np.int32),
+        }, index=pd.Index(ids[write], name="id"))
+        index = pd.concat([index.drop(entries.index, errors="ignore"), entries])
+        index["file"] = index["file"].astype("category")
+        self._write_index(index)
+        return counts
+
+    def _append_partition(self, df, scrape_time):
+        part_dir = os.path.join(self.partitions_dir, f"scrape_date={scrape_time:%Y-%m-%d}")
+        os.makedirs(part_dir, exist_ok=True)
+        path = os.path.join(part_dir, f"part-{scrape_time:%H%M%S%f}.parquet")
+        _write_parquet(df, path)
+        return path
+
+    def _record_price_changes(self, ids, old_prices, new_prices, scrape_time):
+        history = pd.DataFrame({
+            "id": ids,
+            "OldPrice": old_prices.astype("int64"),
+            "Price": new_prices,
+            "Timestamp": scrape_time.isoformat(timespec="seconds"),
+        })
+        header = not os.path.exists(self.history_path)
+        history.to_csv(self.history_path, mode="a", header=header, index=False)
+
+    def price_history(self):
+        if not os.path.exists(self.history_path):
+            return pd.DataFrame(columns=["id", "OldPrice", "Price", "Timestamp"])
+        return pd.read_csv(self.history_path)
+
+    @metrics.timed("store.compact")
+    def compact(self):
+        """Fold every live row into the base file and rebuild the index over it.
+
+        Without an index (data from before keyed storage) the newest row per
+        listing id wins, and rows without an id are dropped.
+        """
+        parts = self.partition_paths()
+        if self.load_index() is None:
+            df, ids = self._load_legacy_live()
+        else:
+            df = self.load()
+            ids = listing_ids(df["Link"]).astype("int64").to_numpy()
+
+        os.makedirs(self.root, exist_ok=True)
+        _write_parquet(df, self.base_path)
+        index = pd.DataFrame({
+            "hash": content_hash(df),
+            "Price": df["Price"].to_numpy(),
+            "file": pd.Categorical([self.base_path] * len(df)),
+            "row": np.arange(len(df), dtype=np.int32),
+        }, index=pd.Index(ids, name="id"))
+        self._write_index(index)
+
+        # Old partitions go only once the new index no longer points at them; a
+        # reader that loaded the old index retries (see `load`).
+        for part in parts:
+            os.remove(part)
+        for part_dir in glob.glob(os.path.join(self.partitions_dir, "scrape_date=*")):
+            if not os.listdir(part_dir):
+                shutil.rmtree(part_dir)
+        return index
+
+
+default_store = ListingStore()
+
+
+def load_listings(columns=None):
+    return default_store.load(columns)
+
+
+def export_csv(df, path=CSV_PATH):
+    # float32 Area would print as e.g. 1.5800000429; write it back as 2-decimal float64.
+    out = df.copy()
+    out["Area"] = out["Area"].astype("float64").round(2)
+    out.to_csv(path)
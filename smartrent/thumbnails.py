@@ -0,0 +1,172 @@
+import base64
+import hashlib
+import io
+import json
+import os
+import threading
+import time
+
+from PIL import Image
+
+THUMBNAIL_DIR = "data/thumbnails"
+MANIFEST_PATH = os.path.join(THUMBNAIL_DIR, "manifest.json")
+CARD_SIZE = (320, 200)
+MAX_CACHE_BYTES = 200 * 1024 * 1024
+RETRY_FAILED_SECONDS = 24 * 3600  # a download that failed is tried again after this long
+# What Pillow raises for bytes it cannot (or will not) decode; such images are never retried.
+DECODE_ERRORS = (OSError, ValueError, Image.DecompressionBombError)
+
+PLACEHOLDER = "data:image/svg+xml;base64," + base64.b64encode(
+    f'<svg xmlns="http://www.w3.org/2000/svg" width="{CARD_SIZE[0]}" height="{CARD_SIZE[1]}">'
+    '<rect width="100%" height="100%" fill="#2c3e50"/>'
+    '<text x="50%" y="50%" fill="#8899aa" font-family="sans-serif" font-size="20" '
+    'text-anchor="middle" dominant-baseline="middle">🏠 No photo</text></svg>'.encode("utf-8")
+).decode("ascii")
+
+
+def resize(data, size=CARD_SIZE):
+    """Fit the image inside `size` and re-encode it as WebP."""
+    with Image.open(io.BytesIO(data)) as img:
+        img = img.convert("RGB")
+        img.thumbnail(size)
+        out = io.BytesIO()
+        img.save(out, format="WEBP", quality=70)
+    return out.getvalue()
+
+
+class ThumbnailCache:
+    """Content-addressed on-disk cache of card-sized listing images.
+
+    Files are stored as <root>/<sha[:2]>/<sha>.webp, so listings sharing a
+    photo share one file; manifest.json maps image URL -> sha. Reads touch
+    the file's mtime and `evict` removes the least recently used files until
+    the cache fits in `max_bytes`. Images that could not be decoded are
+    recorded with an empty sha and never retried; URLs that failed to download
+    are recorded with the failure time and retried after `retry_after` seconds.
+    """
+
+    def __init__(self, root=THUMBNAIL_DIR, max_bytes=MAX_CACHE_BYTES, size=CARD_SIZE,
+                 retry_after=RETRY_FAILED_SECONDS):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.size = size
+        self.retry_after = retry_after
+        self.manifest_path = os.path.join(root, "manifest.json")
+        self._lock = threading.Lock()
+        self._manifest = self._load_manifest()
+
+    def _load_manifest(self):
+        try:
+            with open(self.manifest_path) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    def _save_manifest(self):
+        os.makedirs(self.root, exist_ok=True)
+        tmp = self.manifest_path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(self._manifest, f)
+        os.replace(tmp, self.manifest_path)
+
+    def _path(self, digest):
+        return os.path.join(self.root, digest[:2], digest + ".webp")
+
+    def __len__(self):
+        return len(self._manifest)
+
+    def __contains__(self, url):
+        digest = self._manifest.get(url)
+        if isinstance(digest, (int, float)):  # failed download: cached until it is due for a retry
+            return time.time() - digest < self.retry_after
+        return digest == "" or (digest is not None and os.path.exists(self._path(digest)))
+
+    def put(self, url, data):
+        return self._write(url, resize(data, self.size))
+
+    def _write(self, url, thumb):
+        digest = hashlib.sha256(thumb).hexdigest()
+        path = self._path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path + ".tmp", "wb") as f:
+                f.write(thumb)
+            os.replace(path + ".tmp", path)
+        with self._lock:
+            self._manifest[url] = digest
+        return digest
+
+    def get(self, url):
+        digest = self._manifest.get(url)
+        if not isinstance(digest, str) or not digest:
+            return None
+        path = self._path(digest)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            return None
+        os.utime(path)
+        return data
+
+    def src(self, url):
+        """`<img src>` value for a listing image: an inline data URI, or the placeholder on a miss."""
+        data = self.get(url) if isinstance(url, str) else None
+        if data is None:
+            return PLACEHOLDER
+        return "data:image/webp;base64," + base64.b64encode(data).decode("ascii")
+
+    def warm(self, urls, fetcher):
+        """Download and cache every URL not cached yet, concurrently through `fetcher`.
+
+        Each image is resized and written as soon as it arrives rather than after
+        the whole batch has been downloaded.
+        """
+        missing = sorted({u for u in urls if isinstance(u, str) and u not in self})
+        digests = [None] * len(missing)  # sha once stored, "" when the image cannot be decoded
+
+        def store(i, data):
+            # Resized in the fetch worker, so only the bodies in flight are held in memory.
+            try:
+                thumb = resize(data, self.size)
+            except DECODE_ERRORS:
+                digests[i] = ""
+                return
+            try:
+                digests[i] = self._write(missing[i], thumb)
+            except OSError:  # e.g. a full disk; retried like a failed download
+                pass
+
+        fetcher.fetch_all(missing, store, keep=False)
+        failed_at = time.time()
+        with self._lock:
+            for url, digest in zip(missing, digests):
+                if not digest:
+                    self._manifest[url] = failed_at if digest is None else ""
+        self._save_manifest()
+        stored = sum(1 for digest in digests if digest)
+        failed = len(missing) - stored
+        evicted = self.evict()
+        return {"requested": len(missing), "stored": stored, "failed": failed, "evicted": evicted}
+
+    def evict(self):
+        files = []
+        for dirpath, _, names in os.walk(self.root):
+            for name in names:
+                if name.endswith(".webp"):
+                    path = os.path.join(dirpath, name)
+                    st = os.stat(path)
+                    files.append((st.st_mtime, st.st_size, path))
+        total = sum(size for _, size, _ in files)
+        removed = set()
+        for _, size, path in sorted(files):
+            if total <= self.max_bytes:
+                break
+            os.remove(path)
+            total -= size
+            removed.add(os.path.basename(path)[:-len(".webp")])
+        if removed:
+            with self._lock:
+                self._manifest = {u: d for u, d in self._manifest.items() if d not in removed}
+            self._save_manifest()
+        return len(removed)